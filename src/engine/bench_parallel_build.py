@@ -0,0 +1,92 @@
+# =====================================================
+# PARALLEL BUILD BENCHMARK
+# =====================================================
+# Builds the same synthetic batch in-process and with 1..N workers,
+# checks that every run returns the same rows, and prints the speedup.
+#
+#   python -m src.engine.bench_parallel_build 300000
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.loaders import arrow_snapshot
+from src.loaders.master_orders_loader import MasterOrdersLoader
+from src.loaders.location_master_loader import LocationMasterLoader
+from src.loaders.marketplace_mapping import MarketplaceMappingLoader
+from src.engine.goswift_engine_builder import GoSwiftBuilder
+from src.engine.parallel_build import ParallelBuilder
+
+MARKETPLACES = ["Amazon", "Flipkart", "Myntra", "Nykaa"]
+LOCATIONS = [f"WH{i:02d}" for i in range(40)]
+
+
+def synthetic_loaders(n: int, snapshot_dir: Path):
+    """Cleaned tables published as snapshots, then attached like a second process would"""
+    rng = np.random.default_rng(7)
+    po = [f"FBSWN{i:08d}" for i in range(n)]
+    orders = pd.DataFrame({
+        "marketplaces": rng.choice(MARKETPLACES, n),
+        "order_number": po,
+        "location": rng.choice(LOCATIONS, n),
+        "invoice_value": rng.integers(500, 250000, n),
+        "weight_kg": rng.uniform(0.2, 40, n).round(2),
+        "courier_name": rng.choice(["Delhivery", "BlueDart"], n),
+        "box": rng.integers(1, 9, n),
+        "invoice_number": [f"INV{i}" for i in range(n)],
+        "ewb": rng.choice(["", "0", "321456789012"], n),
+        "exp_date": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+    })
+    orders["total_weight_gms"] = (orders["weight_kg"] * 1000).astype(int)
+    orders["po_key"] = po
+    locations = pd.DataFrame({
+        "marketplace": [MARKETPLACES[i % len(MARKETPLACES)] for i in range(len(LOCATIONS))],
+        "location": LOCATIONS,
+        "customer_name": [f"Customer {i}" for i in range(len(LOCATIONS))],
+        "customer_address": [f"Plot {i}, Industrial Area" for i in range(len(LOCATIONS))],
+        "customer_pincode": [str(560000 + i) for i in range(len(LOCATIONS))],
+        "customer_city": "Bengaluru",
+        "customer_state": "Karnataka",
+    })
+    mapping = pd.DataFrame({
+        "marketplace": MARKETPLACES,
+        "transporter": ["Delhivery", "BlueDart", "Ekart", "Xpressbees"],
+        "go_swift_code": ["AMZ", "FK", "MYN", "NYK"],
+    })
+    for name, df in (("master_orders", orders), ("location_master", locations), ("marketplace_mapping", mapping)):
+        arrow_snapshot.publish(df, arrow_snapshot.snapshot_path(snapshot_dir, name))
+
+    loaders = [MasterOrdersLoader(Path()), LocationMasterLoader(Path()), MarketplaceMappingLoader(Path())]
+    for loader in loaders:
+        loader.attach_snapshot(snapshot_dir)
+    return loaders, po
+
+
+def run(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        loaders, po = synthetic_loaders(n, Path(tmp))
+        builder = GoSwiftBuilder(*loaders)
+
+        start = time.perf_counter()
+        reference, _ = builder.build_records(po)
+        base = time.perf_counter() - start
+        print(f"\nin-process   {base:8.2f} s")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            parallel = ParallelBuilder(builder, workers=workers, min_orders=0)
+            start = time.perf_counter()
+            records, _ = parallel.build_records(po)
+            elapsed = time.perf_counter() - start
+            assert records == reference, "parallel build returned different rows"
+            print(f"{workers:3d} workers  {elapsed:8.2f} s  x{base / elapsed:.2f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
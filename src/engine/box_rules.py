@@ -0,0 +1,172 @@
+# =====================================================
+# BOX DIMENSION RULES
+# =====================================================
+# l_cms / w_cms / h_cms / box_type per order from a rule table in
+# config.json, keyed by marketplace, courier and weight-per-box band
+# (total_weight_gms / number_of_boxes):
+#
+#   "box_rules": {
+#       "default": {"l_cms": 10, "w_cms": 10, "h_cms": 10, "box_type": 1},
+#       "rules": [
+#           {"marketplace": "Amazon", "courier": "*", "up_to_gms": 5000,
+#            "l_cms": 30, "w_cms": 25, "h_cms": 20, "box_type": 1},
+#           {"marketplace": "*", "courier": "*", "up_to_gms": null,
+#            "l_cms": 60, "w_cms": 40, "h_cms": 40, "box_type": 2}
+#       ]
+#   }
+#
+# Each (marketplace, courier) group compiles to sorted band limits,
+# so a batch is banded with one numpy.digitize per group. An order
+# takes the first group that has a band for its weight, from most to
+# least specific: (marketplace, courier), (marketplace, *),
+# (*, courier), (*, *); then the default. "up_to_gms": null is an
+# open-ended top band.
+#
+# Marketplace and courier names go through KeyIndex.canonical with the
+# "key_aliases" of config.json, so an order spelled with an alias takes
+# the rule written for its canonical name. build_row looks up a single
+# order with lookup(), which skips the numpy / pandas batch machinery.
+
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.loaders.key_index import KeyIndex, load_aliases, normalize_keys
+from src.utils.config import get_setting
+
+DIMENSION_COLUMNS = ["l_cms", "w_cms", "h_cms", "box_type"]
+DEFAULT_DIMENSIONS = {"l_cms": 10, "w_cms": 10, "h_cms": 10, "box_type": 1}
+ANY = "*"
+# Most to least specific: (use the marketplace, use the courier)
+LEVELS = ((True, True), (True, False), (False, True), (False, False))
+
+
+def _number(value) -> float:
+    """Scalar twin of pd.to_numeric(errors="coerce")"""
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return number
+
+
+class BoxRules:
+    def __init__(self, rules=(), default: dict = None, aliases: Optional[Dict[str, Dict[str, str]]] = None):
+        default = {**DEFAULT_DIMENSIONS, **(default or {})}
+        self.default = tuple(default[col] for col in DIMENSION_COLUMNS)
+
+        # "marketplace" / "courier" -> KeyIndex whose canonical() folds an alias into its target,
+        # applied alike to rule and order values
+        tables = {kind: (aliases or {}).get(kind) or {} for kind in ("marketplace", "courier")}
+        self.keys = {kind: KeyIndex(table.values(), table) for kind, table in tables.items()}
+
+        grouped: Dict[Tuple[str, str], List[dict]] = {}
+        for rule in rules:
+            key = (self._key("marketplace", rule.get("marketplace")), self._key("courier", rule.get("courier")))
+            grouped.setdefault(key, []).append(rule)
+
+        # (marketplace, courier) -> (band upper limits, dimension tuples)
+        self.groups: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        for key, group in grouped.items():
+            group = sorted(group, key=self._limit)
+            limits = np.array([self._limit(rule) for rule in group], dtype=float)
+            if len(np.unique(limits)) != len(limits):
+                raise ValueError(f"Box rules for {key[0]} / {key[1]} repeat a weight band")
+            values = np.empty(len(group), dtype=object)
+            values[:] = [tuple(rule.get(col, default[col]) for col in DIMENSION_COLUMNS) for rule in group]
+            self.groups[key] = (limits, values)
+        # Same bands as plain lists, for lookup()
+        self._scalar_groups = {key: (limits.tolist(), values.tolist()) for key, (limits, values) in self.groups.items()}
+
+    def _key(self, kind: str, value) -> str:
+        return ANY if value in (None, "", ANY) else self.keys[kind].canonical(value)
+
+    def _canonical(self, kind: str, values) -> np.ndarray:
+        """canonical() of a whole column, computed once per distinct spelling"""
+        keys = normalize_keys(pd.Series(values, dtype=object))
+        index = self.keys[kind]
+        return keys.map({key: index.canonical(key) for key in keys.unique()}).to_numpy()
+
+    @staticmethod
+    def _limit(rule) -> float:
+        limit = rule.get("up_to_gms")
+        return np.inf if limit is None else float(limit)
+
+    @classmethod
+    def from_config(cls) -> "BoxRules":
+        settings = get_setting("box_rules", {}) or {}
+        aliases = {kind: load_aliases(kind) for kind in ("marketplace", "courier")}
+        return cls(settings.get("rules") or [], settings.get("default"), aliases)
+
+    def assign(self, marketplaces, couriers, weight_per_box) -> np.ndarray:
+        """(l_cms, w_cms, h_cms, box_type) tuple per order, as an object array"""
+        marketplaces = self._canonical("marketplace", marketplaces)
+        couriers = self._canonical("courier", couriers)
+        weights = pd.to_numeric(pd.Series(weight_per_box, dtype=object), errors="coerce").to_numpy(dtype=float)
+
+        result = np.empty(len(weights), dtype=object)
+        result[:] = [self.default] * len(weights)
+        if not self.groups:
+            return result
+
+        pending = np.ones(len(weights), dtype=bool)
+        for marketplace_level, courier_level in LEVELS:
+            mkt = marketplaces if marketplace_level else np.full(len(weights), ANY, dtype=object)
+            cour = couriers if courier_level else np.full(len(weights), ANY, dtype=object)
+            for key, (limits, values) in self.groups.items():
+                rows = pending & (mkt == key[0]) & (cour == key[1])
+                if not rows.any():
+                    continue
+                # First band whose limit is >= the weight; NaN / too heavy -> len(limits)
+                band = np.digitize(weights[rows], limits, right=True)
+                hit = band < len(limits)
+                targets = np.flatnonzero(rows)[hit]
+                result[targets] = values[band[hit]]
+                pending[targets] = False
+            if not pending.any():
+                break
+        return result
+
+    def lookup(self, marketplace, courier, weight_per_box) -> tuple:
+        """assign() for a single order, without building arrays"""
+        weight = _number(weight_per_box)
+        if not self._scalar_groups or math.isnan(weight):
+            return self.default
+        marketplace = self.keys["marketplace"].canonical(marketplace)
+        courier = self.keys["courier"].canonical(courier)
+        for marketplace_level, courier_level in LEVELS:
+            group = self._scalar_groups.get((marketplace if marketplace_level else ANY, courier if courier_level else ANY))
+            if group is None:
+                continue
+            limits, values = group
+            # np.digitize(right=True): first band whose limit is >= the weight
+            band = bisect_left(limits, weight)
+            if band < len(limits):
+                return values[band]
+        return self.default
+
+    def for_order(self, order: dict) -> tuple:
+        """Dimensions of one fetched master row (build_row), as for_orders gives them"""
+        boxes = _number(order.get("box"))
+        boxes = 1.0 if math.isnan(boxes) else max(boxes, 1.0)
+        return self.lookup(order.get("marketplaces"), order.get("courier_name"), _number(order.get("total_weight_gms")) / boxes)
+
+    def for_orders(self, orders: Dict[str, dict]) -> Dict[str, tuple]:
+        """order_number -> dimensions for a batch of fetched master rows"""
+        numbers = list(orders)
+        rows = [orders[po] for po in numbers]
+        boxes = pd.to_numeric(pd.Series([row.get("box") for row in rows], dtype=object), errors="coerce")
+        weights = pd.to_numeric(pd.Series([row.get("total_weight_gms") for row in rows], dtype=object), errors="coerce")
+        # Blank / zero box counts are banded on the total weight
+        weights = weights / boxes.clip(lower=1).fillna(1)
+        dimensions = self.assign(
+            [row.get("marketplaces") for row in rows],
+            [row.get("courier_name") for row in rows],
+            weights,
+        )
+        return dict(zip(numbers, dimensions))
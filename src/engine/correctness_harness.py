@@ -0,0 +1,342 @@
+# =====================================================
+# DIFFERENTIAL CORRECTNESS HARNESS
+# =====================================================
+# Generates randomized master / location / mapping workbooks full
+# of awkward values (NaN and text boxes, ₹ invoices, EWB 0, bad
+# dates, duplicate and unknown POs...), builds every PO with the
+# reference per-row build_row, and checks that each fast path
+# produces the same CSV byte for byte and fails the same POs.
+#
+#   python -m src.engine.correctness_harness 2000 --seed 3
+#
+# Add a new fast path to LOADER_PATHS / BUILD_PATHS and it is
+# covered by src/engine/test_correctness_harness.py as well.
+
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from src.engine.goswift_engine_builder import GoSwiftBuilder
+from src.exporters.writers import PandasCSVWriter
+from src.models.goswift_schema import GOSWIFT_COLUMNS
+from src.utils.order_intake import parse_order_input
+
+MARKETPLACES = ["Amazon", "Flipkart", "Myntra", "Nykaa", "Ajio"]
+LOCATIONS = ["BLR1", "DEL-2", "BOM3", "HYD4", "MAA5", "CCU6"]
+
+
+# =====================================================
+# SYNTHETIC WORKBOOKS
+# =====================================================
+def _box(rng: random.Random):
+    if rng.random() < 0.8:
+        # 2.5 is stored as a float cell (int() makes it 2); "2.5" is text and invalid
+        return rng.choice([1, 2, 3, 5, 2.0, 2.5, "3", "2.5"])
+    return rng.choice([None, "", " ", "two", 0])
+
+
+def _invoice(rng: random.Random):
+    amount = rng.randint(100, 250000)
+    return rng.choice([
+        amount,
+        f"₹{amount:,}",
+        f"₹ {amount:,}.75",
+        f"{amount}.00",
+        "N/A",
+        None,
+    ])
+
+
+def _weight(rng: random.Random):
+    return rng.choice([round(rng.uniform(0.1, 45), 3), rng.randint(1, 30), "1.5", "heavy", None, 0])
+
+
+def _ewb(rng: random.Random):
+    return rng.choice([0, "0", None, "", 321456789012, "321456789013", 0.0])
+
+
+def _exp_date(rng: random.Random):
+    day = date(2026, 1, 1) + timedelta(days=rng.randint(0, 120))
+    if rng.random() < 0.85:
+        return rng.choice([day, datetime(day.year, day.month, day.day, rng.randint(0, 23), 30)])
+    # Text and impossible dates become NaT, which build_row rejects
+    return rng.choice([day.strftime("%d-%m-%Y"), "2026-02-30", "soon", None])
+
+
+def _spelling(rng: random.Random, key: str):
+    """How a hand-typed master row may spell a mapping key"""
+    return rng.choices(
+        [key, key.upper(), f" {key.lower()}  ", key.replace("-", "–"), key.replace("-", " - "), f"{key}\u00a0"],
+        weights=[10, 1, 1, 1, 1, 1],
+    )[0]
+
+
+def _po(rng: random.Random, i: int):
+    po = f"FBSWN{7400000 + i:08d}"
+    return rng.choices(
+        [po, f" {po.lower()} ", f"'{po}", 9100000 + i, float(9200000 + i)],
+        weights=[12, 2, 1, 1, 1],
+    )[0]
+
+
+def master_rows(n: int, rng: random.Random) -> List[list]:
+    rows = []
+    for i in range(n):
+        rows.append([
+            _spelling(rng, rng.choices(MARKETPLACES + ["Unknown Mart"], weights=[10] * len(MARKETPLACES) + [1])[0]),
+            _po(rng, i),
+            _spelling(rng, rng.choices(LOCATIONS + ["NOWHERE9"], weights=[10] * len(LOCATIONS) + [1])[0]),
+            rng.choice([f"INV{i}", i, None]),
+            _invoice(rng),
+            _weight(rng),
+            rng.choice(["Delhivery", "BlueDart", "Ekart", None]),
+            _box(rng),
+            _ewb(rng),
+            _exp_date(rng),
+        ])
+    # The same PO twice: the reference path fails it, so must every other path
+    if n > 10:
+        rows.append(list(rows[rng.randrange(n)]))
+    return rows
+
+
+def location_rows(rng: random.Random) -> List[list]:
+    rows = []
+    for i, location in enumerate(LOCATIONS):
+        rows.append([
+            MARKETPLACES[i % len(MARKETPLACES)],
+            location,
+            rng.choice([f"Customer {i}", None]),
+            rng.choice([f"Plot {i}, Industrial Area", "", None]),
+            rng.choice([560001 + i, f"{560001 + i}", "56 0001", None, 560001.0 + i]),
+            rng.choice(["Bengaluru", "Delhi", None]),
+            rng.choice(["KA", "DL", None]),
+        ])
+    # A warehouse code shared by two marketplaces, each with its own address
+    rows.append(["flipkart", "hyd4", "Flipkart HYD Customer", "Plot 9, Shamshabad", 501218, "Hyderabad", "TS"])
+    return rows
+
+
+def mapping_rows(rng: random.Random) -> List[list]:
+    return [
+        [marketplace, rng.choice(["Delhivery", "BlueDart", None]), rng.choice([f"GS{i}", None, 42])]
+        for i, marketplace in enumerate(MARKETPLACES)
+    ]
+
+
+def _write_sheet(path: Path, sheet: str, header: List[str], rows: List[list]):
+    import openpyxl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def write_synthetic_data(root: Path, n: int = 300, seed: int = 0) -> Dict[str, Path]:
+    """Raw workbooks laid out like data/<folder>/<file>.xlsx; returns folder -> path"""
+    rng = random.Random(seed)
+    root = Path(root)
+    files = {
+        "master_orders": root / "master_orders" / "master.xlsx",
+        "location_master": root / "location_master" / "location_master.xlsx",
+        "marketplace_mapping": root / "marketplace_mapping" / "marketplace_mapping.xlsx",
+    }
+    _write_sheet(
+        files["master_orders"], "OnlineB2B",
+        ["Marketplaces", "PO", "Location", "Invoice Number", "Invoice Value",
+         "Weight", "Courier Name", "Box", "EWB", "Exp Date"],
+        master_rows(n, rng),
+    )
+    _write_sheet(
+        files["location_master"], "Raw Data",
+        ["Marketplace", "Location", "Customer Name", "Address", "Pincode", "City", "State"],
+        location_rows(rng),
+    )
+    _write_sheet(
+        files["marketplace_mapping"], "Sheet1",
+        ["Marketplace", "Transporter", "Go Swift Code"],
+        mapping_rows(rng),
+    )
+    return files
+
+
+def order_list(master_file: Path, seed: int = 0) -> List[str]:
+    """Every PO in the master as a user would paste it, shuffled, plus a few that do not exist"""
+    raw = pd.read_excel(master_file, sheet_name="OnlineB2B")["PO"]
+    orders = parse_order_input("\n".join(str(v) for v in raw)).orders + ["MISSINGPO1", "missingpo2"]
+    orders = parse_order_input("\n".join(orders)).orders
+    random.Random(seed).shuffle(orders)
+    return orders
+
+
+# =====================================================
+# PATHS UNDER TEST
+# =====================================================
+def _loaders(files: Dict[str, Path]):
+    from src.loaders.master_orders_loader import MasterOrdersLoader
+    from src.loaders.location_master_loader import LocationMasterLoader
+    from src.loaders.marketplace_mapping import MarketplaceMappingLoader
+
+    return [
+        MasterOrdersLoader(files["master_orders"]),
+        LocationMasterLoader(files["location_master"]),
+        MarketplaceMappingLoader(files["marketplace_mapping"]),
+    ]
+
+
+def load_excel(files, work_dir: Path):
+    loaders = _loaders(files)
+    for loader in loaders:
+        loader.load()
+    return loaders
+
+
+def load_snapshot(files, work_dir: Path):
+    loaders = load_excel(files, work_dir)
+    for loader in loaders:
+        loader.publish_snapshot(work_dir / "snapshots")
+        loader.attach_snapshot(work_dir / "snapshots")
+    return loaders
+
+
+def load_polars(files, work_dir: Path):
+    from src.loaders import polars_backend
+
+    with polars_backend.backend("polars"):
+        return load_excel(files, work_dir)
+
+
+def load_sqlite(files, work_dir: Path):
+    from src.loaders.sqlite_store import SQLiteMasterStore
+
+    store = SQLiteMasterStore(work_dir / "store.sqlite3")
+    loaders = _loaders(files)
+    for loader in loaders:
+        loader.load_stored(store)
+    return loaders
+
+
+def build_batch(builder, order_numbers):
+    return builder.build_records(order_numbers)
+
+
+def build_parallel(builder, order_numbers):
+    from src.engine.parallel_build import ParallelBuilder
+
+    chunk = max(1, len(order_numbers) // 3)
+    return ParallelBuilder(builder, workers=2, chunk_size=chunk, min_orders=0).build_records(order_numbers)
+
+
+LOADER_PATHS: Dict[str, Callable] = {
+    "excel": load_excel,
+    "snapshot": load_snapshot,
+    "sqlite": load_sqlite,
+    "polars": load_polars,
+}
+
+BUILD_PATHS: Dict[str, Callable] = {
+    "batch": build_batch,
+    "parallel": build_parallel,
+}
+
+
+# =====================================================
+# COMPARISON
+# =====================================================
+def csv_bytes(df: pd.DataFrame) -> bytes:
+    """The exact bytes the exporter's default CSV writer would produce"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "out.csv"
+        PandasCSVWriter().write(df, path)
+        return path.read_bytes()
+
+
+def reference_output(builder, order_numbers) -> Tuple[bytes, List[str]]:
+    """The original export loop: build_row per PO, skip the ones that raise"""
+    rows, failed = [], []
+    for order_number in order_numbers:
+        try:
+            rows.append(builder.build_row(order_number))
+        except Exception:
+            failed.append(order_number)
+    return csv_bytes(pd.DataFrame(rows, columns=GOSWIFT_COLUMNS)), failed
+
+
+def path_output(build, builder, order_numbers) -> Tuple[bytes, List[str]]:
+    records, failures = build(builder, order_numbers)
+    df = pd.DataFrame.from_records(records, columns=GOSWIFT_COLUMNS)
+    return csv_bytes(df), [order_number for order_number, _ in failures]
+
+
+def first_difference(expected: bytes, actual: bytes) -> str:
+    expected_lines = expected.decode("utf-8").splitlines()
+    actual_lines = actual.decode("utf-8").splitlines()
+    for i, (a, b) in enumerate(zip(expected_lines, actual_lines)):
+        if a != b:
+            return f"line {i + 1}:\n  reference: {a}\n  fast path: {b}"
+    return f"line count {len(expected_lines)} != {len(actual_lines)}"
+
+
+def run_harness(n: int = 300, seed: int = 0, loader_paths=None, build_paths=None, work_dir: Path = None) -> List[str]:
+    """Returns a list of mismatch descriptions (empty when every path agrees)"""
+    loader_paths = loader_paths or list(LOADER_PATHS)
+    build_paths = build_paths or list(BUILD_PATHS)
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(work_dir or tmp)
+        files = write_synthetic_data(work_dir / "data", n, seed)
+        order_numbers = order_list(files["master_orders"], seed)
+
+        # Builders print a line per row; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            reference_builder = GoSwiftBuilder(*load_excel(files, work_dir))
+            expected, expected_failed = reference_output(reference_builder, order_numbers)
+
+        for loader_name in loader_paths:
+            with contextlib.redirect_stdout(io.StringIO()):
+                builder = GoSwiftBuilder(*LOADER_PATHS[loader_name](files, work_dir / loader_name))
+            for build_name in build_paths:
+                name = f"{loader_name}+{build_name}"
+                with contextlib.redirect_stdout(io.StringIO()):
+                    actual, failed = path_output(BUILD_PATHS[build_name], builder, order_numbers)
+                if failed != expected_failed:
+                    mismatches.append(
+                        f"{name}: failed POs differ "
+                        f"(only reference: {sorted(set(expected_failed) - set(failed))[:5]}, "
+                        f"only fast path: {sorted(set(failed) - set(expected_failed))[:5]})"
+                    )
+                if actual != expected:
+                    mismatches.append(f"{name}: CSV differs at {first_difference(expected, actual)}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare fast build paths with the reference build_row")
+    parser.add_argument("rows", nargs="?", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1, help="seeds seed .. seed+runs-1")
+    args = parser.parse_args()
+
+    failed_runs = 0
+    for seed in range(args.seed, args.seed + args.runs):
+        problems = run_harness(args.rows, seed)
+        if problems:
+            failed_runs += 1
+            print(f"❌ seed {seed}:")
+            for problem in problems:
+                print(f"   {problem}")
+        else:
+            print(f"✅ seed {seed}: every path matches the reference")
+    raise SystemExit(1 if failed_runs else 0)
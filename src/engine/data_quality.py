@@ -0,0 +1,267 @@
+# =====================================================
+# DATA QUALITY SCAN
+# =====================================================
+# One vectorized pass per engine generation over the master, with
+# the location master and marketplace mapping resolved once per
+# distinct value. Each PO gets a QualityFlag bitmask:
+#
+#   BLOCKING flags -> build_row would raise for this PO
+#   other flags    -> a label is produced, but with suspect values
+#                     the loaders silently coerced (0 weight, ...)
+#
+# Checking a whole batch is then a single reindex on the status
+# Series instead of an exception per row inside build_row.
+
+from enum import IntFlag
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.loaders.key_index import normalize_keys
+
+
+class QualityFlag(IntFlag):
+    OK = 0
+    DUPLICATE_PO = 1
+    MISSING_BOX = 2
+    INVALID_BOX = 4
+    BAD_EXP_DATE = 8
+    UNKNOWN_LOCATION = 16
+    UNKNOWN_MARKETPLACE = 32
+    ZERO_WEIGHT = 64
+    ZERO_INVOICE = 128
+    BAD_PINCODE = 256
+    NOT_IN_MASTER = 512
+    AMBIGUOUS_LOCATION = 1024
+    UNKNOWN_PINCODE = 2048
+    CITY_MISMATCH = 4096
+    STATE_MISMATCH = 8192
+
+
+BLOCKING = (
+    QualityFlag.DUPLICATE_PO
+    | QualityFlag.MISSING_BOX
+    | QualityFlag.INVALID_BOX
+    | QualityFlag.BAD_EXP_DATE
+    | QualityFlag.UNKNOWN_LOCATION
+    | QualityFlag.UNKNOWN_MARKETPLACE
+    | QualityFlag.NOT_IN_MASTER
+    | QualityFlag.AMBIGUOUS_LOCATION
+)
+
+REASONS = {
+    QualityFlag.DUPLICATE_PO: "PO listed more than once in master",
+    QualityFlag.MISSING_BOX: "box is empty",
+    QualityFlag.INVALID_BOX: "box is not a whole number",
+    QualityFlag.BAD_EXP_DATE: "expiry date missing or unreadable",
+    QualityFlag.UNKNOWN_LOCATION: "location not in location master",
+    QualityFlag.UNKNOWN_MARKETPLACE: "marketplace not in marketplace mapping",
+    QualityFlag.ZERO_WEIGHT: "weight missing or unreadable (0 g)",
+    QualityFlag.ZERO_INVOICE: "invoice value missing or unreadable (0)",
+    QualityFlag.BAD_PINCODE: "location pincode missing or unreadable (0)",
+    QualityFlag.NOT_IN_MASTER: "PO not in master",
+    QualityFlag.AMBIGUOUS_LOCATION: "location shared by several marketplaces, none matching",
+    QualityFlag.UNKNOWN_PINCODE: "location pincode not in pincode reference",
+    QualityFlag.CITY_MISMATCH: "location city does not match its pincode",
+    QualityFlag.STATE_MISMATCH: "location state does not match its pincode",
+}
+
+INT_TEXT = r"\s*[+-]?\d+\s*"
+
+
+def describe(flags: int) -> List[str]:
+    """Human-readable reasons for one bitmask"""
+    return [reason for flag, reason in REASONS.items() if flags & flag]
+
+
+def _box_flags(box: pd.Series) -> np.ndarray:
+    """Same rules as GoSwiftBuilder._derive: NaN / "" is missing, int(box) must succeed"""
+    flags = np.zeros(len(box), dtype=np.uint16)
+    missing = (box.isna() | box.astype(str).eq("")).to_numpy()
+    flags[missing] |= int(QualityFlag.MISSING_BOX)
+
+    if pd.api.types.is_numeric_dtype(box):
+        invalid = ~missing & ~np.isfinite(box.to_numpy(dtype=float))
+    else:
+        # object / str columns mixing numbers and text
+        is_text = box.map(type).eq(str).to_numpy() & ~missing
+        bad_text = is_text & ~box.astype(str).str.fullmatch(INT_TEXT).to_numpy()
+        numeric = pd.to_numeric(box.where(~is_text), errors="coerce").to_numpy(dtype=float)
+        bad_other = ~is_text & ~missing & ~np.isfinite(numeric)
+        invalid = bad_text | bad_other
+    flags[invalid] |= int(QualityFlag.INVALID_BOX)
+    return flags
+
+
+def _lookup_flags(values: pd.Series, exists, flag: int) -> np.ndarray:
+    """Resolve each distinct value once with the loader's own `exists`"""
+    known = {value: bool(exists(value)) for value in values.unique()}
+    found = values.map(known).fillna(False).astype(bool).to_numpy()
+    return np.where(found, 0, int(flag)).astype(np.uint16)
+
+
+def _unmatched(raw: pd.Series, flags: np.ndarray, flag: int) -> Dict[str, int]:
+    """Spelling as found in the master -> number of rows, for values that matched nothing"""
+    missing = raw[(flags & int(flag)).astype(bool)]
+    return {str(value): int(n) for value, n in missing.fillna("(blank)").value_counts().items()}
+
+
+class QualityReport:
+    def __init__(self, status: pd.Series, unmatched: Dict[str, Dict[str, int]] = None):
+        # order_number -> QualityFlag bits (first row for duplicated POs)
+        self.status = status
+        # "location" / "marketplace" -> {master spelling: rows} that matched no key
+        self.unmatched = unmatched or {}
+
+    @property
+    def total(self) -> int:
+        return len(self.status)
+
+    @property
+    def blocked_count(self) -> int:
+        return int((self.status & int(BLOCKING)).astype(bool).sum())
+
+    @property
+    def ready_count(self) -> int:
+        return self.total - self.blocked_count
+
+    def flags_for(self, order_numbers: List[str]) -> pd.Series:
+        """Bitmask per PO for a whole batch in one lookup (unknown POs get NOT_IN_MASTER)"""
+        return (
+            self.status.reindex(pd.Index(order_numbers, dtype=object))
+            .fillna(int(QualityFlag.NOT_IN_MASTER))
+            .astype("uint16")
+        )
+
+    def blocked(self, order_numbers: List[str]) -> Dict[str, List[str]]:
+        """PO -> reasons, for the POs in this batch that cannot be labelled"""
+        flags = self.flags_for(order_numbers)
+        flags = flags[(flags & int(BLOCKING)).astype(bool)]
+        return {po: describe(int(bits)) for po, bits in flags.items()}
+
+    def reason_counts(self) -> Dict[str, int]:
+        counts = {}
+        for flag, reason in REASONS.items():
+            n = int((self.status & int(flag)).astype(bool).sum())
+            if n:
+                counts[reason] = n
+        return counts
+
+    def summary(self) -> str:
+        lines = [f"{self.ready_count} label-ready, {self.blocked_count} blocked"]
+        for reason, n in sorted(self.reason_counts().items(), key=lambda item: -item[1]):
+            lines.append(f"{n} - {reason}")
+        for kind, values in self.unmatched.items():
+            if values:
+                shown = ", ".join(f"{value} ({n})" for value, n in list(values.items())[:5])
+                lines.append(f"Unmatched {kind}: {shown}")
+        return "\n".join(lines)
+
+
+def _pincode_flags(pairs: pd.Series, location_master, reference) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Cross-check each distinct (marketplace, location) address against the pincode
+    reference in one batch lookup. Returns row flags and {address problem: rows}.
+    """
+    records = {}
+    for pair in pairs.unique():
+        marketplace, location = pair.split("\x1f")
+        if location_master.exists(location, marketplace):
+            records[pair] = location_master.get_location(location, marketplace)
+    if not records:
+        return np.zeros(len(pairs), dtype=np.uint16), {}
+
+    found = list(records.values())
+    pincodes = [record.get("customer_pincode") for record in found]
+    cities = [record.get("customer_city") for record in found]
+    states = [record.get("customer_state") for record in found]
+    checks = reference.validate(pincodes, cities, states)
+
+    bits = np.zeros(len(found), dtype=np.uint16)
+    # Missing / unreadable pincodes are already BAD_PINCODE
+    bits[checks["valid"] & ~checks["known"]] |= int(QualityFlag.UNKNOWN_PINCODE)
+    bits[~checks["city"]] |= int(QualityFlag.CITY_MISMATCH)
+    bits[~checks["state"]] |= int(QualityFlag.STATE_MISMATCH)
+    pair_bits = dict(zip(records, bits))
+    flags = pairs.map(pair_bits).fillna(0).to_numpy(dtype=np.uint16)
+
+    counts = pairs.value_counts()
+    problems = {}
+    for pair, record, pincode, city, state, b in zip(records, found, pincodes, cities, states, bits):
+        if b:
+            what = " / ".join(describe(int(b) & int(
+                QualityFlag.UNKNOWN_PINCODE | QualityFlag.CITY_MISMATCH | QualityFlag.STATE_MISMATCH
+            )))
+            problems[f"{record.get('location')} {pincode} {city}, {state} - {what}"] = int(counts[pair])
+    return flags, problems
+
+
+def scan(master_orders, location_master, marketplace_mapping, pincode_reference=None) -> QualityReport:
+    """
+    Scan every PO once; the loaders are only asked about distinct locations / marketplaces.
+    With a PincodeReference, addresses are also checked against it.
+    """
+    orders = master_orders.get_dataframe().reset_index(drop=True)
+    if len(orders) == 0:
+        return QualityReport(pd.Series([], dtype="uint16", index=pd.Index([], dtype=object)))
+
+    flags = _box_flags(orders["box"])
+
+    for mask, flag in (
+        (orders["po_key"].duplicated(keep=False), QualityFlag.DUPLICATE_PO),
+        (orders["exp_date"].isna(), QualityFlag.BAD_EXP_DATE),
+        (orders["total_weight_gms"].eq(0), QualityFlag.ZERO_WEIGHT),
+        (orders["invoice_value"].eq(0), QualityFlag.ZERO_INVOICE),
+    ):
+        flags[mask.to_numpy()] |= int(flag)
+
+    # Master keys are normalized here in one vectorized pass, then probed once per distinct key
+    location_keys = normalize_keys(orders["location"])
+    marketplace_keys = normalize_keys(orders["marketplaces"])
+    location_flags = _lookup_flags(
+        location_keys,
+        lambda key: location_master.key_index.resolve_normalized(key) is not None,
+        QualityFlag.UNKNOWN_LOCATION,
+    )
+    marketplace_flags = _lookup_flags(
+        marketplace_keys,
+        lambda key: marketplace_mapping.key_index.resolve_normalized(key) is not None,
+        QualityFlag.UNKNOWN_MARKETPLACE,
+    )
+    flags |= location_flags | marketplace_flags
+
+    # The address depends on (marketplace, location): check each distinct pair once
+    pairs = marketplace_keys + "\x1f" + location_keys
+
+    def pair_ok(pair):
+        marketplace, location = pair.split("\x1f")
+        return not location_master.is_ambiguous(location, marketplace)
+
+    def pincode_ok(pair):
+        marketplace, location = pair.split("\x1f")
+        if not location_master.exists(location, marketplace):
+            return True
+        pincode = location_master.get_location(location, marketplace).get("customer_pincode")
+        return str(pincode) not in ("0", "", "nan")
+
+    flags |= _lookup_flags(pairs, pair_ok, QualityFlag.AMBIGUOUS_LOCATION)
+    flags |= _lookup_flags(pairs, pincode_ok, QualityFlag.BAD_PINCODE)
+
+    address_problems = {}
+    if pincode_reference is not None and len(pincode_reference):
+        address_flags, address_problems = _pincode_flags(pairs, location_master, pincode_reference)
+        flags |= address_flags
+
+    status = pd.Series(flags, index=pd.Index(orders["po_key"], dtype=object))
+    status = status[~status.index.duplicated()]
+    report = QualityReport(status, {
+        "location": _unmatched(orders["location"], location_flags, QualityFlag.UNKNOWN_LOCATION),
+        "marketplace": _unmatched(orders["marketplaces"], marketplace_flags, QualityFlag.UNKNOWN_MARKETPLACE),
+        "address": address_problems,
+    })
+    print(f"✅ Data quality: {report.ready_count} label-ready, {report.blocked_count} blocked")
+    for kind, values in report.unmatched.items():
+        if values:
+            print(f"⚠️  Unmatched {kind} values: {', '.join(values)}")
+    return report
@@ -0,0 +1,121 @@
+# =====================================================
+# ENGINE GENERATIONS
+# =====================================================
+# A generation is one consistent set of loaded data: the three
+# loaders plus the builder wired to them. It is never modified
+# after it is created. Reloads build a whole new generation off
+# the UI thread and swap a single reference; an export grabs the
+# current generation once and uses it to the end, so it can never
+# see half-replaced data. Older generations stay in memory, so a
+# rollback is just swapping the reference back.
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class EngineGeneration:
+    number: int
+    master_orders: object
+    location_master: object
+    marketplace_mapping: object
+    builder: object
+    # folder -> stored snapshot version this generation was loaded from
+    sources: Dict[str, Optional[Path]] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+    # Per-PO data-quality status (src/engine/data_quality.py); None if the scan failed
+    quality: object = None
+    # ParallelBuilder over `builder`, shared by every export of this generation. Its
+    # worker snapshots are published once and removed when the last reference goes
+    parallel_builder: object = None
+
+    @property
+    def label(self) -> str:
+        return f"gen {self.number} ({self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
+
+
+def build_generation(number, master_orders, location_master, marketplace_mapping, sources=None):
+    """Wire already-loaded loaders into a new generation"""
+    from src.engine.goswift_engine_builder import GoSwiftBuilder
+    from src.engine.data_quality import scan
+    from src.engine.parallel_build import ParallelBuilder
+    from src.loaders.pincode_reference import shared_reference
+
+    builder = GoSwiftBuilder(master_orders, location_master, marketplace_mapping)
+    try:
+        quality = scan(master_orders, location_master, marketplace_mapping, shared_reference())
+    except Exception as e:
+        print(f"⚠️  Data quality scan failed: {e}")
+        quality = None
+    return EngineGeneration(
+        number=number,
+        master_orders=master_orders,
+        location_master=location_master,
+        marketplace_mapping=marketplace_mapping,
+        builder=builder,
+        sources=dict(sources or {}),
+        quality=quality,
+        parallel_builder=ParallelBuilder(builder),
+    )
+
+
+def derive_generation(base: EngineGeneration, number: int, folder: str, loader, source=None):
+    """New generation that replaces one loader and reuses the other two from `base`"""
+    loaders = {
+        "master_orders": base.master_orders,
+        "location_master": base.location_master,
+        "marketplace_mapping": base.marketplace_mapping,
+    }
+    if folder not in loaders:
+        raise KeyError(f"Unknown data source: {folder}")
+    loaders[folder] = loader
+    sources = dict(base.sources)
+    sources[folder] = source
+    return build_generation(number, sources=sources, **loaders)
+
+
+class GenerationManager:
+    def __init__(self, keep: int = 3):
+        self._lock = threading.Lock()
+        self._current: Optional[EngineGeneration] = None
+        self._previous = deque(maxlen=keep)
+        self._counter = 0
+
+    @property
+    def current(self) -> Optional[EngineGeneration]:
+        """Pin this once per export and use the returned object throughout"""
+        return self._current
+
+    def next_number(self) -> int:
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def publish(self, generation: EngineGeneration) -> EngineGeneration:
+        """Make `generation` current; the old one is kept for rollback"""
+        with self._lock:
+            if self._current is not None:
+                self._previous.append(self._current)
+            self._current = generation
+        print(f"✅ Engine switched to {generation.label}")
+        return generation
+
+    def can_rollback(self) -> bool:
+        return len(self._previous) > 0
+
+    def rollback(self) -> EngineGeneration:
+        """Swap back to the previous generation (no re-parse)"""
+        with self._lock:
+            if not self._previous:
+                raise RuntimeError("No previous data generation to roll back to")
+            self._current = self._previous.pop()
+        print(f"↩️  Rolled back to {self._current.label}")
+        return self._current
+
+    def history(self) -> List[EngineGeneration]:
+        """Previous generations, newest first"""
+        return list(reversed(self._previous))
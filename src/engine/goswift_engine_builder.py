@@ -1,84 +1,12 @@
 import pandas as pd
 
-# -------------------------------
-# GoSwift Output Schema
-# -------------------------------
-GOSWIFT_COLUMNS = [
-    "order_number",
-    "customer_ID",
-    "customer_company_name",
-    "customer_gst_in",
-    "customer_name",
-    "customer_address",
-    "customer_pincode",
-    "customer_city",
-    "customer_state",
-    "customer_number",
-    "customer_email",
-    "delivery_type",
-    "b2b_order_channel",
-    "b2b_order_channel_other",
-    "total_weight_gms",
-    "invoice_number",
-    "order_invoice_amount",
-    "product_description",
-    "ewaybill_number",
-    "sender_gst_in",
-    "pickup_location_name",
-    "box_type",
-    "number_of_boxes",
-    "l_cms",
-    "w_cms",
-    "h_cms",
-    "seller_courier_choice",
-    "service_type",
-    "is_rtv_shipment",
-    "is_appointment_based",
-    "appointment_date",
-    "appointment_time (HHMM)",
-    "appointment_id",
-    "purchase_order_number",
-    "purchase_order_expiry_date",
-]
-
-# -------------------------------
-# Static / Fixed Values
-# -------------------------------
-STATIC_VALUES = {
-    "customer_ID": "",
-    "customer_gst_in": "",
-    "customer_email": "",
-    "delivery_type": "",
-    "b2b_order_channel_other": "",
-    "sender_gst_in": "",
-    "pickup_location_name": "RENEE Cosmetics Pvt. Ltd. B2B",
-    "box_type": 1,
-    "l_cms": 10,
-    "w_cms": 10,
-    "h_cms": 10,
-    "service_type": "SURFACE",
-    "is_rtv_shipment": "FALSE",
-    "is_appointment_based": "TRUE",
-    "appointment_date": "",
-    "appointment_time (HHMM)": "",
-    "appointment_id": "",
-    "purchase_order_number": "",
-    "purchase_order_expiry_date": "",
-    "product_description": "Cosmetics",
-    "customer_number": "9999999999",
-}
+from typing import List, Tuple
 
-# -------------------------------
-# Helper
-# -------------------------------
-def safe(value, default=""):
-    """Convert NaN / None to safe value"""
-    return default if pd.isna(value) else value
-
-import pandas as pd
+from src.models.goswift_schema import GOSWIFT_COLUMNS
+from src.engine.row_projector import compile_projector
+from src.engine.box_rules import BoxRules, DIMENSION_COLUMNS
 
 from datetime import date
-from datetime import datetime
 
 
 def format_date_for_goswift(d):
@@ -100,6 +28,16 @@ class GoSwiftBuilder:
         self.master_orders = master_orders
         self.location_master = location_master
         self.marketplace_mapping = marketplace_mapping
+        # Box dimension rule table, compiled once per builder
+        self.box_rules = BoxRules.from_config()
+
+    @property
+    def joins_in_batch(self) -> bool:
+        """build_records runs as polars joins (master loaded by the polars backend)"""
+        return getattr(self.master_orders, "orders_pl", None) is not None
+
+    # Compiled once from GOSWIFT_SCHEMA, shared by build_row and build_records
+    _project = staticmethod(compile_projector())
 
     def build_row(self, order_number: str) -> dict:
         # 1️⃣ Validate Order
@@ -118,53 +56,81 @@ class GoSwiftBuilder:
         if not self.marketplace_mapping.exists(marketplace):
             raise KeyError(f"Marketplace '{marketplace}' not found in marketplace mapping")
 
-        loc = self.location_master.get_location(location)
+        # Address for this marketplace's use of the warehouse (location alone as fallback)
+        loc = self.location_master.get_location(location, marketplace)
         market = self.marketplace_mapping.get_mapping(marketplace)
 
-        # 3️⃣ Start row with static defaults
-        row = dict(STATIC_VALUES)
-
-        raw_box = order.get("box") 
+        # 3️⃣ Order-level computed fields (box, dimensions, dates, EWB...)
+        dimensions = self.box_rules.for_order(order)
+        derived = self._derive(order_number, order, dimensions)
+        print(f"Raw box value for order {order_number}: '{order.get('box')}'")
+
+        # 4️⃣ Project into GoSwift column order
+        return dict(zip(GOSWIFT_COLUMNS, self._project(order, loc, market, derived)))
+
+    def build_records(self, order_numbers: List[str]) -> Tuple[List[tuple], List[Tuple[str, Exception]]]:
+        """
+        Batch path: same rows as build_row, as tuples in GOSWIFT_COLUMNS order.
+        Orders are fetched in one batch lookup and each (location, marketplace) /
+        marketplace is resolved once per batch, and box dimensions are assigned
+        to the whole batch in one rule lookup. Returns (records, [(order_number, error), ...]).
+        """
+        if self.joins_in_batch:
+            from src.loaders import polars_backend
+            return polars_backend.build_records(self, order_numbers)
+
+        records = []
+        failures = []
+        fetched = self.master_orders.get_orders(order_numbers)
+        dimensions = self.box_rules.for_orders(fetched)
+
+        locations = {}
+        markets = {}
+        for order_number in order_numbers:
+            try:
+                order = fetched.get(order_number)
+                if order is None:
+                    # Missing or ambiguous PO: the per-row path raises the right error
+                    records.append(tuple(self.build_row(order_number).values()))
+                    continue
+
+                location = order.get("location")
+                marketplace = order.get("marketplaces")
+
+                if (location, marketplace) not in locations:
+                    if not self.location_master.exists(location):
+                        raise KeyError(f"Location '{location}' not found in location master")
+                    locations[location, marketplace] = self.location_master.get_location(location, marketplace)
+
+                if marketplace not in markets:
+                    if not self.marketplace_mapping.exists(marketplace):
+                        raise KeyError(f"Marketplace '{marketplace}' not found in marketplace mapping")
+                    markets[marketplace] = self.marketplace_mapping.get_mapping(marketplace)
+
+                derived = self._derive(order_number, order, dimensions[order_number])
+                records.append(self._project(order, locations[location, marketplace], markets[marketplace], derived))
+            except Exception as e:
+                failures.append((order_number, e))
+
+        return records, failures
+
+    @staticmethod
+    def _derive(order_number: str, order: dict, dimensions: tuple) -> dict:
+        """Values of the DERIVED columns in GOSWIFT_SCHEMA"""
+        raw_box = order.get("box")
         if pd.isna(raw_box) or raw_box == "":
             raise ValueError(f"Invalid box count for order {order_number}: '{raw_box}'")
-        else:
-            print(f"Raw box value for order {order_number}: '{raw_box}'")
-            row["number_of_boxes"] = int(raw_box)
-
-        raw_exp = order.get('exp_date')
-        row['purchase_order_expiry_date'] = format_date_for_goswift(raw_exp)
-        
-        # 4️⃣ Order-level fields
-        row.update({
-            "order_number": order_number,
-            "invoice_number": safe(order.get("invoice_number")),
-            "order_invoice_amount": int(order.get("invoice_value", 0)),
-            "total_weight_gms": int(order.get("total_weight_gms", 0)),
-            "purchase_order_number": order_number,
-        })
-
-        # 5️⃣ Location-based fields
-        row.update({
-            "customer_company_name": safe(loc.get("customer_name")),
-            "customer_name": safe(loc.get("customer_name")),
-            "customer_address": safe(loc.get("customer_address")),
-            "customer_pincode": safe(loc.get("customer_pincode")),
-            "customer_city": safe(loc.get("customer_city")),
-            "customer_state": safe(loc.get("customer_state")),
-        })
-
-        # 6️⃣ Marketplace-based fields
-        row.update({
-            "b2b_order_channel": safe(market.get("go_swift_code")),
-            "seller_courier_choice": safe(market.get("transporter")),
-        })
-
-        # 7️⃣ E-Way Bill logic
-        ewb = order.get("ewb", "")
-        row["ewaybill_number"] = "" if str(ewb) in ("0", "nan", "") else str(ewb)
 
-        # 8️⃣ Enforce GoSwift column order
-        final_row = {col: row.get(col, "") for col in GOSWIFT_COLUMNS}
+        # E-Way Bill: 0 / blank means no EWB
+        ewb = order.get("ewb", "")
 
-        return final_row
-        
+        return {
+            # As spelled in the master; order_number may be a normalized lookup key
+            "order_number": order.get("order_number", order_number),
+            "number_of_boxes": int(raw_box),
+            "order_invoice_amount": int(order.get("invoice_value", 0)),
+            "total_weight_gms": int(order.get("total_weight_gms", 0)),
+            "purchase_order_expiry_date": format_date_for_goswift(order.get("exp_date")),
+            "ewaybill_number": "" if str(ewb) in ("0", "nan", "") else str(ewb),
+            **dict(zip(DIMENSION_COLUMNS, dimensions)),
+        }
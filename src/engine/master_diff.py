@@ -0,0 +1,143 @@
+# =====================================================
+# MASTER DIFF
+# =====================================================
+# Which POs are new or changed since the previously loaded master.
+# Every load reduces the master to one 64-bit hash per PO (a
+# fingerprint). The fingerprint is kept on disk, so the next load
+# (an upload, a watched-file reload or the next app start) is
+# diffed against it with index set operations, not row by row.
+#
+# Pending POs (added or changed, not yet generated) are kept with
+# the fingerprint until they are exported or leave the master.
+
+import pickle
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Set
+
+import pandas as pd
+
+from src.utils.config import PROJECT_ROOT
+
+STATE_PATH = PROJECT_ROOT / "data" / "master_orders" / "master_diff_state.pkl"
+
+
+def fingerprint(df: pd.DataFrame) -> pd.Series:
+    """
+    PO (normalized key) -> uint64 hash of the whole cleaned row.
+    Values are hashed as text so the Excel, snapshot and SQLite loads agree.
+    """
+    if df is None or len(df) == 0:
+        return pd.Series([], dtype="uint64", index=pd.Index([], name="order_number"))
+    frame = df.reset_index(drop=True)
+    frame = frame[~frame["po_key"].duplicated()]
+    text = pd.DataFrame(index=frame.index)
+    for col in sorted(frame.columns):
+        values = frame[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        text[col] = values.astype(str)
+    hashes = pd.util.hash_pandas_object(text, index=False)
+    return pd.Series(hashes.to_numpy(), index=pd.Index(frame["po_key"], name="order_number"))
+
+
+@dataclass
+class MasterDiff:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def pending(self) -> List[str]:
+        return self.added + self.changed
+
+    def summary(self) -> str:
+        return f"{len(self.added)} new, {len(self.changed)} changed, {len(self.removed)} removed"
+
+
+def diff_fingerprints(old: pd.Series, new: pd.Series) -> MasterDiff:
+    """Set difference on the PO index, then one aligned hash comparison for the common POs"""
+    common = new.index.intersection(old.index)
+    changed = common[new.loc[common].to_numpy() != old.loc[common].to_numpy()]
+    return MasterDiff(
+        added=new.index.difference(old.index, sort=False).tolist(),
+        changed=changed.tolist(),
+        removed=old.index.difference(new.index, sort=False).tolist(),
+    )
+
+
+class PendingOrders:
+    """
+    The stored fingerprint plus the POs still waiting to be generated.
+    Changed POs are usually in the export ledger already, so they are
+    listed separately: they have to be exported with force.
+    """
+
+    def __init__(self, state_path: Path = STATE_PATH):
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._pending: List[str] = []
+        self._changed: Set[str] = set()
+        self._read()
+
+    @property
+    def pending(self) -> List[str]:
+        with self._lock:
+            return list(self._pending)
+
+    @property
+    def changed(self) -> List[str]:
+        """Pending POs whose row changed since an earlier master (re-export needs force)"""
+        with self._lock:
+            return [po for po in self._pending if po in self._changed]
+
+    def update(self, df: pd.DataFrame) -> MasterDiff:
+        """
+        Diff a freshly loaded master against the previous one and store it as the new baseline.
+        The very first load only sets the baseline (nothing is pending); an empty
+        master (a failed load) is ignored so it cannot wipe the baseline.
+        """
+        new = fingerprint(df)
+        if len(new) == 0:
+            return MasterDiff()
+        with self._lock:
+            if self._fingerprint is None:
+                diff = MasterDiff()
+            else:
+                diff = diff_fingerprints(self._fingerprint, new)
+            still_present = [po for po in self._pending if po in new.index]
+            self._pending = list(dict.fromkeys(still_present + diff.pending))
+            self._changed = {po for po in self._changed if po in new.index} | set(diff.changed)
+            self._fingerprint = new
+            self._write()
+        return diff
+
+    def mark_done(self, order_numbers: Iterable[str]):
+        """Drop generated POs from the pending list"""
+        done = set(order_numbers)
+        with self._lock:
+            self._pending = [po for po in self._pending if po not in done]
+            self._changed -= done
+            self._write()
+
+    def _read(self):
+        if not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "rb") as f:
+                state = pickle.load(f)
+            self._fingerprint = state["fingerprint"]
+            self._pending = state["pending"]
+            # State files written before changed POs were tracked: treat none as changed
+            self._changed = set(state.get("changed", ()))
+        except Exception as e:
+            print(f"⚠️  Could not read master diff state, starting a new baseline: {e}")
+
+    def _write(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"fingerprint": self._fingerprint, "pending": self._pending, "changed": self._changed}, f)
+        tmp.replace(self.state_path)
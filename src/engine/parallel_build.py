@@ -0,0 +1,125 @@
+# =====================================================
+# PARALLEL BUILD
+# =====================================================
+# Splits a very large order list into chunks and builds them in a
+# process pool. Workers never receive the DataFrames through pickle:
+# each worker attaches once, in its initializer, to data it can
+# open itself - the SQLite master store when that backend is in use,
+# otherwise Arrow snapshots of the three tables (memory-mapped, see
+# src/loaders/arrow_snapshot.py). Only order numbers go to the
+# workers and only row tuples come back. pool.map keeps input order.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.utils.config import get_setting
+
+DEFAULT_CHUNK_SIZE = 5000
+# Below this many orders a pool costs more than it saves
+DEFAULT_MIN_ORDERS = 20000
+
+# Set once per worker process by _init_worker
+_worker_builder = None
+
+
+def _init_worker(source: str, location: str, versions: tuple = ()):
+    global _worker_builder
+    from src.loaders.master_orders_loader import MasterOrdersLoader
+    from src.loaders.location_master_loader import LocationMasterLoader
+    from src.loaders.marketplace_mapping import MarketplaceMappingLoader
+    from src.engine.goswift_engine_builder import GoSwiftBuilder
+
+    loaders = [
+        MasterOrdersLoader(Path()),
+        LocationMasterLoader(Path()),
+        MarketplaceMappingLoader(Path()),
+    ]
+    if source == "sqlite":
+        from src.loaders.sqlite_store import SQLiteMasterStore
+        store = SQLiteMasterStore(Path(location))
+        # The table versions the parent's loaders are pinned to, not whatever is current now
+        for loader, version in zip(loaders, versions):
+            if version is not None:
+                loader.attach_store(store, version)
+    else:
+        for loader in loaders:
+            try:
+                loader.attach_snapshot(Path(location))
+            except FileNotFoundError:
+                # Source had no data in the parent either; leave it unloaded
+                pass
+    _worker_builder = GoSwiftBuilder(*loaders)
+
+
+def _build_chunk(order_numbers: List[str]):
+    return _worker_builder.build_records(order_numbers)
+
+
+class ParallelBuilder:
+    """
+    Drop-in for GoSwiftBuilder.build_records on big batches.
+    Small batches (fewer than `min_orders`) are built in-process.
+    """
+
+    def __init__(self, builder, workers: int = None, chunk_size: int = None, min_orders: int = None):
+        settings = get_setting("parallel_build", {}) or {}
+        self.builder = builder
+        self.workers = workers or settings.get("workers") or os.cpu_count() or 1
+        self.chunk_size = chunk_size or settings.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        self.min_orders = min_orders if min_orders is not None else settings.get("min_orders", DEFAULT_MIN_ORDERS)
+        self._snapshot_dir: Optional[Path] = None
+        # Export jobs can share one ParallelBuilder; snapshots are published once
+        self._publish_lock = threading.Lock()
+
+    def build_row(self, order_number: str) -> dict:
+        return self.builder.build_row(order_number)
+
+    def build_records(self, order_numbers: List[str]) -> Tuple[List[tuple], list]:
+        order_numbers = list(order_numbers)
+        if self.workers <= 1 or len(order_numbers) < max(self.min_orders, 2):
+            return self.builder.build_records(order_numbers)
+        if getattr(self.builder, "joins_in_batch", False):
+            # The polars join build is already multi-threaded; workers could not share its frame
+            return self.builder.build_records(order_numbers)
+
+        chunks = [
+            order_numbers[i:i + self.chunk_size]
+            for i in range(0, len(order_numbers), self.chunk_size)
+        ]
+        # spawn: safe next to the Tk thread, and the same behaviour on Windows
+        context = multiprocessing.get_context("spawn")
+        records, failures = [], []
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(chunks)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=self._worker_source(),
+        ) as pool:
+            for chunk_records, chunk_failures in pool.map(_build_chunk, chunks):
+                records.extend(chunk_records)
+                failures.extend(chunk_failures)
+        return records, failures
+
+    def _worker_source(self) -> tuple:
+        """Where workers attach: the SQLite store, or Arrow snapshots published once per builder"""
+        loaders = (self.builder.master_orders, self.builder.location_master, self.builder.marketplace_mapping)
+        store = getattr(self.builder.master_orders, "store", None)
+        if store is not None:
+            return "sqlite", str(store.db_path), tuple(getattr(loader, "store_version", None) for loader in loaders)
+
+        with self._publish_lock:
+            if self._snapshot_dir is None:
+                snapshot_dir = Path(tempfile.mkdtemp(prefix="goswift_build_"))
+                weakref.finalize(self, shutil.rmtree, snapshot_dir, True)
+                for loader in loaders:
+                    if loader.is_loaded:
+                        loader.publish_snapshot(snapshot_dir)
+                self._snapshot_dir = snapshot_dir
+        return "arrow", str(self._snapshot_dir)
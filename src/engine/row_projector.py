@@ -0,0 +1,60 @@
+# =====================================================
+# ROW PROJECTOR
+# =====================================================
+# Compiles GOSWIFT_SCHEMA once into a single function that
+# returns one output row as a tuple in GOSWIFT_COLUMNS order:
+#
+#   project(order, loc, market, derived) -> tuple
+#
+# The generated body is one tuple expression, so building a row
+# is a single allocation with no intermediate dicts. Order,
+# location and marketplace values go through `safe` (NaN -> "").
+
+import pandas as pd
+
+from src.models.goswift_schema import (
+    GOSWIFT_SCHEMA,
+    STATIC,
+    ORDER,
+    LOCATION,
+    MARKETPLACE,
+    DERIVED,
+)
+
+
+def safe(value, default=""):
+    """Convert NaN / None to safe value"""
+    return default if pd.isna(value) else value
+
+
+_SOURCE_ARGS = {
+    ORDER: "order",
+    LOCATION: "loc",
+    MARKETPLACE: "market",
+}
+
+
+def compile_projector(schema=GOSWIFT_SCHEMA):
+    consts = []
+    items = []
+    for col in schema:
+        if col.source == STATIC:
+            items.append(f"_consts[{len(consts)}]")
+            consts.append(col.value)
+        elif col.source == DERIVED:
+            items.append(f"derived[{col.key!r}]")
+        elif col.source in _SOURCE_ARGS:
+            items.append(f"_safe({_SOURCE_ARGS[col.source]}.get({col.key!r}))")
+        else:
+            raise ValueError(f"Unknown source '{col.source}' for column '{col.name}'")
+
+    body = ",\n        ".join(items)
+    source = (
+        "def project(order, loc, market, derived):\n"
+        f"    return (\n        {body},\n    )\n"
+    )
+    namespace = {"_consts": tuple(consts), "_safe": safe}
+    exec(compile(source, "<goswift row projector>", "exec"), namespace)
+    project = namespace["project"]
+    project.__doc__ = "Build one GoSwift row tuple (compiled from GOSWIFT_SCHEMA)"
+    return project
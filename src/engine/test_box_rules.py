@@ -0,0 +1,84 @@
+# Box dimension rules: weight bands per (marketplace, courier) group.
+#
+#   python -m pytest src/engine/test_box_rules.py
+
+import pytest
+
+from src.engine import correctness_harness as harness
+from src.engine import goswift_engine_builder
+from src.engine.box_rules import BoxRules
+
+RULES = [
+    {"marketplace": "Amazon", "courier": "Delhivery", "up_to_gms": 2, "l_cms": 20, "w_cms": 15, "h_cms": 10, "box_type": 1},
+    {"marketplace": "Amazon", "courier": "*", "up_to_gms": 10, "l_cms": 40, "w_cms": 30, "h_cms": 30, "box_type": 2},
+    {"marketplace": "*", "courier": "BlueDart", "up_to_gms": None, "l_cms": 50, "w_cms": 40, "h_cms": 40, "box_type": 3},
+    {"marketplace": "*", "courier": "*", "up_to_gms": 5, "l_cms": 25, "w_cms": 20, "h_cms": 15, "box_type": 1},
+]
+
+
+def test_most_specific_group_with_a_band_wins():
+    rules = BoxRules(RULES, {"l_cms": 10, "w_cms": 10, "h_cms": 10, "box_type": 1})
+    dimensions = rules.assign(
+        [" amazon ", "Amazon", "Amazon", "Flipkart", "Flipkart", "Flipkart", "Nykaa", None],
+        ["DELHIVERY", "Delhivery", "Ekart", "BlueDart", "Ekart", "Ekart", "Ekart", None],
+        [2, 3, 12, 900, 5, 5.5, "heavy", 1],
+    )
+    assert dimensions.tolist() == [
+        (20, 15, 10, 1),   # exact pair, on the band limit
+        (40, 30, 30, 2),   # too heavy for the pair -> (Amazon, *)
+        (10, 10, 10, 1),   # too heavy for every Amazon band and (*, *) -> default
+        (50, 40, 40, 3),   # open-ended courier band
+        (25, 20, 15, 1),   # (*, *)
+        (10, 10, 10, 1),
+        (10, 10, 10, 1),   # no weight -> default
+        (25, 20, 15, 1),
+    ]
+
+
+def test_no_rules_keeps_the_default_box():
+    dimensions = BoxRules().assign(["Amazon"], ["Delhivery"], [3])
+    assert dimensions.tolist() == [(10, 10, 10, 1)]
+
+
+def test_repeated_band_is_rejected():
+    with pytest.raises(ValueError, match="repeat a weight band"):
+        BoxRules([{"up_to_gms": 5}, {"marketplace": "*", "up_to_gms": 5.0}])
+
+
+def test_weight_is_per_box():
+    rules = BoxRules([{"up_to_gms": 5, "box_type": 2}])
+    dimensions = rules.for_orders({
+        "A": {"total_weight_gms": 12, "box": 3},
+        "B": {"total_weight_gms": 12, "box": "2"},
+        "C": {"total_weight_gms": 4, "box": 0},
+    })
+    assert [dims[3] for dims in dimensions.values()] == [2, 1, 2]
+
+
+@pytest.mark.parametrize("loader_path", ["excel", "sqlite"])
+def test_batch_build_matches_build_row_with_rules(loader_path, tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    monkeypatch.setattr(goswift_engine_builder.BoxRules, "from_config", classmethod(lambda cls: cls(RULES)))
+    assert harness.run_harness(150, 5, [loader_path], ["batch"], work_dir=tmp_path) == []
+
+
+def test_single_order_lookup_matches_assign():
+    rules = BoxRules(RULES, {"l_cms": 10, "w_cms": 10, "h_cms": 10, "box_type": 1})
+    marketplaces = [" amazon ", "Amazon", "Amazon", "Flipkart", "Flipkart", None, "*", "", "Nykaa"]
+    couriers = ["DELHIVERY", "Delhivery", "Ekart", "BlueDart", "Ekart", None, "*", "Ekart", float("nan")]
+    weights = [2, 3, 12, 900, "5", 1, 4, " 2.5 ", "heavy"]
+    assert [rules.lookup(*order) for order in zip(marketplaces, couriers, weights)] == \
+        rules.assign(marketplaces, couriers, weights).tolist()
+
+    orders = {"A": {"total_weight_gms": 12, "box": 3, "marketplaces": "Amazon"},
+              "B": {"total_weight_gms": 12, "box": "2", "courier_name": "Delhivery"},
+              "C": {"total_weight_gms": 4, "box": 0}, "D": {"total_weight_gms": None, "box": ""}}
+    assert {po: rules.for_order(order) for po, order in orders.items()} == rules.for_orders(orders)
+
+
+def test_aliases_reach_their_rules():
+    aliases = {"marketplace": {"AMZ": "Amazon", "Amazon.in": "Amazon"}}
+    rules = BoxRules([{"marketplace": "Amazon", "up_to_gms": 5, "box_type": 2},
+                      {"marketplace": "amazon.in", "courier": "Ekart", "up_to_gms": 5, "box_type": 3}], aliases=aliases)
+    assert [dims[3] for dims in rules.assign(["amz", "Amazon", "Flipkart", "AMZ"], ["", "", "", "Ekart"], [1, 1, 1, 1])] == [2, 2, 1, 3]
+    assert rules.lookup("AMZ ", None, 1)[3] == 2 and rules.lookup("amz", "ekart", 1)[3] == 3
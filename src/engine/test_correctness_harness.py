@@ -0,0 +1,53 @@
+# Every fast path must produce the reference build_row CSV byte for byte.
+#
+#   python -m pytest src/engine/test_correctness_harness.py
+
+import importlib.util
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from src.engine import correctness_harness as harness
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_in_process_paths_match_reference(seed, tmp_path):
+    loader_paths = ["excel", "sqlite"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        loader_paths.append("snapshot")
+    if importlib.util.find_spec("polars") is not None:
+        loader_paths.append("polars")
+    assert harness.run_harness(150, seed, loader_paths, ["batch"], work_dir=tmp_path) == []
+
+
+def test_parallel_path_matches_reference(tmp_path):
+    pytest.importorskip("pyarrow")
+    assert harness.run_harness(150, 3, ["excel"], ["parallel"], work_dir=tmp_path) == []
+
+
+def test_harness_reports_a_diverging_path(tmp_path, monkeypatch):
+    def drop_last_row(builder, order_numbers):
+        records, failures = builder.build_records(order_numbers)
+        return records[:-1], failures
+
+    monkeypatch.setitem(harness.BUILD_PATHS, "broken", drop_last_row)
+    problems = harness.run_harness(60, 0, ["excel"], ["broken"], work_dir=tmp_path)
+    assert problems and "excel+broken: CSV differs" in problems[0]
+
+
+@pytest.mark.parametrize("loader_path", ["excel", "sqlite"])
+def test_quality_scan_predicts_reference_failures(loader_path, tmp_path):
+    import contextlib
+    import io
+
+    from src.engine.data_quality import scan
+    from src.engine.goswift_engine_builder import GoSwiftBuilder
+
+    files = harness.write_synthetic_data(tmp_path / "data", 200, 4)
+    order_numbers = harness.order_list(files["master_orders"], 4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaders = harness.LOADER_PATHS[loader_path](files, tmp_path / loader_path)
+        _, failed = harness.reference_output(GoSwiftBuilder(*loaders), order_numbers)
+        report = scan(*loaders)
+    assert set(report.blocked(order_numbers)) == set(failed)
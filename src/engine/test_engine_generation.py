@@ -0,0 +1,95 @@
+# Engine generations: immutable loader sets with a bounded rollback history.
+#
+#   python -m pytest src/engine/test_engine_generation.py
+
+import contextlib
+import gc
+import io
+from pathlib import Path
+
+import pytest
+
+from src.engine.engine_generation import EngineGeneration, GenerationManager, build_generation, derive_generation
+
+
+def generation(number):
+    return EngineGeneration(number, f"master {number}", None, None, None)
+
+
+@pytest.fixture
+def manager():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield GenerationManager(keep=3)
+
+
+def test_history_keeps_the_newest_generations(manager):
+    for number in range(1, 6):
+        manager.publish(generation(number))
+    assert manager.current.number == 5
+    assert [g.number for g in manager.history()] == [4, 3, 2]
+
+
+def test_rollback_walks_back_through_history(manager):
+    for number in range(1, 4):
+        manager.publish(generation(number))
+    assert manager.rollback().number == 2
+    assert manager.rollback().number == 1
+    assert manager.current.number == 1
+    assert not manager.can_rollback()
+    with pytest.raises(RuntimeError):
+        manager.rollback()
+
+
+def test_numbers_are_unique(manager):
+    assert [manager.next_number() for _ in range(3)] == [1, 2, 3]
+
+
+class Loader:
+    is_loaded = False
+
+    def __init__(self, name):
+        self.name = name
+
+
+def test_derive_replaces_one_source(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = build_generation(
+            1, Loader("master"), Loader("locations"), Loader("mapping"),
+            sources={"master_orders": tmp_path / "m1.xlsx", "location_master": tmp_path / "l1.xlsx"},
+        )
+        derived = derive_generation(base, 2, "master_orders", Loader("master v2"), tmp_path / "m2.xlsx")
+
+    assert derived.number == 2
+    assert derived.master_orders.name == "master v2"
+    assert derived.location_master is base.location_master
+    assert derived.builder.master_orders is derived.master_orders
+    assert derived.sources == {"master_orders": tmp_path / "m2.xlsx", "location_master": tmp_path / "l1.xlsx"}
+    # The base generation is untouched
+    assert base.master_orders.name == "master"
+    assert base.sources["master_orders"] == tmp_path / "m1.xlsx"
+
+    with pytest.raises(KeyError):
+        derive_generation(base, 3, "pincodes", Loader("x"))
+
+
+def test_one_parallel_builder_per_generation(manager):
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = build_generation(1, Loader("master"), Loader("locations"), Loader("mapping"))
+        second = derive_generation(first, 2, "master_orders", Loader("master v2"))
+    assert first.parallel_builder.builder is first.builder
+    assert second.parallel_builder.builder is second.builder
+    assert second.parallel_builder is not first.parallel_builder
+
+    # Worker snapshots are published once and removed with the generation
+    source = first.parallel_builder._worker_source()
+    assert first.parallel_builder._worker_source() == source
+    snapshot_dir = Path(source[1])
+    assert snapshot_dir.is_dir()
+
+    manager.publish(first)
+    for number in range(3, 8):
+        manager.publish(generation(number))
+    assert first not in manager.history()
+    del first, source
+    gc.collect()
+    assert not snapshot_dir.exists()
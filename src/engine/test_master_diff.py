@@ -0,0 +1,85 @@
+import pickle
+
+import pandas as pd
+
+from src.engine.master_diff import PendingOrders, diff_fingerprints, fingerprint
+
+
+def master(**rows) -> pd.DataFrame:
+    """PO -> box count; order_number spelled as the master has it"""
+    return pd.DataFrame({
+        "order_number": [f" {po.lower()} " for po in rows],
+        "po_key": list(rows),
+        "box": list(rows.values()),
+        "exp_date": pd.Timestamp("2026-01-01"),
+    })
+
+
+def test_fingerprint_one_hash_per_po():
+    df = pd.concat([master(PO1=1, PO2=2), master(PO1=9)])
+    prints = fingerprint(df)
+    assert list(prints.index) == ["PO1", "PO2"]
+    assert fingerprint(master(PO1=1)).loc["PO1"] == prints.loc["PO1"]
+    assert fingerprint(master(PO1=2)).loc["PO1"] != prints.loc["PO1"]
+    assert len(fingerprint(None)) == 0
+
+
+def test_diff_new_changed_removed():
+    old = fingerprint(master(PO1=1, PO2=2, PO3=3))
+    new = fingerprint(master(PO2=2, PO3=4, PO4=1, PO5=1))
+    diff = diff_fingerprints(old, new)
+    assert diff.added == ["PO4", "PO5"]
+    assert diff.changed == ["PO3"]
+    assert diff.removed == ["PO1"]
+    assert diff.pending == ["PO4", "PO5", "PO3"]
+    assert diff.summary() == "2 new, 1 changed, 1 removed"
+
+
+def test_first_load_is_baseline_and_empty_master_ignored(tmp_path):
+    pending = PendingOrders(tmp_path / "state.pkl")
+    assert pending.update(master(PO1=1)).pending == []
+    assert pending.update(master()).pending == []
+    assert pending.update(master(PO1=1, PO2=1)).added == ["PO2"]
+
+
+def test_pending_tracks_changed_separately(tmp_path):
+    pending = PendingOrders(tmp_path / "state.pkl")
+    pending.update(master(PO1=1, PO2=1))
+    pending.update(master(PO1=2, PO2=1, PO3=1))
+    assert pending.pending == ["PO3", "PO1"] and pending.changed == ["PO1"]
+
+    pending.mark_done(["PO1"])
+    assert pending.pending == ["PO3"] and pending.changed == []
+
+    # A PO that leaves the master is no longer pending
+    pending.update(master(PO1=2, PO2=1))
+    assert pending.pending == []
+
+
+def test_state_file_round_trip(tmp_path):
+    path = tmp_path / "state.pkl"
+    first = PendingOrders(path)
+    first.update(master(PO1=1, PO2=1))
+    first.update(master(PO1=2, PO2=1, PO3=1))
+
+    second = PendingOrders(path)
+    assert second.pending == ["PO3", "PO1"] and second.changed == ["PO1"]
+    # The reloaded baseline diffs like the one in memory
+    assert second.update(master(PO1=2, PO2=5, PO3=1)).changed == ["PO2"]
+    assert second.changed == ["PO1", "PO2"]
+
+
+def test_state_file_without_changed(tmp_path):
+    path = tmp_path / "state.pkl"
+    with open(path, "wb") as f:
+        pickle.dump({"fingerprint": fingerprint(master(PO1=1)), "pending": ["PO1"]}, f)
+    pending = PendingOrders(path)
+    assert pending.pending == ["PO1"] and pending.changed == []
+
+
+def test_unreadable_state_starts_new_baseline(tmp_path):
+    path = tmp_path / "state.pkl"
+    path.write_bytes(b"not a pickle")
+    pending = PendingOrders(path)
+    assert pending.pending == []
+    assert pending.update(master(PO1=1)).pending == []
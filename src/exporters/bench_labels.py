@@ -0,0 +1,66 @@
+# =====================================================
+# LABEL PDF BENCHMARK
+# =====================================================
+# Renders the same synthetic batch in-process and with 1..N workers,
+# checks that every run writes the same file, and prints pages/s.
+#
+#   python -m src.exporters.bench_labels 2000
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.engine.box_rules import DEFAULT_DIMENSIONS
+from src.models.goswift_schema import STATIC_VALUES
+from src.exporters.label_pdf import LabelRenderer, box_count
+
+
+def synthetic_rows(n: int):
+    return [
+        dict(
+            STATIC_VALUES,
+            **DEFAULT_DIMENSIONS,
+            order_number=f"FBSWN{i:08d}",
+            purchase_order_number=f"FBSWN{i:08d}",
+            customer_name=f"RENEE Warehouse {i % 40}, Bengaluru",
+            customer_address="Plot 12, \"KIADB\" Industrial Area, Hoskote, Near Toll Gate, Old Madras Road",
+            customer_pincode="562114",
+            customer_city="Bengaluru",
+            customer_state="Karnataka",
+            invoice_number=f"INV{i}",
+            total_weight_gms=i * 37 % 40000,
+            number_of_boxes=i % 9 + 1,
+            seller_courier_choice="Delhivery",
+            b2b_order_channel="AMZ",
+            purchase_order_expiry_date="31-01-2026",
+        )
+        for i in range(n)
+    ]
+
+
+def run(n: int):
+    rows = synthetic_rows(n)
+    pages = sum(box_count(row) for row in rows)
+    print(f"{n} orders, {pages} pages")
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = Path(tmp) / "in_process.pdf"
+        start = time.perf_counter()
+        LabelRenderer(workers=1).render(rows, reference)
+        base = time.perf_counter() - start
+        print(f"in-process   {base:7.2f} s  {pages / base:8.0f} pages/s  {reference.stat().st_size / 1e6:.1f} MB")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            path = Path(tmp) / f"workers_{workers}.pdf"
+            start = time.perf_counter()
+            LabelRenderer(workers=workers, min_pages=0).render(rows, path)
+            elapsed = time.perf_counter() - start
+            assert path.read_bytes() == reference.read_bytes(), "parallel render wrote a different file"
+            print(f"{workers:3d} workers  {elapsed:7.2f} s  {pages / elapsed:8.0f} pages/s  x{base / elapsed:.2f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
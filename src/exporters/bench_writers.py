@@ -0,0 +1,57 @@
+# =====================================================
+# OUTPUT WRITER BENCHMARK
+# =====================================================
+# Writes the same synthetic GoSwift batch with every writer and
+# prints the time and file size for each.
+#
+#   python -m src.exporters.bench_writers 200000
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.engine.box_rules import DEFAULT_DIMENSIONS
+from src.models.goswift_schema import GOSWIFT_COLUMNS, STATIC_VALUES
+from src.exporters.writers import WRITERS
+
+
+def synthetic_batch(n: int) -> pd.DataFrame:
+    values = {**STATIC_VALUES, **DEFAULT_DIMENSIONS}
+    df = pd.DataFrame({col: [values.get(col, "")] * n for col in GOSWIFT_COLUMNS})
+    po = pd.Series(range(n)).map(lambda i: f"FBSWN{i:08d}")
+    df["order_number"] = po
+    df["purchase_order_number"] = po
+    df["customer_name"] = "RENEE Warehouse, Bengaluru"
+    df["customer_address"] = "Plot 12, \"KIADB\" Industrial Area, Hoskote"
+    df["customer_pincode"] = "562114"
+    df["service_type"] = "SURFACE"
+    df["total_weight_gms"] = pd.Series(range(n)) % 40000
+    df["order_invoice_amount"] = pd.Series(range(n)) * 7 % 250000
+    df["number_of_boxes"] = pd.Series(range(n)) % 9 + 1
+    df["purchase_order_expiry_date"] = "31-01-2026"
+    return df[GOSWIFT_COLUMNS]
+
+
+def run(n: int):
+    df = synthetic_batch(n)
+    print(f"Benchmarking {n} rows x {len(GOSWIFT_COLUMNS)} columns\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, writer_cls in WRITERS.items():
+            try:
+                writer = writer_cls()
+            except ImportError as e:
+                print(f"{name:12} skipped ({e})")
+                continue
+            path = Path(tmp) / f"bench_{name}{writer.extension}"
+            start = time.perf_counter()
+            writer.write(df, path)
+            elapsed = time.perf_counter() - start
+            size_mb = path.stat().st_size / 1e6
+            print(f"{name:12} {elapsed:8.3f} s  {size_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,223 @@
+# =====================================================
+# EXPORT JOBS
+# =====================================================
+# Background queue for GoSwift exports. Each submitted batch is
+# an ExportJob that runs on a bounded thread pool and keeps its
+# status, timings, output path and error. Nothing here knows about
+# Tk: the UI, a CLI or a service pass `on_update` to hear about
+# state changes (called on the worker thread).
+#
+# A job claims its POs in the export ledger when it is submitted
+# (ExportLedger.claim, atomic across threads and processes). POs a
+# queued or running job already holds are left out of a new job,
+# and a job that fails gives its claims back. A heartbeat renews the
+# claims of queued and running jobs, so a job waiting behind long
+# ones does not see them go stale and taken over.
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.utils.order_intake import normalize_order_number
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_WORKERS = 2
+# Finished jobs kept for the history list
+DEFAULT_HISTORY = 50
+# Claim renewal interval, well inside export_ledger.STALE_CLAIM
+HEARTBEAT_SECONDS = 15 * 60
+
+
+@dataclass
+class ExportJob:
+    id: int
+    order_numbers: List[str]
+    builder: object = field(repr=False)
+    force: bool = False
+    generation: Optional[int] = None
+    label: str = ""
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    output_path: Optional[Path] = None
+    error: str = ""
+    skipped_orders: List[str] = field(default_factory=list)
+    failed_orders: List[str] = field(default_factory=list)
+    # POs dropped at submit because another active job already has them
+    claimed_elsewhere: List[str] = field(default_factory=list)
+    # Ledger claim on order_numbers, held until the job finishes
+    claim: object = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def wait_seconds(self) -> float:
+        return (self.started_at or time.time()) - self.submitted_at
+
+    @property
+    def run_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def summary(self) -> str:
+        text = f"#{self.id} {self.status} - {len(self.order_numbers)} orders"
+        if self.label:
+            text += f" ({self.label})"
+        if self.status == DONE:
+            text += f" in {self.run_seconds:.1f}s -> {self.output_path.name}"
+        elif self.status == FAILED:
+            text += f": {self.error}"
+        return text
+
+
+class ExportJobQueue:
+    def __init__(
+        self,
+        output_dir: Path,
+        ledger=None,
+        max_workers: int = DEFAULT_WORKERS,
+        history: int = DEFAULT_HISTORY,
+        on_update: Callable[[ExportJob], None] = None,
+    ):
+        self.output_dir = Path(output_dir)
+        self.ledger = ledger
+        self.history = history
+        self.on_update = on_update
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-job")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: List[ExportJob] = []
+        self._stopped = threading.Event()
+        if ledger is not None:
+            threading.Thread(target=self._heartbeat, name="export-claims", daemon=True).start()
+
+    def submit(self, order_numbers: List[str], builder, force: bool = False,
+               generation: int = None, label: str = "") -> ExportJob:
+        """
+        Queue one export. `builder` is pinned for the whole job. With a ledger the
+        POs are claimed now: exported before (unless force) -> skipped_orders,
+        held by another job -> claimed_elsewhere.
+        """
+        order_numbers = list(dict.fromkeys(normalize_order_number(po) for po in order_numbers))
+        claim = self.ledger.claim(order_numbers, force=force) if self.ledger is not None else None
+        with self._lock:
+            job = ExportJob(
+                id=next(self._ids),
+                order_numbers=claim.claimed if claim is not None else order_numbers,
+                builder=builder,
+                force=force,
+                generation=generation,
+                label=label,
+                skipped_orders=claim.skipped if claim is not None else [],
+                claimed_elsewhere=claim.busy if claim is not None else [],
+                claim=claim,
+            )
+            self._jobs.append(job)
+            self._trim()
+
+        if job.skipped_orders:
+            print(f"Job #{job.id}: {len(job.skipped_orders)} orders already exported")
+        if job.claimed_elsewhere:
+            print(f"Job #{job.id}: {len(job.claimed_elsewhere)} orders already in another job")
+        if not job.order_numbers:
+            self._finish(job, FAILED, error=(
+                "All orders were already exported. Use force to export them again."
+                if job.skipped_orders else "Every order is already in another export job"
+            ))
+        else:
+            self._notify(job)
+            self._pool.submit(self._run, job)
+        return job
+
+    def jobs(self) -> List[ExportJob]:
+        """Recent jobs, newest first"""
+        with self._lock:
+            return list(reversed(self._jobs))
+
+    def get(self, job_id: int) -> Optional[ExportJob]:
+        with self._lock:
+            return next((job for job in self._jobs if job.id == job_id), None)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs if not job.finished)
+
+    def shutdown(self, wait: bool = True):
+        self._stopped.set()
+        self._pool.shutdown(wait=wait)
+
+    def renew_claims(self):
+        """Keep the ledger claims of queued and running jobs alive"""
+        with self._lock:
+            claims = [job.claim for job in self._jobs if not job.finished and job.claim is not None]
+        for claim in claims:
+            try:
+                self.ledger.renew(claim)
+            except Exception as e:
+                print(f"⚠️ Could not renew export claims: {e}")
+
+    def _heartbeat(self):
+        while not self._stopped.wait(HEARTBEAT_SECONDS):
+            self.renew_claims()
+
+    # ============ WORKER ============
+    def _run(self, job: ExportJob):
+        from src.exporters.goswift_csv_exporter import GoSwiftExporter
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._notify(job)
+        try:
+            exporter = GoSwiftExporter(job.builder, self.output_dir, ledger=self.ledger)
+            path = exporter.export(job.order_numbers, force=job.force, generation=job.generation, claim=job.claim)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+            return
+        job.failed_orders = exporter.failed_orders
+        if exporter.busy_orders:
+            # Claims that went stale before the job started and were taken over
+            lost = set(exporter.busy_orders)
+            job.order_numbers = [po for po in job.order_numbers if po not in lost]
+            job.claimed_elsewhere = job.claimed_elsewhere + exporter.busy_orders
+        self._finish(job, DONE, output_path=path)
+
+    def _finish(self, job: ExportJob, status: str, output_path: Path = None, error: str = ""):
+        if status == FAILED and job.claim is not None:
+            # Usually released by the exporter already; a no-op then
+            try:
+                self.ledger.release(job.claim)
+            except Exception as e:
+                print(f"⚠️ Could not release the claims of job #{job.id}: {e}")
+        job.output_path = output_path
+        job.error = error
+        job.finished_at = time.time()
+        if job.started_at is None:
+            job.started_at = job.finished_at
+        job.status = status
+        print(f"{'✅' if status == DONE else '❌'} Export job {job.summary()}")
+        self._notify(job)
+
+    def _notify(self, job: ExportJob):
+        if self.on_update is not None:
+            try:
+                self.on_update(job)
+            except Exception as e:
+                print(f"⚠️ Job update callback failed: {e}")
+
+    def _trim(self):
+        """Drop the oldest finished jobs beyond the history limit"""
+        finished = [job for job in self._jobs if job.finished]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            self._jobs.remove(job)
@@ -0,0 +1,225 @@
+# =====================================================
+# EXPORT LEDGER
+# =====================================================
+# SQLite record of every PO written to a GoSwift file, so an
+# overlapping paste does not create the same shipment twice.
+#
+# Each PO has at most one *active* row (UNIQUE (order_number, active);
+# superseded rows keep active NULL as history). An export first claims
+# its POs: inside one BEGIN IMMEDIATE transaction the active row is
+# inserted (new PO) or taken over (forced re-export), and whatever the
+# transaction could not claim is reported back - exported before, or
+# claimed by another export still running. Only then is the file built.
+# record() turns the claims into exports, release() gives them back.
+#
+# A claim not renewed for STALE_CLAIM belongs to an export that died and
+# is taken over. Holders that wait (queued jobs) renew() theirs on a
+# heartbeat, and renew again when they start to learn which POs they
+# still hold.
+
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+LEDGER_PATH = PROJECT_ROOT / "output" / "export_ledger.sqlite3"
+
+# A claim not renewed for this long belongs to an export that died without releasing it
+STALE_CLAIM = timedelta(hours=1)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exported_orders (
+    order_number TEXT NOT NULL,
+    file_path    TEXT,
+    exported_at  TEXT,
+    generation   INTEGER,
+    claim        TEXT,
+    claimed_at   TEXT,
+    active       INTEGER,
+    UNIQUE (order_number, active)
+);
+CREATE INDEX IF NOT EXISTS idx_exported_orders_claim ON exported_orders (claim);
+"""
+
+# Ledgers written before claims existed: one row per (PO, export), no active flag.
+# The newest export of each PO becomes its active row, older ones stay as history.
+MIGRATE = """
+ALTER TABLE exported_orders RENAME TO exported_orders_old;
+DROP INDEX IF EXISTS idx_exported_orders_po;
+{schema}
+INSERT INTO exported_orders (order_number, file_path, exported_at, generation, active)
+SELECT order_number, file_path, exported_at, generation,
+       CASE WHEN rowid = (SELECT MAX(rowid) FROM exported_orders_old AS newer
+                          WHERE newer.order_number = exported_orders_old.order_number)
+            THEN 1 END
+FROM exported_orders_old ORDER BY rowid;
+DROP TABLE exported_orders_old;
+""".format(schema=SCHEMA)
+
+
+@dataclass
+class Claim:
+    token: str
+    # POs this export now owns, in input order
+    claimed: List[str] = field(default_factory=list)
+    # exported before (and not forced)
+    skipped: List[str] = field(default_factory=list)
+    # claimed by another export that has not finished
+    busy: List[str] = field(default_factory=list)
+
+
+class ExportLedger:
+    def __init__(self, db_path: Path = LEDGER_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(exported_orders)")}
+            if columns and "active" not in columns:
+                conn.executescript("BEGIN IMMEDIATE;" + MIGRATE + "COMMIT;")
+            else:
+                conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Fresh connection per call (exports can run on worker threads); commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _immediate(self):
+        """Write transaction that takes the database lock up front, so check-then-write is atomic"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime(TIME_FORMAT)
+
+    def claim(self, order_numbers: Iterable[str], force: bool = False) -> Claim:
+        """
+        Atomically take the POs this export may build. POs exported before are
+        skipped unless force=True; POs claimed by a running export are busy either way.
+        """
+        order_numbers = list(dict.fromkeys(order_numbers))
+        claim = Claim(uuid.uuid4().hex)
+        batch = json.dumps(order_numbers)
+        now = datetime.now()
+        stale = (now - STALE_CLAIM).strftime(TIME_FORMAT)
+        with self._immediate() as conn:
+            # Claims left behind by a crashed export
+            conn.execute("DELETE FROM exported_orders WHERE claim IS NOT NULL AND file_path IS NULL AND claimed_at < ?", (stale,))
+            conn.execute("UPDATE exported_orders SET claim = NULL, claimed_at = NULL WHERE claim IS NOT NULL AND claimed_at < ?", (stale,))
+
+            conn.execute(
+                "INSERT INTO exported_orders (order_number, claim, claimed_at, active) "
+                "SELECT value, ?, ?, 1 FROM json_each(?) WHERE true "
+                "ON CONFLICT (order_number, active) DO NOTHING",
+                (claim.token, now.strftime(TIME_FORMAT), batch),
+            )
+            if force:
+                conn.execute(
+                    "UPDATE exported_orders SET claim = ?, claimed_at = ? "
+                    "WHERE active = 1 AND claim IS NULL AND order_number IN (SELECT value FROM json_each(?))",
+                    (claim.token, now.strftime(TIME_FORMAT), batch),
+                )
+            owners = dict(conn.execute(
+                "SELECT order_number, claim FROM exported_orders "
+                "WHERE active = 1 AND order_number IN (SELECT value FROM json_each(?))",
+                (batch,),
+            ).fetchall())
+
+        for po in order_numbers:
+            owner = owners.get(po)
+            if owner == claim.token:
+                claim.claimed.append(po)
+            elif owner is None:
+                claim.skipped.append(po)
+            else:
+                claim.busy.append(po)
+        return claim
+
+    def record(self, claim: Claim, order_numbers: Iterable[str], file_path: Path, generation: Optional[int] = None):
+        """
+        Turn the claims on `order_numbers` into exports of `file_path`, in a single
+        transaction. Claims of this export not listed (failed POs) are released.
+        """
+        batch = json.dumps(list(order_numbers))
+        with self._immediate() as conn:
+            # A forced re-export keeps the previous export as history
+            conn.execute(
+                "INSERT INTO exported_orders (order_number, file_path, exported_at, generation) "
+                "SELECT order_number, file_path, exported_at, generation FROM exported_orders "
+                "WHERE claim = ? AND file_path IS NOT NULL AND order_number IN (SELECT value FROM json_each(?))",
+                (claim.token, batch),
+            )
+            conn.execute(
+                "UPDATE exported_orders SET file_path = ?, exported_at = ?, generation = ?, claim = NULL, claimed_at = NULL "
+                "WHERE claim = ? AND order_number IN (SELECT value FROM json_each(?))",
+                (str(file_path), self._now(), generation, claim.token, batch),
+            )
+            self._release(conn, claim)
+
+    def renew(self, claim: Claim) -> List[str]:
+        """
+        Mark the claim as alive again and return the POs it still holds, in
+        claim order (POs of a claim that went stale may have been taken over).
+        """
+        with self._immediate() as conn:
+            conn.execute("UPDATE exported_orders SET claimed_at = ? WHERE claim = ?", (self._now(), claim.token))
+            held = {row[0] for row in conn.execute("SELECT order_number FROM exported_orders WHERE claim = ?", (claim.token,))}
+        return [po for po in claim.claimed if po in held]
+
+    def release(self, claim: Claim):
+        """Give back every PO still claimed by this export (it failed or was cancelled)"""
+        with self._immediate() as conn:
+            self._release(conn, claim)
+
+    @staticmethod
+    def _release(conn, claim: Claim):
+        conn.execute("DELETE FROM exported_orders WHERE claim = ? AND file_path IS NULL", (claim.token,))
+        conn.execute("UPDATE exported_orders SET claim = NULL, claimed_at = NULL WHERE claim = ?", (claim.token,))
+
+    def already_exported(self, order_numbers: Iterable[str]) -> Set[str]:
+        """Which of these POs are in the ledger (one query for the whole batch)"""
+        order_numbers = list(order_numbers)
+        if not order_numbers:
+            return set()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT order_number FROM exported_orders "
+                "WHERE file_path IS NOT NULL AND order_number IN (SELECT value FROM json_each(?))",
+                (json.dumps(order_numbers),),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def lookup(self, order_number: str) -> List[dict]:
+        """Every export of a PO, newest first"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT order_number, file_path, exported_at, generation FROM exported_orders "
+                "WHERE order_number = ? AND file_path IS NOT NULL "
+                "ORDER BY active IS NULL, exported_at DESC, rowid DESC",
+                (order_number,),
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -7,39 +7,119 @@ from src.engine.goswift_engine_builder import (
     GoSwiftBuilder,
     GOSWIFT_COLUMNS
 )
+from src.exporters.writers import BaseWriter, get_writer
+from src.exporters.export_ledger import Claim, ExportLedger
+from src.utils.order_intake import normalize_order_number
 
 
-class GoSwiftCSVExporter:
-    def __init__(self, builder: GoSwiftBuilder, output_dir: Path):
+class GoSwiftExporter:
+    def __init__(
+        self,
+        builder: GoSwiftBuilder,
+        output_dir: Path,
+        writer: BaseWriter = None,
+        ledger: ExportLedger = None,
+    ):
         self.builder = builder
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True) #explain this line
-    
-    def export(self, order_numbers: List[str]) -> Path:
-        rows = []
-        failed_orders = []
-        for order_number in order_numbers:
-            try:
-                row = self.builder.build_row(order_number)
-                rows.append(row)
-            except Exception as e:
-                print(f"Failed to process order :{order_number} due to {e}")
-            
-        if not rows:
-            raise RuntimeError("No valid orders found. CSV not generated.")
-        
-        df = pd.DataFrame(rows)
-        
-        df = df.reindex(columns=GOSWIFT_COLUMNS) # what does this line do?
+        # CSV by default; "output_format" in config.json picks another writer
+        self.writer = writer or get_writer()
+        # Optional: skip POs already exported in earlier runs
+        self.ledger = ledger
+        self.skipped_orders = []
+        self.busy_orders = []
+        self.failed_orders = []
+
+    def export(self, order_numbers: List[str], force: bool = False, generation: int = None,
+               claim: Claim = None) -> Path:
+        """
+        Build and write one GoSwift file. With a ledger, the POs are claimed first:
+        POs exported before are skipped (self.skipped_orders) unless force=True, and
+        POs another export is working on are left to it (self.busy_orders).
+        A caller that already holds a `claim` (ExportJobQueue) passes it in instead;
+        it is renewed first, and POs it lost while waiting go to self.busy_orders.
+        """
+        # Lookup keys (the file keeps the master's spelling); never build the same order twice
+        order_numbers = list(dict.fromkeys(normalize_order_number(po) for po in order_numbers))
+
+        self.skipped_orders = []
+        self.busy_orders = []
+        self.failed_orders = []
+        if claim is not None:
+            held = set(self.ledger.renew(claim))
+            self.busy_orders = [po for po in order_numbers if po in claim.claimed and po not in held]
+            order_numbers = [po for po in order_numbers if po in held]
+            if self.busy_orders:
+                print(f"Claim expired, left to another export: {', '.join(self.busy_orders)}")
+            if not order_numbers:
+                raise RuntimeError("All orders are being exported by another job.")
+        elif self.ledger is not None:
+            claim = self.ledger.claim(order_numbers, force=force)
+            order_numbers = claim.claimed
+            self.skipped_orders, self.busy_orders = claim.skipped, claim.busy
+            if self.skipped_orders:
+                print(f"Skipping already exported orders: {', '.join(self.skipped_orders)}")
+            if self.busy_orders:
+                print(f"Left to another running export: {', '.join(self.busy_orders)}")
+            if not order_numbers:
+                raise RuntimeError(
+                    "All orders were already exported. Use force to export them again."
+                    if self.skipped_orders else "All orders are being exported by another job."
+                )
+
+        try:
+            file_path = self._build_and_write(order_numbers)
+        except BaseException:
+            if claim is not None:
+                self.ledger.release(claim)
+            raise
+
+        if claim is not None:
+            failed = set(self.failed_orders)
+            self.ledger.record(claim, [po for po in order_numbers if po not in failed], file_path, generation)
+        return file_path
+
+    def _build_and_write(self, order_numbers: List[str]) -> Path:
+        records, failures = self.builder.build_records(order_numbers)
+        failed_orders = self.failed_orders = [order_number for order_number, _ in failures]
+        for order_number, e in failures:
+            print(f"Failed to process order :{order_number} due to {e}")
+
+        if not records:
+            raise RuntimeError("No valid orders found. File not generated.")
+
+        df = pd.DataFrame.from_records(records, columns=GOSWIFT_COLUMNS)
+
+        file_path = self._new_file_path()
+        try:
+            self.writer.write(df, file_path)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
+        print(f"\n Go Swift {self.writer.label} Exported Successfully at {file_path} with {len(records)} orders\n")
 
-        timestamp = datetime.now().strftime("%d-%m-%Y-%H-%M-%S")
-        file_path = self.output_dir / f"GoSwift_{timestamp}.csv"
-        
-        df.to_csv(file_path, index=False) #what does index=False do?
-        print(f"\n Go Swift CSV Exported Successfully at {file_path} with {len(rows)} orders\n")
-        
         if failed_orders:
             print(f"Failed to process the following orders: {', '.join(failed_orders)}")
-        
+
         return file_path
-    
\ No newline at end of file
+
+    def _new_file_path(self) -> Path:
+        """
+        GoSwift_<timestamp>.<ext>, numbered if several exports land in the same second.
+        The name is claimed by creating the file, so concurrent export jobs never share one.
+        """
+        timestamp = datetime.now().strftime("%d-%m-%Y-%H-%M-%S")
+        n = 1
+        while True:
+            suffix = "" if n == 1 else f"_{n}"
+            file_path = self.output_dir / f"GoSwift_{timestamp}{suffix}{self.writer.extension}"
+            try:
+                file_path.open("x").close()
+                return file_path
+            except FileExistsError:
+                n += 1
+
+
+# Older name, from when CSV was the only output format
+GoSwiftCSVExporter = GoSwiftExporter
@@ -0,0 +1,435 @@
+# =====================================================
+# SHIPPING LABEL PDF
+# =====================================================
+# Turns built GoSwift rows into print-ready labels: one page per
+# box (`number_of_boxes`) with the ship-to address, pincode, PO,
+# invoice and a Code 128 barcode of the PO.
+#
+# No PDF library needed: pages only use the standard Helvetica fonts
+# (never embedded) and vector bars, so the file is written here
+# directly. Those fonts only cover WinAnsi (cp1252): anything else,
+# e.g. a Devanagari address, prints as "?". render() counts such
+# characters per order and warns (LabelRenderer.replacements). Static parts - fonts, the optional JPEG logo - are
+# written once and referenced by every page; the frame of the page
+# is cached per process.
+#
+# Big batches are rendered in a process pool: workers build and
+# compress the page content streams in chunks, the parent appends
+# them to the file in order as they arrive. At most a few chunks are
+# in flight, so memory does not grow with the batch.
+#
+#   "labels": {"page_size_mm": [100, 150], "logo": "", "workers": 0,
+#              "chunk_pages": 250, "min_pages": 500}
+
+import functools
+import multiprocessing
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.models.goswift_schema import GOSWIFT_COLUMNS
+from src.utils.config import get_setting
+
+MM = 72 / 25.4
+DEFAULT_PAGE_MM = (100, 150)
+DEFAULT_CHUNK_PAGES = 250
+# Below this many pages a pool costs more than it saves
+DEFAULT_MIN_PAGES = 500
+
+# =====================================================
+# CODE 128
+# =====================================================
+# Bar/space widths of symbols 0-105; STOP is the 13-module stop symbol
+CODE128 = (
+    "212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 "
+    "221312 231212 112232 122132 122231 113222 123122 123221 223211 221132 "
+    "221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 "
+    "212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 "
+    "231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 "
+    "231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 "
+    "314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 "
+    "112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 "
+    "111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 "
+    "214121 412121 111143 111341 131141 114113 114311 411113 411311 113141 "
+    "114131 311141 411131 211412 211214 211232"
+).split()
+START_B = 104
+STOP = "2331112"
+QUIET_MODULES = 10
+
+
+def code128_symbols(text: str) -> List[int]:
+    """Code set B symbols for printable ASCII, with start and checksum (stop not included)"""
+    values = []
+    for char in text:
+        if not 32 <= ord(char) < 127:
+            raise ValueError(f"Cannot encode {char!r} in a Code 128 label barcode")
+        values.append(ord(char) - 32)
+    checksum = (START_B + sum(i * v for i, v in enumerate(values, start=1))) % 103
+    return [START_B] + values + [checksum]
+
+
+def code128_widths(text: str) -> str:
+    """Alternating bar/space widths in modules, starting with a bar"""
+    return "".join(CODE128[s] for s in code128_symbols(text)) + STOP
+
+
+# =====================================================
+# TEXT
+# =====================================================
+# Helvetica advance widths (1/1000 em) for ASCII 32-126; bold text is
+# measured with these plus a margin, which is close enough for wrapping
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+BOLD_FACTOR = 1.08
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    width = sum(HELVETICA_WIDTHS[ord(c) - 32] if 32 <= ord(c) < 127 else 556 for c in text)
+    return width * size / 1000 * (BOLD_FACTOR if bold else 1)
+
+
+def wrap(text: str, size: float, width: float, max_lines: int, bold: bool = False) -> List[str]:
+    """Greedy word wrap; the last line is cut with "..." when the text does not fit"""
+    lines, line = [], ""
+    for word in str(text).split():
+        candidate = f"{line} {word}".strip()
+        if line and text_width(candidate, size, bold) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    if len(lines) > max_lines:
+        last = lines[max_lines - 1]
+        while last and text_width(last + "...", size, bold) > width:
+            last = last[:-1]
+        lines = lines[:max_lines - 1] + [last.rstrip() + "..."]
+    return lines
+
+
+def pdf_string(text) -> str:
+    """PDF literal string in WinAnsi; characters outside it become "?" (see unprintable)"""
+    raw = str(text).encode("cp1252", errors="replace").decode("latin-1")
+    return "(" + raw.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def unprintable(text) -> int:
+    """How many characters of `text` pdf_string has to replace with "?" """
+    text = str(text)
+    try:
+        text.encode("cp1252")
+        return 0
+    except UnicodeEncodeError:
+        return sum(1 for c in text if c.encode("cp1252", errors="replace") == b"?" and c != "?")
+
+
+def _text(x: float, y: float, text, size: float, bold: bool = False) -> str:
+    return f"BT /{'F2' if bold else 'F1'} {size:g} Tf {x:.2f} {y:.2f} Td {pdf_string(text)} Tj ET\n"
+
+
+# =====================================================
+# PAGE LAYOUT
+# =====================================================
+@dataclass(frozen=True)
+class LabelLayout:
+    width: float
+    height: float
+    # Logo box in points (0 x 0 when there is no logo)
+    logo_width: float = 0.0
+    logo_height: float = 0.0
+    margin: float = 14.0
+
+
+# Row values page_content prints
+PRINTED_FIELDS = (
+    "pickup_location_name", "seller_courier_choice", "customer_name", "customer_address",
+    "customer_city", "customer_state", "customer_pincode", "order_number", "invoice_number",
+    "b2b_order_channel", "total_weight_gms", "purchase_order_expiry_date",
+)
+
+
+def _value(row: dict, key: str) -> str:
+    value = row.get(key, "")
+    return "" if value is None or str(value) == "nan" else str(value)
+
+
+def replaced_characters(row: dict) -> int:
+    """Characters on this order's label that the fonts cannot show"""
+    return sum(unprintable(_value(row, key)) for key in PRINTED_FIELDS)
+
+
+def box_count(row: dict) -> int:
+    try:
+        return max(1, int(float(row.get("number_of_boxes") or 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+@functools.lru_cache(maxsize=8)
+def _frame(layout: LabelLayout) -> str:
+    """Everything that is the same on every page (cached per process)"""
+    m, w, h = layout.margin, layout.width, layout.height
+    ops = ["0.8 w\n", f"{m:.2f} {m:.2f} {w - 2 * m:.2f} {h - 2 * m:.2f} re S\n"]
+    for y in (h - m - 40, h - m - 190, m + 96):
+        ops.append(f"{m:.2f} {y:.2f} m {w - m:.2f} {y:.2f} l S\n")
+    if layout.logo_width:
+        ops.append(
+            f"q {layout.logo_width:.2f} 0 0 {layout.logo_height:.2f} "
+            f"{m + 6:.2f} {h - m - 6 - layout.logo_height:.2f} cm /Logo Do Q\n"
+        )
+    ops.append(_text(m + 6, h - m - 54, "SHIP TO", 7, bold=True))
+    return "".join(ops)
+
+
+def page_content(row: dict, box: int, boxes: int, layout: LabelLayout) -> bytes:
+    """Compressed content stream of one label page"""
+    m, w, h = layout.margin, layout.width, layout.height
+    inner = w - 2 * m - 12
+    x = m + 6
+    ops = [_frame(layout)]
+
+    # Header: sender, right of the logo
+    sender_x = x + (layout.logo_width + 8 if layout.logo_width else 0)
+    for i, line in enumerate(wrap("FROM: " + _value(row, "pickup_location_name"), 7, w - m - 6 - sender_x, 2)):
+        ops.append(_text(sender_x, h - m - 16 - i * 9, line, 7))
+    ops.append(_text(sender_x, h - m - 34, _value(row, "seller_courier_choice"), 8, bold=True))
+
+    # Ship-to block
+    y = h - m - 68
+    for line in wrap(_value(row, "customer_name"), 11, inner, 2, bold=True):
+        ops.append(_text(x, y, line, 11, bold=True))
+        y -= 13
+    for line in wrap(_value(row, "customer_address"), 9, inner, 5):
+        ops.append(_text(x, y, line, 9))
+        y -= 11
+    city = ", ".join(v for v in (_value(row, "customer_city"), _value(row, "customer_state")) if v)
+    ops.append(_text(x, y, city, 9, bold=True))
+    ops.append(_text(x, h - m - 184, _value(row, "customer_pincode"), 26, bold=True))
+
+    # Order block
+    y = h - m - 206
+    for name, key in (
+        ("PO", "order_number"),
+        ("Invoice", "invoice_number"),
+        ("Channel", "b2b_order_channel"),
+        ("Weight (g)", "total_weight_gms"),
+        ("PO expiry", "purchase_order_expiry_date"),
+    ):
+        ops.append(_text(x, y, name, 8))
+        ops.append(_text(x + 58, y, _value(row, key), 9, bold=True))
+        y -= 13
+    box_text = f"{box}/{boxes}"
+    ops.append(_text(w - m - 6 - text_width(box_text, 24, bold=True), h - m - 226, box_text, 24, bold=True))
+    ops.append(_text(w - m - 6 - text_width("BOX", 8, bold=True), h - m - 204, "BOX", 8, bold=True))
+
+    # Barcode of the PO, centred in the bottom block
+    po = _value(row, "order_number")
+    widths = code128_widths(po)
+    modules = sum(int(c) for c in widths) + 2 * QUIET_MODULES
+    module = min(1.6, (w - 2 * m) / modules)
+    bar_x = (w - (modules - 2 * QUIET_MODULES) * module) / 2
+    bar_y, bar_h = m + 24, 60
+    for i, width in enumerate(widths):
+        span = int(width) * module
+        if i % 2 == 0:
+            ops.append(f"{bar_x:.3f} {bar_y:.2f} {span:.3f} {bar_h:.2f} re\n")
+        bar_x += span
+    ops.append("f\n")
+    ops.append(_text((w - text_width(po, 10)) / 2, m + 10, po, 10))
+    return zlib.compress("".join(ops).encode("latin-1"), 6)
+
+
+def _pages(rows: Iterable[dict]) -> Iterator[Tuple[dict, int, int]]:
+    for row in rows:
+        boxes = box_count(row)
+        for box in range(1, boxes + 1):
+            yield row, box, boxes
+
+
+def _render_chunk(chunk: List[Tuple[dict, int, int]], layout: LabelLayout) -> List[bytes]:
+    return [page_content(row, box, boxes, layout) for row, box, boxes in chunk]
+
+
+def _chunks(pages: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# =====================================================
+# PDF FILE
+# =====================================================
+def jpeg_info(data: bytes) -> Tuple[int, int, str]:
+    """(width, height, colour space) from the JPEG frame header"""
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            break
+        marker = data[i + 1]
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            space = {1: "DeviceGray", 3: "DeviceRGB", 4: "DeviceCMYK"}.get(data[i + 9], "DeviceRGB")
+            return width, height, space
+        i += 2 + length
+    raise ValueError("Not a JPEG file (no frame header)")
+
+
+class PDFStream:
+    """Minimal PDF writer that appends objects to the file as they come"""
+
+    CATALOG, PAGES, FONT, FONT_BOLD, LOGO = 1, 2, 3, 4, 5
+
+    def __init__(self, path: Path, layout: LabelLayout, logo: Optional[bytes] = None):
+        self.layout = layout
+        self.file = open(path, "wb")
+        self.offsets = {}
+        self.kids = []
+        self.next_id = 6
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode())
+        for number, font in ((self.FONT, "Helvetica"), (self.FONT_BOLD, "Helvetica-Bold")):
+            self._object(number, (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>"
+            ).encode())
+        resources = f"/Font << /F1 {self.FONT} 0 R /F2 {self.FONT_BOLD} 0 R >>"
+        if logo is not None:
+            width, height, space = jpeg_info(logo)
+            self._object(self.LOGO, (
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /{space} /BitsPerComponent 8 /Filter /DCTDecode /Length {len(logo)} >>\n"
+                "stream\n"
+            ).encode() + logo + b"\nendstream")
+            resources += f" /XObject << /Logo {self.LOGO} 0 R >>"
+        self.resources = f"<< {resources} >>"
+
+    def _object(self, number: int, body: bytes):
+        self.offsets[number] = self.file.tell()
+        self.file.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def add_page(self, content: bytes):
+        stream_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(stream_id, (
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n"
+        ).encode() + content + b"\nendstream")
+        self._object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES} 0 R "
+            f"/MediaBox [0 0 {self.layout.width:.2f} {self.layout.height:.2f}] "
+            f"/Resources {self.resources} /Contents {stream_id} 0 R >>"
+        ).encode())
+        self.kids.append(page_id)
+
+    def close(self) -> int:
+        kids = " ".join(f"{kid} 0 R" for kid in self.kids)
+        self._object(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.kids)} >>".encode())
+        size = max(self.offsets) + 1
+        xref = self.file.tell()
+        entries = ["0000000000 65535 f \n"]
+        for number in range(1, size):
+            offset = self.offsets.get(number)
+            entries.append(f"{offset:010d} 00000 n \n" if offset is not None else "0000000000 65535 f \n")
+        self.file.write(f"xref\n0 {size}\n{''.join(entries)}".encode())
+        self.file.write(f"trailer\n<< /Size {size} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        self.file.close()
+        return len(self.kids)
+
+    def abort(self):
+        self.file.close()
+
+
+# =====================================================
+# RENDERER
+# =====================================================
+class LabelRenderer:
+    def __init__(self, workers: int = None, chunk_pages: int = None, min_pages: int = None,
+                 page_size_mm: Tuple[float, float] = None, logo: Path = None):
+        settings = get_setting("labels", {}) or {}
+        self.workers = workers or settings.get("workers") or os.cpu_count() or 1
+        self.chunk_pages = chunk_pages or settings.get("chunk_pages", DEFAULT_CHUNK_PAGES)
+        self.min_pages = min_pages if min_pages is not None else settings.get("min_pages", DEFAULT_MIN_PAGES)
+        width_mm, height_mm = page_size_mm or settings.get("page_size_mm") or DEFAULT_PAGE_MM
+        logo = logo or settings.get("logo") or None
+        self.logo = self._read_logo(Path(logo)) if logo else None
+
+        logo_width = logo_height = 0.0
+        if self.logo is not None:
+            pixels_w, pixels_h, _ = jpeg_info(self.logo)
+            logo_height = 26.0
+            logo_width = min(90.0, logo_height * pixels_w / pixels_h)
+        self.layout = LabelLayout(width_mm * MM, height_mm * MM, logo_width, logo_height)
+        # PO -> characters printed as "?" on its labels, for the last render()
+        self.replacements = {}
+
+    @staticmethod
+    def _read_logo(path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+            jpeg_info(data)
+            return data
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Label logo skipped ({path}): {e}")
+            return None
+
+    def render(self, rows: Iterable, output_path: Path) -> int:
+        """
+        Write one page per box to `output_path`. `rows` are built GoSwift
+        rows: dicts, or tuples in GOSWIFT_COLUMNS order. Returns the page count.
+        """
+        rows = [row if isinstance(row, dict) else dict(zip(GOSWIFT_COLUMNS, row)) for row in rows]
+        total = sum(box_count(row) for row in rows)
+        self.replacements = {
+            _value(row, "order_number"): n for row in rows for n in [replaced_characters(row)] if n
+        }
+        pdf = PDFStream(output_path, self.layout, self.logo)
+        try:
+            if self.workers <= 1 or total < self.min_pages:
+                for row, box, boxes in _pages(rows):
+                    pdf.add_page(page_content(row, box, boxes, self.layout))
+            else:
+                for contents in self._render_parallel(rows):
+                    for content in contents:
+                        pdf.add_page(content)
+        except BaseException:
+            pdf.abort()
+            Path(output_path).unlink(missing_ok=True)
+            raise
+        pages = pdf.close()
+        print(f"✅ Labels: {pages} pages for {len(rows)} orders -> {Path(output_path).name}")
+        if self.replacements:
+            listed = ", ".join(f"{po} ({n})" for po, n in list(self.replacements.items())[:10])
+            print(
+                f"⚠️ Labels: {len(self.replacements)} orders have characters the label font cannot "
+                f"print, shown as '?': {listed}"
+            )
+        return pages
+
+    def _render_parallel(self, rows: List[dict]) -> Iterator[List[bytes]]:
+        """Chunks of page streams in order, with at most 2 chunks per worker in flight"""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            pending = deque()
+            for chunk in _chunks(_pages(rows), self.chunk_pages):
+                pending.append(pool.submit(_render_chunk, chunk, self.layout))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.exporters.export_jobs import DONE, FAILED, QUEUED, RUNNING, ExportJobQueue
+from src.exporters.export_ledger import ExportLedger
+from src.engine.goswift_engine_builder import GOSWIFT_COLUMNS
+
+
+class Builder:
+    """Stand-in GoSwiftBuilder: one row per PO, optionally held until released"""
+
+    def __init__(self, hold: threading.Event = None, error: Exception = None):
+        self.hold = hold
+        self.error = error
+        self.started = threading.Event()
+
+    def build_records(self, order_numbers):
+        self.started.set()
+        if self.hold is not None:
+            assert self.hold.wait(10)
+        if self.error is not None:
+            raise self.error
+        return [tuple([po] + [""] * (len(GOSWIFT_COLUMNS) - 1)) for po in order_numbers], []
+
+
+@pytest.fixture
+def updates():
+    return []
+
+
+@pytest.fixture
+def queue(tmp_path, updates):
+    queue = ExportJobQueue(
+        tmp_path / "out",
+        ledger=ExportLedger(tmp_path / "ledger.sqlite3"),
+        on_update=lambda job: updates.append((job.id, job.status)),
+    )
+    yield queue
+    queue.shutdown()
+
+
+def wait(job, timeout=10):
+    for _ in range(timeout * 100):
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job #{job.id} still {job.status}")
+
+
+def test_status_transitions(queue, updates):
+    job = wait(queue.submit(["PO1", "po2"], Builder()))
+    assert job.status == DONE and job.output_path.exists()
+    assert job.order_numbers == ["PO1", "PO2"]
+    assert [status for job_id, status in updates if job_id == job.id] == [QUEUED, RUNNING, DONE]
+
+
+def test_overlapping_submits_share_no_po(queue):
+    hold = threading.Event()
+    first_builder = Builder(hold)
+    first = queue.submit(["PO1", "PO2"], first_builder)
+    assert first_builder.started.wait(10)
+
+    second = wait(queue.submit(["PO2", "PO3"], Builder()))
+    assert second.order_numbers == ["PO3"] and second.claimed_elsewhere == ["PO2"]
+
+    # Everything the second job wanted is held or done: it fails without running
+    third = queue.submit(["PO1", "PO3"], Builder())
+    assert third.status == FAILED and third.claimed_elsewhere == ["PO1"] and third.skipped_orders == ["PO3"]
+
+    hold.set()
+    assert wait(first).status == DONE
+    assert queue.submit(["PO1", "PO2"], Builder()).skipped_orders == ["PO1", "PO2"]
+
+
+def test_failure_releases_claims(queue, updates):
+    job = wait(queue.submit(["PO1", "PO2"], Builder(error=RuntimeError("boom"))))
+    assert job.status == FAILED and job.error == "boom"
+    assert [status for job_id, status in updates if job_id == job.id] == [QUEUED, RUNNING, FAILED]
+
+    retry = wait(queue.submit(["PO1", "PO2"], Builder()))
+    assert retry.status == DONE and retry.order_numbers == ["PO1", "PO2"]
+
+
+def test_force_reexports(queue):
+    wait(queue.submit(["PO1"], Builder()))
+    job = wait(queue.submit(["PO1"], Builder(), force=True))
+    assert job.status == DONE and job.order_numbers == ["PO1"] and not job.skipped_orders
+    assert len(queue.ledger.lookup("PO1")) == 2
+    assert queue.active_count() == 0
+
+
+def test_heartbeat_keeps_queued_claims(queue):
+    hold = threading.Event()
+    running = queue.submit(["PO1"], Builder(hold))
+    queued = [queue.submit([f"PO{i}"], Builder()) for i in (2, 3)]
+    with sqlite3.connect(queue.ledger.db_path) as conn:
+        conn.execute("UPDATE exported_orders SET claimed_at = '2000-01-01 00:00:00'")
+    queue.renew_claims()
+    assert queue.ledger.claim(["PO1", "PO2", "PO3"]).busy == ["PO1", "PO2", "PO3"]
+
+    hold.set()
+    assert [wait(job).status for job in [running, *queued]] == [DONE, DONE, DONE]
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.exporters import export_ledger
+from src.exporters.export_ledger import ExportLedger
+from src.exporters.goswift_csv_exporter import GoSwiftExporter
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return ExportLedger(tmp_path / "ledger.sqlite3")
+
+
+def test_claim_record_skip(ledger, tmp_path):
+    claim = ledger.claim(["PO1", "PO2", "PO1"])
+    assert claim.claimed == ["PO1", "PO2"]
+    ledger.record(claim, ["PO1"], tmp_path / "a.csv", generation=3)
+
+    # PO2 failed to build, so its claim was released with the record
+    again = ledger.claim(["PO1", "PO2"])
+    assert again.claimed == ["PO2"] and again.skipped == ["PO1"] and again.busy == []
+    assert ledger.already_exported(["PO1", "PO2"]) == {"PO1"}
+    assert ledger.lookup("PO1")[0]["generation"] == 3
+
+
+def test_running_claim_is_busy_even_when_forced(ledger):
+    first = ledger.claim(["PO1", "PO2"])
+    second = ledger.claim(["PO2", "PO3"], force=True)
+    assert second.claimed == ["PO3"] and second.busy == ["PO2"]
+
+    ledger.release(first)
+    assert ledger.claim(["PO1", "PO2"]).claimed == ["PO1", "PO2"]
+
+
+def test_forced_reexport_keeps_history(ledger, tmp_path):
+    ledger.record(ledger.claim(["PO1"]), ["PO1"], tmp_path / "a.csv")
+    forced = ledger.claim(["PO1"], force=True)
+    assert forced.claimed == ["PO1"]
+
+    # A failed forced export leaves the earlier export in place
+    ledger.release(forced)
+    assert [e["file_path"] for e in ledger.lookup("PO1")] == [str(tmp_path / "a.csv")]
+
+    ledger.record(ledger.claim(["PO1"], force=True), ["PO1"], tmp_path / "b.csv")
+    assert [e["file_path"] for e in ledger.lookup("PO1")] == [str(tmp_path / "b.csv"), str(tmp_path / "a.csv")]
+
+
+def test_concurrent_claims_never_share_a_po(tmp_path):
+    orders = [f"PO{i}" for i in range(200)]
+    barrier = threading.Barrier(8)
+    claims = []
+
+    def worker(n):
+        ledger = ExportLedger(tmp_path / "ledger.sqlite3")
+        barrier.wait()
+        # Overlapping, shuffled windows of the same POs
+        claims.append(ledger.claim(orders[n * 10:] + orders[:n * 10], force=n % 2 == 0))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    owned = [po for claim in claims for po in claim.claimed]
+    assert sorted(owned) == sorted(orders)
+    for claim in claims:
+        assert set(claim.claimed) | set(claim.busy) == set(orders)
+
+
+def test_stale_claims_are_taken_over(ledger, monkeypatch):
+    ledger.claim(["PO1"])
+    monkeypatch.setattr(export_ledger, "STALE_CLAIM", export_ledger.timedelta(seconds=-1))
+    assert ledger.claim(["PO1"]).claimed == ["PO1"]
+
+
+def age_claims(ledger):
+    with sqlite3.connect(ledger.db_path) as conn:
+        conn.execute("UPDATE exported_orders SET claimed_at = '2000-01-01 00:00:00' WHERE claim IS NOT NULL")
+
+
+def test_renew_keeps_a_waiting_claim(ledger):
+    waiting = ledger.claim(["PO1", "PO2"])
+    age_claims(ledger)
+    assert ledger.renew(waiting) == ["PO1", "PO2"]
+    assert ledger.claim(["PO1"]).busy == ["PO1"]
+
+    # Not renewed in time: taken over, and the waiting export learns it holds nothing
+    age_claims(ledger)
+    assert ledger.claim(["PO1"]).claimed == ["PO1"]
+    assert ledger.renew(waiting) == []
+
+
+def test_migrates_old_ledger(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE exported_orders (
+                order_number TEXT NOT NULL, file_path TEXT NOT NULL,
+                exported_at TEXT NOT NULL, generation INTEGER
+            );
+            CREATE INDEX idx_exported_orders_po ON exported_orders (order_number);
+        """)
+        conn.executemany("INSERT INTO exported_orders VALUES (?, ?, ?, ?)", [
+            ("PO1", "a.csv", "2026-01-01 10:00:00", 1),
+            ("PO1", "b.csv", "2026-01-02 10:00:00", 2),
+            ("PO2", "b.csv", "2026-01-02 10:00:00", 2),
+        ])
+
+    ledger = ExportLedger(path)
+    assert [e["file_path"] for e in ledger.lookup("PO1")] == ["b.csv", "a.csv"]
+    claim = ledger.claim(["PO1", "PO2", "PO3"])
+    assert claim.skipped == ["PO1", "PO2"] and claim.claimed == ["PO3"]
+
+
+class FailingWriter:
+    extension = ".csv"
+    label = "CSV"
+
+    def write(self, df, file_path):
+        raise OSError("disk full")
+
+
+class Builder:
+    def build_records(self, order_numbers):
+        return [tuple([po] + [""] * 34) for po in order_numbers if po != "BAD"], [("BAD", KeyError("BAD"))]
+
+
+def test_exporter_releases_claims_on_failure(ledger, tmp_path):
+    exporter = GoSwiftExporter(Builder(), tmp_path / "out", writer=FailingWriter(), ledger=ledger)
+    with pytest.raises(OSError):
+        exporter.export(["PO1", "PO2"])
+    assert ledger.claim(["PO1", "PO2"]).claimed == ["PO1", "PO2"]
+
+
+def test_exporter_skips_pos_its_claim_lost(ledger, tmp_path):
+    claim = ledger.claim(["PO1", "PO2"])
+    with sqlite3.connect(ledger.db_path) as conn:
+        conn.execute("UPDATE exported_orders SET claim = 'other' WHERE order_number = 'PO1'")
+    exporter = GoSwiftExporter(Builder(), tmp_path / "out", ledger=ledger)
+    exporter.export(["PO1", "PO2"], claim=claim)
+    assert exporter.busy_orders == ["PO1"]
+    assert ledger.already_exported(["PO1", "PO2"]) == {"PO2"}
+
+
+def test_exporter_records_built_pos_only(ledger, tmp_path):
+    exporter = GoSwiftExporter(Builder(), tmp_path / "out", ledger=ledger)
+    exporter.export(["po1", "BAD"])
+    assert exporter.failed_orders == ["BAD"]
+    assert ledger.already_exported(["PO1", "BAD"]) == {"PO1"}
+
+    with pytest.raises(RuntimeError, match="already exported"):
+        exporter.export(["PO1"])
+    assert exporter.skipped_orders == ["PO1"]
@@ -0,0 +1,97 @@
+# Label PDF structure, barcode encoding and parallel == in-process output.
+#
+#   python -m pytest src/exporters/test_label_pdf.py
+
+import re
+import zlib
+
+from src.exporters.label_pdf import (
+    CODE128, STOP, LabelRenderer, code128_symbols, code128_widths, jpeg_info, unprintable,
+)
+from src.models.goswift_schema import GOSWIFT_COLUMNS
+
+
+def rows(n):
+    return [
+        {
+            "order_number": f"FBSWN{i:08d}",
+            "customer_name": "Acme Retail (Bengaluru) Pvt. Ltd.",
+            "customer_address": "Plot 12, Survey No. 45/2, Peenya Industrial Area, 2nd Stage, Near Metro Pillar 210 " * (i % 3 + 1),
+            "customer_city": "Bengaluru",
+            "customer_state": "Karnataka",
+            "customer_pincode": "560058",
+            "invoice_number": f"INV{i}",
+            "total_weight_gms": 1200,
+            "number_of_boxes": i % 4 + 1,
+            "seller_courier_choice": "Delhivery",
+            "b2b_order_channel": "AMZ",
+            "pickup_location_name": "RENEE Cosmetics Pvt. Ltd. B2B",
+            "purchase_order_expiry_date": "31-01-2026",
+        }
+        for i in range(n)
+    ]
+
+
+def check_pdf(data: bytes, pages: int):
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    entries = data[xref:].split(b"trailer")[0].split(b"\n")[2:-1]
+    for number, entry in enumerate(entries):
+        offset, _, kind = entry.split()
+        if kind == b"n":
+            assert data[int(offset):].startswith(f"{number} 0 obj".encode())
+    assert re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", data).group(1) == str(pages).encode()
+    assert data.count(b"/Type /Page ") == pages
+
+
+def test_code128():
+    assert len(set(CODE128)) == 106 and all(sum(map(int, p)) == 11 for p in CODE128)
+    # Start B, "A" (33), checksum (104 + 33) % 103
+    assert code128_symbols("A") == [104, 33, 34]
+    assert code128_widths("A") == CODE128[104] + CODE128[33] + CODE128[34] + STOP
+
+
+def test_one_page_per_box(tmp_path):
+    path = tmp_path / "labels.pdf"
+    batch = rows(10)
+    batch[0]["number_of_boxes"] = ""
+    pages = LabelRenderer(workers=1).render(batch, path)
+    assert pages == 1 + sum(i % 4 + 1 for i in range(1, 10))
+    data = path.read_bytes()
+    check_pdf(data, pages)
+    first = zlib.decompress(re.search(rb"stream\n(.*?)\nendstream", data, re.S).group(1))
+    assert b"(FBSWN00000000) Tj" in first and b"(560058) Tj" in first and b"(1/1) Tj" in first
+
+
+def test_tuples_and_parallel_output_are_identical(tmp_path):
+    batch = rows(60)
+    serial, parallel = tmp_path / "serial.pdf", tmp_path / "parallel.pdf"
+    LabelRenderer(workers=1).render(batch, serial)
+    as_tuples = [tuple(row.get(col, "") for col in GOSWIFT_COLUMNS) for row in batch]
+    pages = LabelRenderer(workers=2, chunk_pages=7, min_pages=0).render(as_tuples, parallel)
+    assert serial.read_bytes() == parallel.read_bytes()
+    check_pdf(parallel.read_bytes(), pages)
+
+
+def test_logo_is_written_once(tmp_path):
+    # Smallest possible frame header is enough for the renderer: SOI, SOF0 (8 bit, 40 x 20, 3 components)
+    logo = bytes.fromhex("FFD8FFC0000B08001400280301220011") + b"\xff\xd9"
+    assert jpeg_info(logo) == (40, 20, "DeviceRGB")
+    (tmp_path / "logo.jpg").write_bytes(logo)
+    path = tmp_path / "labels.pdf"
+    LabelRenderer(workers=1, logo=tmp_path / "logo.jpg").render(rows(3), path)
+    data = path.read_bytes()
+    assert data.count(b"/Subtype /Image") == 1
+    assert data.count(b"/XObject << /Logo 5 0 R >>") == 6
+
+
+def test_unprintable_characters_are_counted(tmp_path, capsys):
+    data = rows(3)
+    data[1]["customer_address"] = "प्लॉट 12, Peenya"
+    data[2]["customer_city"] = "Bengaluru ₹ é ?"
+    renderer = LabelRenderer(workers=1)
+    renderer.render(data, tmp_path / "labels.pdf")
+
+    # Devanagari is outside WinAnsi; ₹ too. é and a literal "?" print fine
+    assert renderer.replacements == {data[1]["order_number"]: 5, data[2]["order_number"]: 1}
+    assert "2 orders have characters the label font cannot print" in capsys.readouterr().out
+    assert unprintable("plain text") == 0
@@ -0,0 +1,68 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from src.engine.goswift_engine_builder import GOSWIFT_COLUMNS
+from src.exporters.writers import WRITERS, BaseWriter, PandasCSVWriter
+
+
+def goswift_frame() -> pd.DataFrame:
+    text = ["PO1", "Plot 9, Shamshabad", 'He said "ship"', "line\nbreak", "", "हिन्दी", "321456789012.0"]
+    n = len(text)
+    df = pd.DataFrame({col: [f"{col}-{i}" for i in range(n)] for col in GOSWIFT_COLUMNS})
+    df["customer_address"] = text
+    df["customer_email"] = [""] * n
+    df["total_weight_gms"] = list(range(0, 1000 * n, 1000))
+    df["number_of_boxes"] = [1, 2, 3, 5, 2, 1, 9]
+    return df
+
+
+def read_back(path) -> pd.DataFrame:
+    if path.suffix == ".csv":
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_excel(path, dtype=str).fillna("")
+
+
+def available_writers():
+    writers = []
+    for name, writer_cls in WRITERS.items():
+        try:
+            writers.append(pytest.param(writer_cls(), id=name))
+        except ImportError:
+            writers.append(pytest.param(None, id=name, marks=pytest.mark.skip(f"{name} unavailable")))
+    return writers
+
+
+@pytest.mark.parametrize("writer", available_writers())
+def test_every_writer_round_trips(tmp_path, writer):
+    df = goswift_frame()
+    path = writer.write(df.iloc[:, ::-1], tmp_path / f"out{writer.extension}")
+    back = read_back(path)
+    assert list(back.columns) == GOSWIFT_COLUMNS
+    pd.testing.assert_frame_equal(back, df.astype(str), check_dtype=False)
+
+
+def test_base_writer_is_abstract():
+    with pytest.raises(TypeError):
+        BaseWriter()
+
+
+def test_arrow_csv_same_cells_as_pandas(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = goswift_frame()
+    # Float / bool cells must keep the text to_csv gives them (2.0, True)
+    df["box_type"] = [2.0, 2.5, None, 1e16, 3.0, 0.1, 7.0]
+    df["is_rtv_shipment"] = [True, False, None, True, False, True, False]
+    df["ewaybill_number"] = [2.5, "2.5", "", None, 0, "x", True]
+
+    reference = PandasCSVWriter().write(df, tmp_path / "pandas.csv")
+    arrow = WRITERS["arrow_csv"]().write(df, tmp_path / "arrow.csv")
+
+    with open(reference, newline="", encoding="utf-8") as a, open(arrow, newline="", encoding="utf-8") as b:
+        assert list(csv.reader(a)) == list(csv.reader(b))
+    # Only the quoting differs: Arrow quotes every text cell, the header is written like to_csv
+    reference_lines = reference.read_text(encoding="utf-8").splitlines()
+    arrow_lines = arrow.read_text(encoding="utf-8").splitlines()
+    assert arrow_lines[0] == reference_lines[0]
+    assert arrow_lines[1].startswith('"order_number-0",') and reference_lines[1].startswith("order_number-0,")
@@ -0,0 +1,145 @@
+# =====================================================
+# OUTPUT WRITERS
+# =====================================================
+# The exporter builds the rows; a writer only turns the final
+# GoSwift DataFrame into a file. Every writer receives the frame
+# already in GOSWIFT_COLUMNS order and must keep that order.
+
+import csv
+import io
+from abc import ABC, abstractmethod
+
+import pandas as pd
+from pathlib import Path
+
+from src.engine.goswift_engine_builder import GOSWIFT_COLUMNS
+from src.utils.config import get_setting
+
+DEFAULT_FORMAT = "csv"
+
+
+class BaseWriter(ABC):
+    name = ""
+    extension = ""
+    label = ""
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame, file_path: Path) -> Path:
+        """Write `df` (GOSWIFT_COLUMNS order) to `file_path` and return the path"""
+
+    @staticmethod
+    def _ordered(df: pd.DataFrame) -> pd.DataFrame:
+        return df.reindex(columns=GOSWIFT_COLUMNS)
+
+
+class PandasCSVWriter(BaseWriter):
+    """Reference writer - DataFrame.to_csv"""
+    name = "csv"
+    extension = ".csv"
+    label = "CSV"
+
+    def write(self, df, file_path):
+        self._ordered(df).to_csv(file_path, index=False)
+        return file_path
+
+
+def _pandas_text(values: pd.Series) -> pd.Series:
+    """Cells as to_csv spells them (2.0, True), nulls kept"""
+    return values.map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+
+
+class ArrowCSVWriter(BaseWriter):
+    """
+    pyarrow's multi-threaded C++ CSV writer, for very large batches.
+    Same header and cell text as PandasCSVWriter, but Arrow has no minimal
+    quoting: every text cell is quoted ("" for blanks), numbers never are.
+    Any CSV reader parses both files to the same values.
+    """
+    name = "arrow_csv"
+    extension = ".csv"
+    label = "CSV"
+
+    def __init__(self):
+        import pyarrow  # noqa: F401 - fail early so get_writer can fall back
+
+    def write(self, df, file_path):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        df = self._ordered(df).reset_index(drop=True)
+        # Arrow would write 2.0 as 2 and True as true; integer and text columns go as they are
+        for col in df.columns:
+            if not (pd.api.types.is_integer_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+                df[col] = _pandas_text(df[col])
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # Header as to_csv writes it (Arrow would quote every name)
+        header = io.StringIO()
+        csv.writer(header, lineterminator="\n").writerow(df.columns)
+        with open(file_path, "wb") as f:
+            f.write(header.getvalue().encode("utf-8"))
+            pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False))
+        return file_path
+
+
+class XlsxFileWriter(BaseWriter):
+    """
+    Streaming XLSX: xlsxwriter in constant_memory mode when installed,
+    otherwise an openpyxl write-only workbook. Rows go straight to disk.
+    """
+    name = "xlsx"
+    extension = ".xlsx"
+    label = "Excel file"
+
+    def write(self, df, file_path):
+        df = self._ordered(df)
+        # Empty cells are left out instead of written as empty strings
+        rows = (
+            [None if v == "" or pd.isna(v) else v for v in row]
+            for row in df.itertuples(index=False, name=None)
+        )
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+
+        if xlsxwriter is not None:
+            wb = xlsxwriter.Workbook(str(file_path), {"constant_memory": True})
+            ws = wb.add_worksheet("GoSwift")
+            ws.write_row(0, 0, list(df.columns))
+            for r, row in enumerate(rows, start=1):
+                ws.write_row(r, 0, row)
+            wb.close()
+            return file_path
+
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("GoSwift")
+        ws.append(list(df.columns))
+        for row in rows:
+            ws.append(row)
+        wb.save(file_path)
+        return file_path
+
+
+WRITERS = {
+    PandasCSVWriter.name: PandasCSVWriter,
+    ArrowCSVWriter.name: ArrowCSVWriter,
+    XlsxFileWriter.name: XlsxFileWriter,
+}
+
+
+def get_writer(name: str = None) -> BaseWriter:
+    """
+    Writer for `name`, or for "output_format" in config.json.
+    Falls back to the pandas CSV writer if an optional dependency is missing.
+    """
+    name = name or get_setting("output_format", DEFAULT_FORMAT)
+    if name not in WRITERS:
+        raise ValueError(f"Unknown output format '{name}'. Choose from: {', '.join(WRITERS)}")
+    try:
+        return WRITERS[name]()
+    except ImportError as e:
+        print(f"⚠️  Output format '{name}' unavailable ({e}) - using '{DEFAULT_FORMAT}'")
+        return WRITERS[DEFAULT_FORMAT]()
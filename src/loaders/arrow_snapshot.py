@@ -0,0 +1,237 @@
+# =====================================================
+# ARROW SNAPSHOT (shared across processes)
+# =====================================================
+# One process parses the Excel workbooks and publishes the
+# cleaned tables as Arrow IPC (Feather v2) files. Every other
+# process on the machine memory-maps the same files instead of
+# running pd.read_excel again. Numeric, date and text columns are
+# read straight from the mapped pages (one physical copy in the OS
+# page cache for all processes): text stays Arrow-backed as pandas'
+# pyarrow "str" dtype. Only the cells of mixed columns become Python
+# objects in each process.
+#
+# A snapshot records the path, size and mtime of the workbook it was
+# built from, so a workbook replaced with its timestamp preserved
+# (cp -p, rsync, zip extract) is not mistaken for the old one.
+
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.loaders.base_loader import PROJECT_ROOT
+
+SNAPSHOT_DIR = PROJECT_ROOT / "data" / "snapshots"
+
+# Schema metadata: mixed column -> kinds of cells it holds (see split_mixed)
+MIXED_KEY = b"goswift.mixed"
+# Schema metadata: {"path", "size", "mtime_ns"} of the source workbook
+SOURCE_KEY = b"goswift.source"
+# Kinds kept in side columns "<col>__<kind>"; text stays in the column itself
+SIDE_KINDS = ("bool", "int", "float", "datetime")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for shared snapshots. Install it with: pip install pyarrow"
+        ) from e
+    return pa, ipc
+
+
+def snapshot_path(snapshot_dir: Path, name: str) -> Path:
+    return Path(snapshot_dir) / f"{name}.arrow"
+
+
+def source_stamp(source_file: Path) -> dict:
+    """What identifies a version of the source workbook: path, size and mtime"""
+    source_file = Path(source_file)
+    stat = source_file.stat()
+    return {"path": str(source_file.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_fresh(snapshot_file: Path, source_file: Path) -> bool:
+    """Snapshot is usable when it exists and was published from this very source file"""
+    if not snapshot_file.exists():
+        return False
+    if not source_file.exists():
+        return True
+    pa, ipc = _require_pyarrow()
+    try:
+        with pa.memory_map(str(snapshot_file), "r") as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    stamp = metadata.get(SOURCE_KEY)
+    return stamp is not None and json.loads(stamp) == source_stamp(source_file)
+
+
+# =====================================================
+# MIXED COLUMNS
+# =====================================================
+def _kind(value) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, (datetime, date)):
+        return "datetime"
+    return "str"
+
+
+def split_mixed(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """
+    Arrow needs one type per column, but the export depends on each cell's own
+    type (int(2.5) is 2 boxes, int("2.5") fails). A column that mixes kinds keeps
+    its text cells and moves every other kind to a typed side column
+    "<col>__<kind>". Returns the frame and {column: side kinds}.
+    """
+    df = df.reset_index(drop=True)
+    mixed = {}
+    for col in list(df.columns):
+        if df[col].dtype != object:
+            continue
+        kinds = df[col].map(lambda v: None if pd.isna(v) else _kind(v))
+        present = set(kinds.dropna())
+        if len(present) < 2:
+            continue
+        sides = [kind for kind in SIDE_KINDS if kind in present]
+        for kind in sides:
+            cells = df[col].where(kinds == kind)
+            if kind == "datetime":
+                cells = pd.to_datetime(cells)
+            elif kind == "int":
+                cells = cells.astype("Int64")
+            elif kind == "bool":
+                cells = cells.astype("boolean")
+            else:
+                cells = cells.astype(float)
+            df[f"{col}__{kind}"] = cells
+        df[col] = df[col].where(kinds == "str").map(lambda v: v if pd.isna(v) else str(v))
+        mixed[col] = sides
+    return df, mixed
+
+
+def join_mixed(table, df: pd.DataFrame, mixed: Dict[str, List[str]]) -> pd.DataFrame:
+    """Put the side columns of split_mixed back into one object column per mixed column"""
+    for col, sides in mixed.items():
+        cells = df[col].astype(object).to_numpy(copy=True)
+        for kind in sides:
+            name = f"{col}__{kind}"
+            if kind == "datetime":
+                values = df[name].astype(object).to_numpy()
+            else:
+                # to_pylist keeps Python ints (pandas would turn an int column with nulls into floats)
+                values = np.array(table.column(name).to_pylist(), dtype=object)
+            taken = ~pd.isna(values)
+            cells[taken] = values[taken]
+            del df[name]
+        df[col] = pd.Series(cells, index=df.index, dtype=object)
+    return df
+
+
+# =====================================================
+# PUBLISH / ATTACH
+# =====================================================
+def publish(df: pd.DataFrame, snapshot_file: Path, source_file: Path = None) -> Path:
+    """
+    Write the cleaned DataFrame as an uncompressed Arrow IPC file, stamped with
+    the `source_file` it was built from (see is_fresh).
+    Written to a temp file first and renamed, so readers never see half a file.
+    """
+    pa, ipc = _require_pyarrow()
+    snapshot_file = Path(snapshot_file)
+    snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+
+    frame, mixed = split_mixed(df)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), MIXED_KEY: json.dumps(mixed)}
+    if source_file is not None and Path(source_file).exists():
+        metadata[SOURCE_KEY] = json.dumps(source_stamp(source_file))
+    table = table.replace_schema_metadata(metadata)
+    tmp_file = snapshot_file.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_file), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_file, snapshot_file)
+    print(f"✅ Published snapshot {snapshot_file.name} ({len(df)} rows)")
+    return snapshot_file
+
+
+def attach(snapshot_file: Path, index_col: str) -> pd.DataFrame:
+    """
+    Memory-map a published snapshot. Numeric, date and text columns are backed
+    by the mapped pages directly; only mixed columns are copied into Python objects.
+    """
+    pa, ipc = _require_pyarrow()
+    source = pa.memory_map(str(snapshot_file), "r")
+    table = ipc.open_file(source).read_all()
+    mixed = json.loads((table.schema.metadata or {}).get(MIXED_KEY, b"{}"))
+    # Arrow-backed "str" (NaN for missing, like the Excel path) keeps the mapped text buffers
+    text = pd.StringDtype("pyarrow", na_value=np.nan)
+    df = table.to_pandas(split_blocks=True, types_mapper={pa.string(): text, pa.large_string(): text}.get)
+    df = join_mixed(table, df, mixed)
+    return df.set_index(index_col, drop=False)
+
+
+class SharedSnapshotMixin:
+    """
+    publish_snapshot / attach_snapshot / load_shared for a loader. The loader sets
+    SNAPSHOT_NAME (file name), SNAPSHOT_INDEX (index column), SNAPSHOT_FRAME (the
+    attribute holding its cleaned frame) and SNAPSHOT_LABEL (for messages), and
+    rebuilds its lookups in _after_attach().
+    """
+
+    SNAPSHOT_NAME: str
+    SNAPSHOT_INDEX: str
+    SNAPSHOT_FRAME: str
+    SNAPSHOT_LABEL: str
+
+    def _after_attach(self):
+        pass
+
+    def publish_snapshot(self, snapshot_dir: Path = SNAPSHOT_DIR) -> Path:
+        """Publish the cleaned table as an Arrow file other processes can attach to"""
+        if not self.is_loaded:
+            raise RuntimeError(f"Nothing to publish - {self.SNAPSHOT_LABEL} not loaded")
+        return publish(
+            getattr(self, self.SNAPSHOT_FRAME), snapshot_path(snapshot_dir, self.SNAPSHOT_NAME), self.file_path,
+        )
+
+    def attach_snapshot(self, snapshot_dir: Path = SNAPSHOT_DIR) -> pd.DataFrame:
+        """Memory-map a published snapshot instead of parsing the Excel file"""
+        df = attach(snapshot_path(snapshot_dir, self.SNAPSHOT_NAME), index_col=self.SNAPSHOT_INDEX)
+        setattr(self, self.SNAPSHOT_FRAME, df)
+        self.is_loaded = True
+        self._after_attach()
+        print(f"✅ Attached {len(df)} {self.SNAPSHOT_LABEL} from snapshot")
+        return df
+
+    def load_shared(self, snapshot_dir: Path = SNAPSHOT_DIR) -> pd.DataFrame:
+        """
+        Attach to the shared snapshot when it is up to date with the Excel file,
+        otherwise parse the Excel file and publish a fresh snapshot.
+        """
+        snapshot_file = snapshot_path(snapshot_dir, self.SNAPSHOT_NAME)
+        if is_fresh(snapshot_file, self.file_path):
+            try:
+                return self.attach_snapshot(snapshot_dir)
+            except Exception as e:
+                print(f"⚠️  Could not attach snapshot {snapshot_file}: {e}")
+
+        df = self.load()
+        if self.is_loaded:
+            try:
+                self.publish_snapshot(snapshot_dir)
+            except Exception as e:
+                print(f"⚠️  Could not publish snapshot {snapshot_file}: {e}")
+        return df
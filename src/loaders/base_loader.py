@@ -1,7 +1,10 @@
 import pandas as pd
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+import importlib.util
 import warnings
+import zipfile
+from src.loaders.parallel_sheet import should_parse_in_parallel, try_read_sheet
 warnings.filterwarnings("ignore", message="Data Validation extension is not supported and will be removed")
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2] #what does this parents do and why [2]?
@@ -19,10 +22,134 @@ USE_COLS = [
 ]
 
 
+# =====================================================
+# EXCEL ENGINES
+# =====================================================
+# pandas engine -> (module that provides it, file types it reads).
+# AUTO_ENGINE_ORDER is fastest first: calamine (Rust) is several times
+# faster than openpyxl on big read-only sheets.
+EXCEL_ENGINES = {
+    "calamine": ("python_calamine", {".xlsx", ".xlsm", ".xlsb", ".xls", ".ods"}),
+    "openpyxl": ("openpyxl", {".xlsx", ".xlsm"}),
+    "pyxlsb": ("pyxlsb", {".xlsb"}),
+    "xlrd": ("xlrd", {".xls"}),
+}
+AUTO_ENGINE_ORDER = ["calamine", "openpyxl", "pyxlsb", "xlrd"]
+EXCEL_SUFFIXES = sorted(set().union(*(suffixes for _, suffixes in EXCEL_ENGINES.values())))
+
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ODS_MIMETYPE = b"application/vnd.oasis.opendocument.spreadsheet"
+
+
+def sniff_excel_suffix(file_path: Path):
+    """
+    File type from the content, for workbooks saved with the wrong extension
+    (ERP exports often name an .xlsx "report.xls"). None if not recognised.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(len(OLE2_MAGIC))
+        if head == OLE2_MAGIC:
+            return ".xls"
+        if not head.startswith(b"PK") or not zipfile.is_zipfile(file_path):
+            return None
+        with zipfile.ZipFile(file_path) as z:
+            names = set(z.namelist())
+            if "mimetype" in names and z.read("mimetype").startswith(ODS_MIMETYPE):
+                return ".ods"
+            if "xl/workbook.bin" in names:
+                return ".xlsb"
+            if "xl/workbook.xml" in names:
+                content_types = z.read("[Content_Types].xml") if "[Content_Types].xml" in names else b""
+                return ".xlsm" if b"macroEnabled" in content_types else ".xlsx"
+    except OSError:
+        pass
+    return None
+
+
+def excel_suffix(file_path: Path) -> str:
+    """Suffix that decides the engine: the sniffed file type, else the file name's"""
+    return sniff_excel_suffix(file_path) or Path(file_path).suffix.lower()
+
+
+def readable_suffixes() -> list:
+    """File types at least one installed engine can read"""
+    return [suffix for suffix in EXCEL_SUFFIXES if available_engines(suffix)]
+
+
+def available_engines(suffix: str) -> list:
+    """Installed engines that can read this file type, fastest first"""
+    suffix = suffix.lower()
+    return [
+        engine for engine in AUTO_ENGINE_ORDER
+        if suffix in EXCEL_ENGINES[engine][1]
+        and importlib.util.find_spec(EXCEL_ENGINES[engine][0]) is not None
+    ]
+
+
+def engine_chain(file_path: Path, engine: str = "auto") -> list:
+    """Engines to try in order: the requested one first (if usable), then the fastest others"""
+    chain = available_engines(excel_suffix(file_path))
+    if engine and engine != "auto":
+        if engine not in EXCEL_ENGINES:
+            raise ValueError(f"Unknown Excel engine '{engine}'. Choose from: auto, {', '.join(EXCEL_ENGINES)}")
+        if engine in chain:
+            chain.remove(engine)
+            chain.insert(0, engine)
+        else:
+            print(f"⚠️  Excel engine '{engine}' not available for {Path(file_path).name}, using {chain[:1]}")
+    if not chain:
+        raise ImportError(f"No installed Excel engine can read {excel_suffix(file_path)} files")
+    return chain
+
+
+def configured_engine() -> str:
+    from src.utils.config import get_setting
+    return get_setting("excel_engine", "auto")
+
+
+def harmonize_excel_values(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Engines disagree on how dates inside mixed (object) columns come back:
+    datetime, date or Timestamp. Make them all Timestamps so every engine
+    produces the same frame.
+    """
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("date", "datetime", "mixed"):
+            continue
+        df[col] = df[col].map(lambda v: pd.Timestamp(v) if isinstance(v, (date, datetime)) else v)
+    return df
+
+
+def read_excel(file_path: Path, sheet_name=0, engine: str = None, **kwargs) -> pd.DataFrame:
+    """pd.read_excel through the engine fallback chain, with harmonized values"""
+    chain = engine_chain(file_path, engine or configured_engine())
+    # Big .xlsx sheets are split across processes unless the caller forced an engine
+    if engine is None and not kwargs and should_parse_in_parallel(file_path, sheet_name, chain[0]):
+        df = try_read_sheet(file_path, sheet_name)
+        if df is not None:
+            return harmonize_excel_values(df)
+
+    errors = []
+    for name in chain:
+        try:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, engine=name, **kwargs)
+            return harmonize_excel_values(df)
+        except (ImportError, ValueError) as e:
+            # ValueError covers sheets that are missing as well as files the engine
+            # cannot parse; keep going and report every attempt if all fail
+            errors.append(f"{name}: {e}")
+    raise ValueError(f"Could not read {Path(file_path).name}. " + " | ".join(errors))
+
+
 class BaseLoader:
-    def __init__(self, file_path: Path, sheet_name: [str] = None):  #file_path: Path what does this mean?
+    def __init__(self, file_path: Path, sheet_name: [str] = None, engine: str = None):  #file_path: Path what does this mean?
         self.file_path = file_path
         self.sheet_name = sheet_name
+        # None -> "excel_engine" from config.json ("auto" picks the fastest installed)
+        self.engine = engine
 
         
     def load(self) -> pd.DataFrame:
@@ -30,19 +157,19 @@ class BaseLoader:
             raise FileNotFoundError(f"File not found at {self.file_path}")
 
         
-        if self.file_path.suffix.lower() in [".xlsx", ".xls"]:
+        if self.file_path.suffix.lower() in EXCEL_SUFFIXES:
             
             if self.sheet_name:
                 print(f"-> Loading sheet: {self.sheet_name}")
                 log_1 = datetime.now()
-                df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
+                df = read_excel(self.file_path, sheet_name=self.sheet_name, engine=self.engine)
                 log_2 = datetime.now()
                 print(f"-> Time taken to load sheet {self.sheet_name}: {log_2 - log_1}")
                 print(f"-> Loaded {len(df)} rows from {self.sheet_name}")
                 print("=" * 40 + "\n")
                 
             else:
-                df = pd.read_excel(self.file_path)
+                df = read_excel(self.file_path, engine=self.engine)
         elif self.file_path.suffix.lower() == ".csv":
             df = pd.read_csv(self.file_path)
         else:
@@ -0,0 +1,80 @@
+# =====================================================
+# PARALLEL SHEET BENCHMARK
+# =====================================================
+# Writes one big OnlineB2B sheet, reads it with openpyxl, calamine
+# and the parallel parser at 1..N workers, checks the parallel frames
+# equal read_excel's and prints the timings.
+#
+#   python -m src.loaders.bench_parallel_sheet 200000
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.loaders.base_loader import available_engines
+from src.loaders.parallel_sheet import read_sheet
+
+HEADER = ["Marketplaces", "PO", "Location", "Invoice Number", "Invoice Value",
+          "Weight", "Courier Name", "Box", "EWB", "Exp Date"]
+
+
+def write_workbook(path: Path, n: int):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("OnlineB2B")
+    ws.append(HEADER)
+    start = date(2026, 1, 1)
+    for i in range(n):
+        exp_date = WriteOnlyCell(ws, value=start + timedelta(days=i % 90))
+        exp_date.number_format = "yyyy-mm-dd"
+        ws.append([
+            ["Amazon", "Flipkart", "Myntra", "Nykaa"][i % 4],
+            f"FBSWN{i:08d}",
+            f"WH{i % 40:02d}",
+            f"INV{i}",
+            f"₹{(i * 37) % 250000:,}.00",
+            round((i % 400) * 0.1, 2),
+            ["Delhivery", "BlueDart"][i % 2],
+            i % 9 + 1,
+            321456789012 if i % 3 else None,
+            exp_date,
+        ])
+    wb.save(path)
+
+
+def timed(label: str, read):
+    start = time.perf_counter()
+    df = read()
+    elapsed = time.perf_counter() - start
+    print(f"{label:14s} {elapsed:7.2f} s")
+    return df, elapsed
+
+
+def run(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "master.xlsx"
+        write_workbook(path, n)
+        print(f"{n} rows, {path.stat().st_size / 1e6:.1f} MB on disk")
+
+        reference, base = timed("openpyxl", lambda: pd.read_excel(path, sheet_name="OnlineB2B", engine="openpyxl"))
+        if "calamine" in available_engines(".xlsx"):
+            timed("calamine", lambda: pd.read_excel(path, sheet_name="OnlineB2B", engine="calamine"))
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            df, elapsed = timed(f"{workers} workers", lambda: read_sheet(path, "OnlineB2B", workers=workers))
+            assert_frame_equal(df, reference, check_exact=True)
+            print(f"{'':14s} x{base / elapsed:.2f} vs openpyxl")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,97 @@
+# =====================================================
+# NORMALIZED KEY INDEX
+# =====================================================
+# Marketplace and location names are typed by hand in several
+# workbooks: "Amazon " vs "amazon", "BLR–1" (en dash) or "BLR - 1"
+# vs "BLR-1", double or non-breaking spaces... Each loader builds a dict
+# from the normalized form of its keys to the key as stored, so a
+# lookup is one normalize + one dict probe. Optional aliases
+# ("key_aliases" in config.json) map other spellings onto a key:
+#
+#   "key_aliases": {"marketplace": {"AMZ": "Amazon"}, "location": {}}
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.utils.config import get_setting
+
+# Hyphen, non-breaking hyphen, figure dash, en/em dash, bar, minus, small/fullwidth hyphen-minus
+DASHES = re.compile("[‐‑‒–—―−﹘﹣－]")
+WHITESPACE = re.compile(r"\s+")
+SPACED_DASH = re.compile(r"\s*-\s*")
+
+
+def normalize_key(value) -> str:
+    """NFKC, unicode dashes -> "-" (no spaces around it), collapsed whitespace, casefolded. NaN / None -> "" """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    text = unicodedata.normalize("NFKC", str(value))
+    text = SPACED_DASH.sub("-", DASHES.sub("-", text))
+    return WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def normalize_keys(values: pd.Series) -> pd.Series:
+    """Vectorized twin of normalize_key - keep the two in sync"""
+    return (
+        values.astype(str)
+        .str.normalize("NFKC")
+        .str.replace(DASHES.pattern, "-", regex=True)
+        .str.replace(SPACED_DASH.pattern, "-", regex=True)
+        .str.replace(WHITESPACE.pattern, " ", regex=True)
+        .str.strip()
+        .str.casefold()
+        .where(values.notna(), "")
+    )
+
+
+def load_aliases(kind: str) -> Dict[str, str]:
+    """Alias table for "marketplace" or "location" from config.json"""
+    aliases = get_setting("key_aliases", {}) or {}
+    return dict(aliases.get(kind, {}) or {})
+
+
+class KeyIndex:
+    def __init__(self, keys: Iterable, aliases: Dict[str, str] = None):
+        # normalized -> key as stored (first spelling wins when two normalize alike)
+        self._keys = {}
+        for key in keys:
+            self._keys.setdefault(normalize_key(key), key)
+        self._keys.pop("", None)
+        # normalized alias -> normalized key it stands for
+        self._aliases = {
+            normalize_key(alias): normalize_key(target)
+            for alias, target in (aliases or {}).items()
+        }
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, value) -> bool:
+        return self.resolve(value) is not None
+
+    def resolve(self, value) -> Optional[object]:
+        """The stored key `value` refers to, or None"""
+        return self.resolve_normalized(normalize_key(value))
+
+    def canonical(self, value) -> str:
+        """Normalized key with aliases applied (what the stored key normalizes to)"""
+        key = normalize_key(value)
+        if key in self._keys:
+            return key
+        return self._aliases.get(key, key)
+
+    def resolve_normalized(self, key: str) -> Optional[object]:
+        found = self._keys.get(key)
+        if found is None and key in self._aliases:
+            found = self._keys.get(self._aliases[key])
+        return found
+
+    def unmatched(self, normalized_keys: Iterable[str]) -> List[str]:
+        """Distinct normalized keys that resolve to nothing (for the unmatched report)"""
+        return sorted(
+            key for key in set(normalized_keys)
+            if key and self.resolve_normalized(key) is None
+        )
@@ -15,18 +15,38 @@ LOCATION_COLS = [
 import pandas as pd
 from pathlib import Path
 from src.loaders.base_loader import BaseLoader
+from src.loaders import arrow_snapshot, polars_backend
+from src.loaders.key_index import KeyIndex, load_aliases
+from src.loaders.pincode_reference import ServiceRules
+
+class LocationMasterLoader(arrow_snapshot.SharedSnapshotMixin):
+    SNAPSHOT_NAME = "location_master"
+    SNAPSHOT_INDEX = "location"
+    SNAPSHOT_FRAME = "location_df"
+    SNAPSHOT_LABEL = "locations"
 
-class LocationMasterLoader:
     def __init__(self, file_path: Path):
         self.file_path = file_path
         self.location_df = None
         self.is_loaded = False
+        self.store = None
+        # SQLite table version attached to (see SQLiteMasterStore.attach)
+        self.store_version = None
+        # normalized location -> location as written in the location master
+        self.key_index = KeyIndex([])
+        # (marketplace, location) -> row, and location -> rows (both normalized)
+        self._marketplace_keys = KeyIndex([])
+        self._pairs = {}
+        self._by_location = {}
         
     def load(self) -> pd.DataFrame:
         """
         Load location master from Excel file.
         Returns empty DataFrame if file doesn't exist.
         """
+        self.store = None
+        self.store_version = None
+        self.key_index = KeyIndex([])
         # ✅ Check if file exists
         if not self.file_path.exists():
             print(f"⚠️  Location master file not found: {self.file_path}")
@@ -39,28 +59,17 @@ class LocationMasterLoader:
             df = loader.load()
             df = df[LOCATION_COLS]
             
-            df = df.rename(columns={
-                "customer_name": "customer_name",
-                "address": "customer_address",
-                "pincode": "customer_pincode",
-                "city": "customer_city",
-                "state": "customer_state",
-                "marketplace": "marketplace",
-                "location": "location",
-            })
-            
-            df['customer_pincode'] = (
-                pd.to_numeric(df['customer_pincode'], errors="coerce")
-                .fillna(0)
-                .astype(int)
-                .astype(str)
-            )
+            if polars_backend.use_polars():
+                df = self._clean_polars(df)
+            else:
+                df = self._clean_pandas(df)
             
             # ✅ Set index for fast lookup by location
             df = df.set_index("location", drop=False)
             
             self.location_df = df
             self.is_loaded = True
+            self._build_key_index()
             print(f"✅ Loaded {len(df)} locations")
             return df
             
@@ -70,14 +79,136 @@ class LocationMasterLoader:
             self.is_loaded = False
             return self.location_df
         
-    def exists(self, location: str) -> bool:
-        """Check if location exists in loaded data"""
-        if self.location_df is None or len(self.location_df) == 0:
+    @staticmethod
+    def _clean_pandas(df: pd.DataFrame) -> pd.DataFrame:
+        """Rename the Raw Data columns; pincodes as digit strings"""
+        df = df.rename(columns={
+            "customer_name": "customer_name",
+            "address": "customer_address",
+            "pincode": "customer_pincode",
+            "city": "customer_city",
+            "state": "customer_state",
+            "marketplace": "marketplace",
+            "location": "location",
+        })
+        
+        df['customer_pincode'] = (
+            pd.to_numeric(df['customer_pincode'], errors="coerce")
+            .fillna(0)
+            .astype(int)
+            .astype(str)
+        )
+        return df
+
+    @staticmethod
+    def _clean_polars(df: pd.DataFrame) -> pd.DataFrame:
+        """_clean_pandas as one polars query over the typed cells (src/loaders/polars_backend.py)"""
+        import polars as pl
+
+        return polars_backend.scan(df, numbers=["pincode"]).select(
+            pl.col("marketplace"),
+            pl.col("location"),
+            pl.col("customer_name"),
+            pl.col("address").alias("customer_address"),
+            polars_backend.number("pincode").fill_null(0).cast(pl.Int64).cast(pl.String).alias("customer_pincode"),
+            pl.col("city").alias("customer_city"),
+            pl.col("state").alias("customer_state"),
+        ).collect().to_pandas()
+        
+    # ============ SHARED SNAPSHOT ============
+    # publish_snapshot / attach_snapshot / load_shared: arrow_snapshot.SharedSnapshotMixin
+    def _after_attach(self):
+        self._build_key_index()
+
+    # ============ SQLITE STORE ============
+    def attach_store(self, store, version: str = None) -> bool:
+        """
+        Serve lookups from one version of the SQLite master store (the current
+        one by default) instead of an in-memory DataFrame
+        """
+        self.store = store
+        self.store_version = store.attach("locations", self, version)
+        self.location_df = None
+        self.is_loaded = store.count(self.store_version) > 0
+        self._build_key_index()
+        print(f"✅ Attached {store.count(self.store_version)} locations from {store.db_path.name}:{self.store_version}")
+        return self.is_loaded
+
+    def load_stored(self, store) -> bool:
+        """
+        Attach to the SQLite store when it already holds this file,
+        otherwise parse the Excel file once and ingest it.
+        """
+        version = store.find_version("locations", self.file_path)
+        if version is not None:
+            return self.attach_store(store, version)
+
+        df = self.load()
+        if not self.is_loaded:
             return False
-        return location in self.location_df.index
-    
-    def get_location(self, location: str) -> dict:
-        """Get location as dictionary"""
-        if not self.exists(location):
+        try:
+            version = store.ingest("locations", df, self.file_path)
+        except Exception as e:
+            print(f"⚠️  Could not ingest location master into {store.db_path.name}: {e}")
+            return True
+        return self.attach_store(store, version)
+
+    def _build_key_index(self):
+        """
+        Hash indexes over the (small) location master, built once per load.
+        Two marketplaces may use the same warehouse code, so rows are keyed
+        by (marketplace, location) first and by location alone as a fallback.
+        Records also carry service_type and zone (src/loaders/pincode_reference.py).
+        """
+        frame = self.store.read_frame(self.store_version) if self.store is not None else self.location_df
+        if frame is None:
+            frame = pd.DataFrame(columns=LOCATION_COLS)
+        self.key_index = KeyIndex(frame["location"], load_aliases("location"))
+        self._marketplace_keys = KeyIndex(frame["marketplace"], load_aliases("marketplace"))
+        self._pairs = {}
+        self._by_location = {}
+        # service_type / zone per row from the pincode-range rules, one pass over the table
+        service_types, zones = ServiceRules.from_config().assign(frame["customer_pincode"])
+        for record, service_type, zone in zip(frame.to_dict("records"), service_types, zones):
+            record["service_type"] = service_type
+            record["zone"] = zone
+            location = self.key_index.canonical(record["location"])
+            marketplace = self._marketplace_keys.canonical(record["marketplace"])
+            self._pairs.setdefault((marketplace, location), record)
+            self._by_location.setdefault(location, []).append(record)
+
+    def exists(self, location: str, marketplace: str = None) -> bool:
+        """Check if location exists in loaded data (case, spacing and dash variants match)"""
+        if marketplace is None:
+            return self.key_index.resolve(location) is not None
+        try:
+            self.get_location(location, marketplace)
+            return True
+        except KeyError:
+            return False
+
+    def is_ambiguous(self, location: str, marketplace: str = None) -> bool:
+        """Known location shared by several rows, none of them for this marketplace"""
+        return self.exists(location) and not self.exists(location, marketplace or "")
+
+    def get_location(self, location: str, marketplace: str = None) -> dict:
+        """
+        Location row as a dictionary: the row for (marketplace, location) when there
+        is one, otherwise the only row for `location`. Returned dicts are shared - do not modify.
+        """
+        location_key = self.key_index.canonical(location)
+        if marketplace is not None:
+            record = self._pairs.get((self._marketplace_keys.canonical(marketplace), location_key))
+            if record is not None:
+                return record
+
+        rows = self._by_location.get(location_key)
+        if not rows:
             raise KeyError(f"Location {location} not found in location master")
-        return self.location_df.loc[location].to_dict()
\ No newline at end of file
+        if len(rows) > 1:
+            marketplaces = ", ".join(sorted({str(row["marketplace"]) for row in rows}))
+            raise KeyError(
+                f"Location {location} has {len(rows)} rows in location master ({marketplaces}) "
+                f"and none for marketplace '{marketplace}'"
+            )
+        return rows[0]
\ No newline at end of file
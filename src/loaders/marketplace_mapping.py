@@ -5,9 +5,16 @@
 import pandas as pd
 from pathlib import Path
 from src.loaders.base_loader import BaseLoader
+from src.loaders import arrow_snapshot, polars_backend
+from src.loaders.key_index import KeyIndex, load_aliases
 
 
-class MarketplaceMappingLoader:
+class MarketplaceMappingLoader(arrow_snapshot.SharedSnapshotMixin):
+    SNAPSHOT_NAME = "marketplace_mapping"
+    SNAPSHOT_INDEX = "marketplace"
+    SNAPSHOT_FRAME = "mapping_df"
+    SNAPSHOT_LABEL = "marketplace mappings"
+
     REQUIRED_COLS = [
         "marketplace",
         "transporter",
@@ -18,12 +25,20 @@ class MarketplaceMappingLoader:
         self.file_path = file_path
         self.mapping_df = None
         self.is_loaded = False
+        self.store = None
+        # SQLite table version attached to (see SQLiteMasterStore.attach)
+        self.store_version = None
+        # normalized marketplace -> marketplace as written in the mapping file
+        self.key_index = KeyIndex([])
         
     def load(self) -> pd.DataFrame:
         """
         Load marketplace mapping from Excel file.
         Returns empty DataFrame if file doesn't exist.
         """
+        self.store = None
+        self.store_version = None
+        self.key_index = KeyIndex([])
         # ✅ Check if file exists
         if not self.file_path.exists():
             print(f"⚠️  Marketplace mapping file not found: {self.file_path}")
@@ -36,15 +51,19 @@ class MarketplaceMappingLoader:
             df = loader.load()
             df = df[self.REQUIRED_COLS]
             
-            df["marketplace"] = df["marketplace"].astype(str).str.strip()
-            df["transporter"] = df["transporter"].astype(str).str.strip()
-            df["go_swift_code"] = df["go_swift_code"].fillna("").astype(str).str.strip()
+            if polars_backend.use_polars():
+                df = self._clean_polars(df)
+            else:
+                df["marketplace"] = df["marketplace"].astype(str).str.strip()
+                df["transporter"] = df["transporter"].astype(str).str.strip()
+                df["go_swift_code"] = df["go_swift_code"].fillna("").astype(str).str.strip()
             
             # ✅ Set index for fast lookup by marketplace
             df = df.set_index("marketplace", drop=False)
             
             self.mapping_df = df
             self.is_loaded = True
+            self._build_key_index()
             print(f"✅ Loaded {len(df)} marketplace mappings")
             return df
             
@@ -54,14 +73,68 @@ class MarketplaceMappingLoader:
             self.is_loaded = False
             return self.mapping_df
     
-    def exists(self, marketplace: str) -> bool:
-        """Check if marketplace exists in loaded data"""
-        if self.mapping_df is None or len(self.mapping_df) == 0:
+    @staticmethod
+    def _clean_polars(df: pd.DataFrame) -> pd.DataFrame:
+        """The pandas cleaning in load() as one polars query (src/loaders/polars_backend.py)"""
+        import polars as pl
+
+        return polars_backend.scan(df).select(
+            polars_backend.stripped("marketplace"),
+            polars_backend.stripped("transporter"),
+            pl.col("go_swift_code").fill_null("").str.strip_chars(),
+        ).collect().to_pandas()
+
+    # ============ SHARED SNAPSHOT ============
+    # publish_snapshot / attach_snapshot / load_shared: arrow_snapshot.SharedSnapshotMixin
+    def _after_attach(self):
+        self._build_key_index()
+
+    # ============ SQLITE STORE ============
+    def attach_store(self, store, version: str = None) -> bool:
+        """
+        Serve lookups from one version of the SQLite master store (the current
+        one by default) instead of an in-memory DataFrame
+        """
+        self.store = store
+        self.store_version = store.attach("marketplace_mappings", self, version)
+        self.mapping_df = None
+        self.is_loaded = store.count(self.store_version) > 0
+        self._build_key_index()
+        print(f"✅ Attached {store.count(self.store_version)} marketplace mappings from {store.db_path.name}:{self.store_version}")
+        return self.is_loaded
+
+    def load_stored(self, store) -> bool:
+        """
+        Attach to the SQLite store when it already holds this file,
+        otherwise parse the Excel file once and ingest it.
+        """
+        version = store.find_version("marketplace_mappings", self.file_path)
+        if version is not None:
+            return self.attach_store(store, version)
+
+        df = self.load()
+        if not self.is_loaded:
             return False
-        return marketplace in self.mapping_df.index
+        try:
+            version = store.ingest("marketplace_mappings", df, self.file_path)
+        except Exception as e:
+            print(f"⚠️  Could not ingest marketplace mapping into {store.db_path.name}: {e}")
+            return True
+        return self.attach_store(store, version)
+
+    def _build_key_index(self):
+        keys = self.store.keys(self.store_version) if self.store is not None else self.mapping_df.index
+        self.key_index = KeyIndex(keys, load_aliases("marketplace"))
+
+    def exists(self, marketplace: str) -> bool:
+        """Check if marketplace exists in loaded data (case, spacing and dash variants match)"""
+        return self.key_index.resolve(marketplace) is not None
 
     def get_mapping(self, marketplace: str) -> dict:
         """Get marketplace mapping as dictionary"""
-        if not self.exists(marketplace):
+        key = self.key_index.resolve(marketplace)
+        if key is None:
             raise KeyError(f"Marketplace {marketplace} not found in mapping")
-        return self.mapping_df.loc[marketplace].to_dict()
\ No newline at end of file
+        if self.store is not None:
+            return self.store.get(self.store_version, key)
+        return self.mapping_df.loc[key].to_dict()
\ No newline at end of file
@@ -4,7 +4,15 @@
 
 import pandas as pd
 from pathlib import Path
+from typing import TYPE_CHECKING
 from src.loaders.base_loader import BaseLoader
+from src.loaders import arrow_snapshot, polars_backend
+from src.loaders.po_search_index import POSearchIndex
+from src.loaders.order_selection_index import OrderSelectionIndex, COLUMNS as SELECTION_COLUMNS
+from src.utils.order_intake import ZERO_WIDTH, QUOTE_CHARS, FLOAT_PO, normalize_order_number
+
+if TYPE_CHECKING:
+    import polars as pl
 
 REQUIRED_COLS = [
     "marketplaces",
@@ -18,25 +26,74 @@ REQUIRED_COLS = [
     "ewb",
     "exp_date"
 ]
-import pandas as pd
-from pathlib import Path
-from src.loaders.base_loader import BaseLoader
 
-class MasterOrdersLoader:
+
+# Lookup key column: the normalized PO. `order_number` keeps the master's spelling for the output.
+KEY = "po_key"
+
+
+def display_order_numbers(orders: pd.Series) -> pd.Series:
+    """PO as written in the master; numeric cells lose the ".0" Excel reads them with"""
+    return orders.astype(str).str.replace(FLOAT_PO.pattern, r"\1", regex=True)
+
+
+def normalize_order_numbers(orders: pd.Series) -> pd.Series:
+    """Vectorized twin of order_intake.normalize_order_number - keep the two in sync"""
+    return (
+        orders.astype(str)
+        .str.replace(ZERO_WIDTH.pattern, "", regex=True)
+        .str.strip()
+        .str.strip(QUOTE_CHARS)
+        .str.strip()
+        .str.upper()
+        .str.replace(FLOAT_PO.pattern, r"\1", regex=True)
+    )
+
+
+def normalize_order_numbers_expr(orders):
+    """Polars twin of normalize_order_numbers (takes and returns a polars string expression)"""
+    return (
+        orders.str.replace_all(ZERO_WIDTH.pattern, "")
+        .str.strip_chars()
+        .str.strip_chars(QUOTE_CHARS)
+        .str.strip_chars()
+        .str.to_uppercase()
+        .str.replace(FLOAT_PO.pattern, "${1}")
+    )
+
+
+class MasterOrdersLoader(arrow_snapshot.SharedSnapshotMixin):
+    SNAPSHOT_NAME = "master_orders"
+    SNAPSHOT_INDEX = KEY
+    SNAPSHOT_FRAME = "orders_df"
+    SNAPSHOT_LABEL = "orders"
+
     def __init__(self, file_path: Path):
         self.file_path = file_path
         self.orders_df = None
+        # Cleaned orders as a polars frame (unique POs only) when the polars backend loaded them
+        self.orders_pl = None
         self.is_loaded = False
+        self.store = None
+        # SQLite table version attached to (see SQLiteMasterStore.attach)
+        self.store_version = None
+        self.search_index = POSearchIndex([])
+        self.selection_index = OrderSelectionIndex()
+        # POs on more than one row in the store (they cannot be exported)
+        self._duplicates = set()
     
     def load(self) -> pd.DataFrame:
         """
         Load master orders from Excel file.
         Returns empty DataFrame if file doesn't exist.
         """
+        self.store = None
+        self.store_version = None
+        self.orders_pl = None
         # ✅ Check if file exists - if not, return empty DataFrame
         if not self.file_path.exists():
             print(f"⚠️  Master file not found: {self.file_path}")
-            self.orders_df = pd.DataFrame(columns=["order_number"] + REQUIRED_COLS)
+            self.orders_df = pd.DataFrame(columns=["order_number"] + REQUIRED_COLS + [KEY])
             self.is_loaded = False
             return self.orders_df
         
@@ -45,69 +102,216 @@ class MasterOrdersLoader:
             df = loader.load()
             df = df[REQUIRED_COLS]
             
-            df = df.rename(columns={
-                "po": "order_number",
-                "invoice_value": "invoice_value",
-                "weight": "weight_kg",
-            })
-
-            # Clean invoice values
-            df["invoice_value"] = (
-                df["invoice_value"]
-                .astype(str)
-                .str.replace("₹", "", regex=False)
-                .str.replace(",", "", regex=False)
-                .str.strip()
-            )
-
-            # Convert to numeric (handles invalid values gracefully)
-            df["invoice_value"] = pd.to_numeric(
-                df["invoice_value"].str.split(".").str[0],
-                errors="coerce"
-            )
-            df["invoice_value"] = df["invoice_value"].fillna(0).astype(int)
-            
-            # Convert weight to grams
-            df['weight_kg'] = pd.to_numeric(df["weight_kg"], errors="coerce").fillna(0)
-            df["total_weight_gms"] = (df["weight_kg"] * 1000).astype(int)
-            
-            # Data type conversions
-            df["order_number"] = df["order_number"].astype(str)
-            df['invoice_number'] = df['invoice_number'].astype(str)
+            if polars_backend.use_polars():
+                self.orders_pl = self._clean_polars(df)
+            df = self._clean_pandas(df)
             
-            # Handle EWB
-            if df['ewb'].isnull().any():
-                df['ewb'] = df['ewb'].fillna('')
-            else:
-                df['ewb'] = df['ewb'].astype(str)
-            
-            # Parse expiry date
-            df["exp_date"] = pd.to_datetime(df["exp_date"], errors="coerce")
-            
-            # ✅ Set index for fast lookup
-            df = df.set_index("order_number", drop=False)
+            # ✅ Set index for fast lookup (by normalized PO)
+            df = df.set_index(KEY, drop=False)
             
             self.orders_df = df
             self.is_loaded = True
+            self._build_indexes()
             print(f"✅ Loaded {len(df)} orders from master")
             return df
             
         except Exception as e:
             print(f"❌ Error loading master orders: {str(e)}")
-            self.orders_df = pd.DataFrame(columns=["order_number"] + REQUIRED_COLS)
+            self.orders_df = pd.DataFrame(columns=["order_number"] + REQUIRED_COLS + [KEY])
             self.is_loaded = False
             return self.orders_df
     
+    def _clean_pandas(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename and clean the OnlineB2B columns"""
+        df = df.rename(columns={
+            "po": "order_number",
+            "invoice_value": "invoice_value",
+            "weight": "weight_kg",
+        })
+
+        # Clean invoice values
+        df["invoice_value"] = (
+            df["invoice_value"]
+            .astype(str)
+            .str.replace("₹", "", regex=False)
+            .str.replace(",", "", regex=False)
+            .str.strip()
+        )
+
+        # Convert to numeric (handles invalid values gracefully)
+        df["invoice_value"] = pd.to_numeric(
+            df["invoice_value"].str.split(".").str[0],
+            errors="coerce"
+        )
+        df["invoice_value"] = df["invoice_value"].fillna(0).astype(int)
+        
+        # Convert weight to grams
+        df['weight_kg'] = pd.to_numeric(df["weight_kg"], errors="coerce").fillna(0)
+        df["total_weight_gms"] = (df["weight_kg"] * 1000).astype(int)
+        
+        # Data type conversions
+        df["order_number"] = display_order_numbers(df["order_number"])
+        df['invoice_number'] = df['invoice_number'].astype(str)
+        
+        # Handle EWB
+        if df['ewb'].isnull().any():
+            df['ewb'] = df['ewb'].fillna('')
+        else:
+            df['ewb'] = df['ewb'].astype(str)
+        
+        # Parse expiry date
+        df["exp_date"] = pd.to_datetime(df["exp_date"], errors="coerce")
+
+        df[KEY] = normalize_order_numbers(df["order_number"])
+        return df
+
+    def _clean_polars(self, df: pd.DataFrame) -> "pl.DataFrame":
+        """
+        _clean_pandas as one polars query over the typed cells (src/loaders/polars_backend.py),
+        for the batch join only: orders_df always comes from _clean_pandas so its cells
+        (and master_diff fingerprints) do not depend on the backend
+        """
+        import polars as pl
+
+        weight = polars_backend.number("weight").fill_null(0)
+        invoice = (
+            pl.col("invoice_value")
+            .str.replace_all("₹", "", literal=True)
+            .str.replace_all(",", "", literal=True)
+            .str.strip_chars()
+            .str.split(".").list.first()
+            .cast(pl.Float64, strict=False)
+            .fill_nan(None)
+            .fill_null(0)
+            .cast(pl.Int64)
+        )
+        orders = polars_backend.scan(df, numbers=["weight", "box"], dates=["exp_date"]).select(
+            pl.col("marketplaces"),
+            pl.col("po").str.replace(FLOAT_PO.pattern, "${1}").alias("order_number"),
+            pl.col("location"),
+            invoice.alias("invoice_value"),
+            weight.alias("weight_kg"),
+            pl.col("courier_name"),
+            polars_backend.integer_cells("box", polars_backend.int_literals(df["box"])).alias("box"),
+            pl.col("invoice_number"),
+            pl.col("ewb").fill_null(""),
+            pl.col("exp_date"),
+            (weight * 1000).cast(pl.Int64).alias("total_weight_gms"),
+            normalize_order_numbers_expr(pl.col("po").str.replace(FLOAT_PO.pattern, "${1}")).alias(KEY),
+        ).collect()
+        # POs listed more than once stay out of the join build (build_row reports them)
+        return orders.filter(pl.col(KEY).is_unique())
+
+    def _build_indexes(self):
+        """Lookup structures derived from the loaded orders, rebuilt on every load"""
+        if self.store is not None:
+            self.search_index = POSearchIndex(self.store.keys(self.store_version))
+            self._duplicates = self.store.duplicate_keys(self.store_version)
+            self.selection_index = OrderSelectionIndex(self.store.read_columns(self.store_version, SELECTION_COLUMNS))
+        else:
+            self.search_index = POSearchIndex(self.orders_df.index)
+            self.selection_index = OrderSelectionIndex(self.orders_df)
+
+    # ============ SHARED SNAPSHOT ============
+    # publish_snapshot / attach_snapshot / load_shared: arrow_snapshot.SharedSnapshotMixin
+    def _after_attach(self):
+        self.orders_pl = None
+        self._build_indexes()
+
+    # ============ SQLITE STORE ============
+    def attach_store(self, store, version: str = None) -> bool:
+        """
+        Serve lookups from one version of the SQLite master store (the current
+        one by default) instead of an in-memory DataFrame
+        """
+        self.store = store
+        self.store_version = store.attach("orders", self, version)
+        self.orders_df = None
+        self.orders_pl = None
+        self.is_loaded = store.count(self.store_version) > 0
+        self._build_indexes()
+        print(f"✅ Attached {store.count(self.store_version)} orders from {store.db_path.name}:{self.store_version}")
+        return self.is_loaded
+
+    def load_stored(self, store) -> bool:
+        """
+        Attach to the SQLite store when it already holds this file,
+        otherwise parse the Excel file once and ingest it.
+        """
+        version = store.find_version("orders", self.file_path)
+        if version is not None:
+            return self.attach_store(store, version)
+
+        df = self.load()
+        if not self.is_loaded:
+            return False
+        try:
+            version = store.ingest("orders", df, self.file_path)
+        except Exception as e:
+            print(f"⚠️  Could not ingest master orders into {store.db_path.name}: {e}")
+            return True
+        return self.attach_store(store, version)
+
     def exists(self, order_number: str) -> bool:
-        """Check if order exists in loaded data"""
+        """Check if order exists in loaded data (any spelling normalize_order_number accepts)"""
+        key = normalize_order_number(order_number)
+        if self.store is not None:
+            return self.store.exists(self.store_version, key)
         if self.orders_df is None or len(self.orders_df) == 0:
             return False
-        return order_number in self.orders_df.index
+        return key in self.orders_df.index
     
     def get_order(self, order_number: str) -> dict:
         """Get order as dictionary"""
         if not self.exists(order_number):
             raise KeyError(f"Order number {order_number} not found in master")
+        key = normalize_order_number(order_number)
+        if self.store is not None:
+            if key in self._duplicates:
+                raise KeyError(f"Order number {order_number} appears more than once in master")
+            return self.store.get(self.store_version, key)
         
-        # .loc[order_number] gets the row, .to_dict() converts it to dictionary
-        return self.orders_df.loc[order_number].to_dict()
\ No newline at end of file
+        # .loc[key] gets the row, .to_dict() converts it to dictionary
+        row = self.orders_df.loc[key]
+        if isinstance(row, pd.DataFrame):
+            raise KeyError(f"Order number {order_number} appears {len(row)} times in master")
+        return row.to_dict()
+
+    def get_orders(self, order_numbers: list) -> dict:
+        """
+        Batch lookup: order_number (as given) -> order dict for every PO found.
+        POs listed more than once in the master are left out (get_order reports them).
+        """
+        keys = {po: normalize_order_number(po) for po in order_numbers}
+        if self.store is not None:
+            found = self.store.get_many(self.store_version, keys.values())
+            for key in self._duplicates.intersection(found):
+                del found[key]
+            return {po: found[key] for po, key in keys.items() if key in found}
+        if self.orders_df is None or len(self.orders_df) == 0:
+            return {}
+        index = self.orders_df.index
+        wanted = [key for key in dict.fromkeys(keys.values()) if key in index]
+        if index.has_duplicates:
+            duplicated = set(index[index.duplicated()])
+            wanted = [key for key in wanted if key not in duplicated]
+        if not wanted:
+            return {}
+        found = dict(zip(wanted, self.orders_df.loc[wanted].to_dict("records")))
+        return {po: found[key] for po, key in keys.items() if key in found}
+
+    def get_dataframe(self) -> pd.DataFrame:
+        """Every loaded order as a DataFrame, whichever backend serves lookups"""
+        if self.store is not None:
+            return self.store.read_frame(self.store_version)
+        if self.orders_df is None:
+            return pd.DataFrame(columns=["order_number"] + REQUIRED_COLS + [KEY])
+        return self.orders_df
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """PO numbers starting or ending with `query` (for lookup-as-you-type)"""
+        return self.search_index.search(query, limit)
+
+    def select(self, marketplace=None, location=None, courier=None, expires_from=None, expires_to=None) -> list:
+        """PO numbers matching every given filter (see OrderSelectionIndex.select)"""
+        return self.selection_index.select(marketplace, location, courier, expires_from, expires_to)
\ No newline at end of file
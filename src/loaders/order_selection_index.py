@@ -0,0 +1,129 @@
+# =====================================================
+# ORDER SELECTION INDEX
+# =====================================================
+# Inverted indexes built once per load for picking export batches
+# like "all Amazon BLR1 POs expiring this week":
+#
+#   marketplace / location / courier  normalized key -> set of POs
+#   exp_date                          POs sorted by expiry day
+#
+# A selection intersects the sets of the chosen values (smallest
+# first) and bisects the expiry array for the date range, so it
+# costs milliseconds however big the master is. Keys go through
+# normalize_key and the "key_aliases" of config.json (KeyIndex.canonical),
+# so "AMAZON ", "Amazon" and an alias "AMZ" are all the same value.
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from src.loaders.key_index import KeyIndex, load_aliases, normalize_keys
+
+# selection field -> master orders column
+FIELDS = {
+    "marketplace": "marketplaces",
+    "location": "location",
+    "courier": "courier_name",
+}
+# POs are identified by the master's normalized key column
+PO_COLUMN = "po_key"
+COLUMNS = [PO_COLUMN, *FIELDS.values(), "exp_date"]
+
+Values = Union[None, str, Iterable[str]]
+
+
+class OrderSelectionIndex:
+    def __init__(self, frame: Optional[pd.DataFrame] = None, aliases: Optional[Dict[str, Dict[str, str]]] = None):
+        # field -> alias table ("key_aliases" in config.json unless given)
+        if aliases is None:
+            aliases = {name: load_aliases(name) for name in FIELDS}
+        tables = {name: aliases.get(name) or {} for name in FIELDS}
+        # The alias targets are the canonical values an alias folds into
+        self._keys = {name: KeyIndex(table.values(), table) for name, table in tables.items()}
+        # field -> canonical key -> POs, and canonical key -> pick-list label
+        self._sets: Dict[str, Dict[str, Set[str]]] = {name: {} for name in FIELDS}
+        self._labels: Dict[str, Dict[str, str]] = {name: {} for name in FIELDS}
+        self._days = np.array([], dtype="datetime64[D]")
+        self._dated = np.array([], dtype=object)
+        self._all: Set[str] = set()
+        if frame is not None and len(frame):
+            self._build(frame)
+
+    def _build(self, frame: pd.DataFrame):
+        order_numbers = frame[PO_COLUMN].astype(str).to_numpy(dtype=object)
+        self._all = set(order_numbers)
+
+        for name, column in FIELDS.items():
+            # Normalize each distinct spelling once, then split the POs by key
+            codes, spellings = pd.factorize(frame[column].to_numpy(dtype=object), use_na_sentinel=False)
+            key_index = self._keys[name]
+            keys = normalize_keys(pd.Series(spellings, dtype=object)).map(key_index.canonical)
+            key_codes, unique_keys = pd.factorize(keys)
+            row_keys = key_codes[codes]
+            order = np.argsort(row_keys, kind="stable")
+            bounds = np.flatnonzero(np.diff(row_keys[order])) + 1
+            sets, labels = {}, {}
+            for rows in np.split(order, bounds) if len(order) else []:
+                key = unique_keys[row_keys[rows[0]]]
+                if key:
+                    sets[key] = set(order_numbers[rows])
+            for spelling, key in zip(spellings, keys):
+                if key and key not in labels:
+                    # An aliased value is listed as its target is spelled in the config
+                    target = key_index.resolve_normalized(key)
+                    labels[key] = str(spelling).strip() if target is None else str(target)
+            self._sets[name] = sets
+            self._labels[name] = labels
+
+        days = pd.to_datetime(frame["exp_date"], errors="coerce").dt.normalize().to_numpy()
+        dated = ~pd.isna(days)
+        order = np.argsort(days[dated], kind="stable")
+        self._days = days[dated][order].astype("datetime64[D]")
+        self._dated = order_numbers[dated][order]
+
+    def __len__(self):
+        return len(self._all)
+
+    def values(self, name: str) -> List[str]:
+        """Distinct values of a field (as first spelled in the master), for pick lists"""
+        return sorted(self._labels[name].values(), key=str.casefold)
+
+    def count(self, name: str, value: str) -> int:
+        return len(self._sets[name].get(self._keys[name].canonical(value), ()))
+
+    def expiring(self, start: Optional[date] = None, end: Optional[date] = None) -> Set[str]:
+        """POs whose exp_date falls on start..end (inclusive days, either end open)"""
+        lo = 0 if start is None else np.searchsorted(self._days, np.datetime64(start, "D"), side="left")
+        hi = len(self._days) if end is None else np.searchsorted(self._days, np.datetime64(end, "D"), side="right")
+        return set(self._dated[lo:hi])
+
+    def select(
+        self,
+        marketplace: Values = None,
+        location: Values = None,
+        courier: Values = None,
+        expires_from: Optional[date] = None,
+        expires_to: Optional[date] = None,
+    ) -> List[str]:
+        """
+        Sorted POs matching every given filter. Each field takes one value or a
+        list (any of them); None means no filter on that field, an empty list
+        matches nothing.
+        """
+        chosen = []
+        for name, wanted in (("marketplace", marketplace), ("location", location), ("courier", courier)):
+            if wanted is None:
+                continue
+            if isinstance(wanted, str):
+                wanted = [wanted]
+            groups = [self._sets[name].get(self._keys[name].canonical(value), set()) for value in wanted]
+            chosen.append(groups[0] if len(groups) == 1 else set().union(*groups))
+        if expires_from is not None or expires_to is not None:
+            chosen.append(self.expiring(expires_from, expires_to))
+
+        if not chosen:
+            return sorted(self._all)
+        chosen.sort(key=len)
+        return sorted(chosen[0].intersection(*chosen[1:]))
@@ -0,0 +1,504 @@
+# =====================================================
+# PARALLEL SHEET PARSER
+# =====================================================
+# Parses one big .xlsx sheet on several cores. The sheet XML is
+# inflated once to a temp file and <sheetData> is cut into byte
+# ranges on <row> boundaries. Each worker process reads the workbook
+# context once straight from the package parts (shared strings, date
+# styles, epoch), parses its ranges and converts cells exactly like
+# pandas' openpyxl reader does.
+#
+# A worker hands back its range column by column: int64 / float64 /
+# bool arrays where every cell of the chunk fits, object arrays
+# otherwise. The parent concatenates the chunks of each column in
+# sheet order, widening the type where chunks disagree, and lays the
+# rows out as read_excel does (gaps, trailing blanks). Columns that
+# end up numeric are final; only text-like columns go through
+# pandas' TextParser, once and over the whole column, because type
+# inference on text has to see every cell to agree with read_excel.
+#
+#   "parallel_sheet": {"workers": 0, "min_mb": 40}
+#
+# read_excel() in base_loader uses this for .xlsx/.xlsm sheets whose
+# XML is at least `min_mb` MB when no engine is forced, and falls
+# back to the normal engines on any error.
+
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.config import get_setting
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PARALLEL_SUFFIXES = {".xlsx", ".xlsm"}
+DEFAULT_MIN_MB = 40
+# One worker parses about 6x slower than calamine but ~1.5x faster than
+# openpyxl (bench_parallel_sheet), so against calamine the pool only
+# pays off from this many cores
+MIN_WORKERS_VS_CALAMINE = 8
+# Ranges per worker: a few more than one keeps the pool busy when ranges parse unevenly
+RANGES_PER_WORKER = 4
+
+SHEET_DATA_OPEN = re.compile(rb"<(?:(\w+):)?sheetData\b[^>]*?(/?)>")
+ROOT_OPEN = re.compile(rb"<(?:(\w+):)?worksheet\b")
+ROW_START = re.compile(rb"<(?:\w+:)?row[\s>/]")
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+class SequentialOnly(Exception):
+    """The sheet cannot be split safely; read it the normal way"""
+
+
+# =====================================================
+# SETTINGS
+# =====================================================
+def parallel_workers() -> int:
+    settings = get_setting("parallel_sheet", {}) or {}
+    return settings.get("workers") or os.cpu_count() or 1
+
+
+def should_parse_in_parallel(file_path: Path, sheet_name=0, engine: str = None) -> bool:
+    """Worth a pool: enough cores to beat `engine` and a sheet XML of at least min_mb"""
+    settings = get_setting("parallel_sheet", {}) or {}
+    needed = MIN_WORKERS_VS_CALAMINE if engine == "calamine" else 2
+    if Path(file_path).suffix.lower() not in PARALLEL_SUFFIXES or parallel_workers() < needed:
+        return False
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            size = archive.getinfo(sheet_member(archive, sheet_name)).file_size
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return False
+    return size >= settings.get("min_mb", DEFAULT_MIN_MB) * 1_000_000
+
+
+# =====================================================
+# SHEET XML
+# =====================================================
+def _part(archive: zipfile.ZipFile, rels_member: str, rel_type: str = None, rel_id: str = None,
+          default: str = None) -> Optional[str]:
+    """Zip member a relationship points at (by type or id), `default` when there is none"""
+    import xml.etree.ElementTree as ET
+
+    try:
+        rels = ET.fromstring(archive.read(rels_member))
+    except KeyError:
+        return default
+    for rel in rels:
+        if rel.get("Id") == rel_id or (rel_type and rel.get("Type", "").endswith("/" + rel_type)):
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else "xl/" + target
+    return default
+
+
+def sheet_member(archive: zipfile.ZipFile, sheet_name=0) -> str:
+    """Zip member of a sheet given by name or position (as read_excel takes it)"""
+    import xml.etree.ElementTree as ET
+
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    sheets = [el for el in workbook.iter() if el.tag.endswith("}sheet")]
+    if isinstance(sheet_name, str):
+        matches = [el for el in sheets if el.get("name") == sheet_name]
+        if not matches:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        sheet = matches[0]
+    else:
+        sheet = sheets[sheet_name]
+    member = _part(archive, "xl/_rels/workbook.xml.rels", rel_id=sheet.get(f"{{{REL_NS}}}id"))
+    if member is None:
+        raise SequentialOnly(f"no part for sheet {sheet.get('name')!r}")
+    return member
+
+
+def split_rows(data: bytes, parts: int) -> Tuple[bytes, bytes, List[Tuple[int, int]]]:
+    """
+    (head, tail, ranges): `head` is everything up to and including the
+    <sheetData> start tag, `tail` closes it again, `ranges` are byte
+    ranges of whole <row> elements covering sheetData in order.
+    """
+    opened = SHEET_DATA_OPEN.search(data)
+    root = ROOT_OPEN.search(data)
+    if opened is None or root is None:
+        raise SequentialOnly("no <sheetData>")
+    prefix = opened.group(1) + b":" if opened.group(1) else b""
+    if opened.group(2):
+        return data[:opened.start()], b"", []
+    root_prefix = root.group(1) + b":" if root.group(1) else b""
+    start = opened.end()
+    end = data.rfind(b"</" + prefix + b"sheetData>")
+    if end < start:
+        raise SequentialOnly("unterminated <sheetData>")
+
+    first = ROW_START.search(data, start, end)
+    if first is None:
+        return data[:start], b"", []
+    bounds = [first.start()]
+    step = max(1, (end - first.start()) // parts)
+    for i in range(1, parts):
+        found = ROW_START.search(data, max(bounds[-1] + 1, first.start() + i * step), end)
+        if found is None:
+            break
+        if found.start() > bounds[-1]:
+            bounds.append(found.start())
+    bounds.append(end)
+    tail = b"</" + prefix + b"sheetData></" + root_prefix + b"worksheet>"
+    return data[:start], tail, list(zip(bounds[:-1], bounds[1:]))
+
+
+# =====================================================
+# WORKBOOK CONTEXT
+# =====================================================
+# What openpyxl's reader sets up before it parses a sheet, read from
+# the package parts themselves: the shared string table, which cell
+# styles are date / timedelta formats, and the 1900 / 1904 epoch.
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+VALUE_TAG = MAIN_NS + "v"
+INLINE_TAG = MAIN_NS + "is"
+TEXT_TAG = MAIN_NS + "t"
+RUN_TAG = MAIN_NS + "r"
+STRING_ITEM_TAG = MAIN_NS + "si"
+DIGITS = "0123456789"
+
+
+def _inline_text(element) -> str:
+    """openpyxl Text.content: <t> then the <t> of every rich-text run (phonetic runs ignored)"""
+    plain, runs = None, []
+    for child in element:
+        if child.tag == TEXT_TAG:
+            plain = child.text
+        elif child.tag == RUN_TAG:
+            text = None
+            for part in child:
+                if part.tag == TEXT_TAG:
+                    text = part.text
+            if text is not None:
+                runs.append(text)
+    return "".join(([plain] if plain is not None else []) + runs)
+
+
+def shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """The shared string table as openpyxl's read_string_table gives it"""
+    import xml.etree.ElementTree as ET
+
+    member = _part(archive, "xl/_rels/workbook.xml.rels", "sharedStrings", default="xl/sharedStrings.xml")
+    if member not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(member) as source:
+        for _, node in ET.iterparse(source):
+            if node.tag == STRING_ITEM_TAG:
+                strings.append(_inline_text(node).replace("x005F_", ""))
+                node.clear()
+    return strings
+
+
+def date_styles(archive: zipfile.ZipFile) -> Tuple[set, set]:
+    """(date, timedelta) cell style indexes, as openpyxl's Stylesheet indexes them"""
+    import xml.etree.ElementTree as ET
+    from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+
+    member = _part(archive, "xl/_rels/workbook.xml.rels", "styles", default="xl/styles.xml")
+    if member not in archive.namelist():
+        return set(), set()
+    styles = ET.fromstring(archive.read(member))
+    custom = {int(el.get("numFmtId")): el.get("formatCode") for el in styles.iter(MAIN_NS + "numFmt")}
+    cell_xfs = styles.find(MAIN_NS + "cellXfs")
+    date_formats, timedelta_formats = set(), set()
+    for idx, xf in enumerate(cell_xfs if cell_xfs is not None else ()):
+        num_fmt = int(xf.get("numFmtId", 0))
+        fmt = custom[num_fmt] if num_fmt in custom else builtin_format_code(num_fmt)
+        if is_date_format(fmt):
+            date_formats.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_formats.add(idx)
+    return date_formats, timedelta_formats
+
+
+def workbook_epoch(archive: zipfile.ZipFile):
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+    properties = ET.fromstring(archive.read("xl/workbook.xml")).find(MAIN_NS + "workbookPr")
+    date1904 = properties.get("date1904", "") if properties is not None else ""
+    return CALENDAR_MAC_1904 if date1904.lower() in ("1", "true") else CALENDAR_WINDOWS_1900
+
+
+def workbook_context(file_path) -> dict:
+    with zipfile.ZipFile(file_path) as archive:
+        date_formats, timedelta_formats = date_styles(archive)
+        return {
+            "shared_strings": shared_strings(archive),
+            "date_formats": date_formats,
+            "timedelta_formats": timedelta_formats,
+            "epoch": workbook_epoch(archive),
+        }
+
+
+# =====================================================
+# WORKER
+# =====================================================
+# Mirrors openpyxl's WorkSheetParser.parse_row / parse_cell (data_only,
+# as pandas opens the book) and pandas' _convert_cell in one pass, without
+# building a dict per cell. test_parallel_sheet.py compares the result
+# with read_excel on every cell type.
+
+# Largest integer a float64 chunk carries exactly
+FLOAT_EXACT = 2 ** 53
+
+# Set once per worker process by _init_worker
+_book = None
+
+
+def _init_worker(file_path: str):
+    global _book
+    _book = workbook_context(file_path)
+
+
+def _typed(cells: list) -> np.ndarray:
+    """
+    One column chunk as the most compact array _untyped turns back into
+    the same cells: int64, float64 (blank cells as NaN), bool or object.
+    """
+    kinds = set(map(type, cells))
+    if kinds == {int}:
+        try:
+            return np.array(cells, dtype=np.int64)
+        except OverflowError:
+            pass
+    elif kinds <= {int, float, str} and not any(type(cell) is str and cell for cell in cells):
+        # Cells only hold integral floats as int, so float64 keeps int and float apart
+        chunk = np.array([np.nan if cell == "" else cell for cell in cells], dtype=np.float64)
+        finite = chunk[~np.isnan(chunk)]
+        if not finite.size or np.abs(finite).max() < FLOAT_EXACT:
+            return chunk
+    elif kinds == {bool}:
+        return np.array(cells, dtype=bool)
+    chunk = np.empty(len(cells), dtype=object)
+    chunk[:] = cells
+    return chunk
+
+
+def _untyped(chunk: np.ndarray) -> list:
+    if chunk.dtype == np.float64:
+        return [int(value) if value.is_integer() else value for value in chunk.tolist()]
+    return chunk.tolist()
+
+
+def _parse_range(xml_path: str, head: bytes, tail: bytes, start: int, end: int, first: bool):
+    """
+    (header, row numbers, row widths, column chunks) for one byte range.
+    The first range hands sheet row 1 back as `header` instead of in the chunks,
+    so column names do not turn numeric columns into object ones.
+    """
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils import column_index_from_string
+    from openpyxl.utils.datetime import from_excel, from_ISO8601
+
+    with open(xml_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    sheet_data = ET.fromstring(head + chunk + tail).find(MAIN_NS + "sheetData")
+
+    shared = _book["shared_strings"]
+    date_formats = _book["date_formats"]
+    timedelta_formats = _book["timedelta_formats"]
+    epoch = _book["epoch"]
+    letters_to_index = {}
+    header = None
+    numbers, widths, columns = [], [], []
+    number = 0
+    for row in sheet_data:
+        r = row.get("r")
+        if r is None:
+            if not first:
+                # Row numbers would be counted from this range's start
+                raise SequentialOnly("rows without r attribute")
+            number += 1
+        else:
+            number = int(r) if r.isdigit() else int(float(r))
+
+        values = []
+        column = 0
+        for cell in row:
+            coordinate = cell.get("r")
+            if coordinate:
+                letters = coordinate.rstrip(DIGITS)
+                column = letters_to_index.get(letters)
+                if column is None:
+                    column = letters_to_index[letters] = column_index_from_string(letters)
+            else:
+                column += 1
+
+            data_type = cell.get("t", "n")
+            value = None if data_type == "inlineStr" else (cell.findtext(VALUE_TAG) or None)
+            if value is None:
+                if data_type == "inlineStr":
+                    child = cell.find(INLINE_TAG)
+                    value = _inline_text(child) if child is not None else ""
+                else:
+                    value = ""
+            elif data_type == "n":
+                number_value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                style = cell.get("s")
+                style = int(style) if style else 0
+                if style in date_formats:
+                    try:
+                        value = from_excel(number_value, epoch, timedelta=style in timedelta_formats)
+                    except (OverflowError, ValueError):
+                        value = float("nan")  # openpyxl: "#VALUE!" error cell
+                else:
+                    as_int = int(number_value)
+                    value = as_int if as_int == number_value else float(number_value)
+            elif data_type == "s":
+                value = shared[int(value)]
+            elif data_type == "b":
+                value = bool(int(value))
+            elif data_type == "d":
+                value = from_ISO8601(value)
+            elif data_type == "e":
+                value = float("nan")
+
+            # ReadOnlyWorksheet._get_row: a cell lands at its column, gaps stay empty
+            if column > len(values):
+                values.extend([""] * (column - len(values)))
+            values[column - 1] = value
+        # ...and the row ends at the column of its last cell
+        del values[column:]
+        while values and values[-1] == "":
+            values.pop()
+
+        if first and number == 1 and not numbers and header is None:
+            header = values
+            continue
+        width = len(values)
+        for _ in range(len(columns), width):
+            columns.append([""] * len(numbers))
+        values.extend([""] * (len(columns) - width))
+        for cells, value in zip(columns, values):
+            cells.append(value)
+        numbers.append(number)
+        widths.append(width)
+    return header, np.array(numbers, dtype=np.int64), np.array(widths, dtype=np.int64), [_typed(cells) for cells in columns]
+
+
+# =====================================================
+# PARENT
+# =====================================================
+def _merge(chunks: List[np.ndarray]) -> np.ndarray:
+    """Column chunks in sheet order as one array of the narrowest type they all fit"""
+    dtypes = {chunk.dtype for chunk in chunks}
+    if dtypes <= {np.dtype(np.int64), np.dtype(np.float64)}:
+        return np.concatenate(chunks)
+    if dtypes == {np.dtype(bool)}:
+        return np.concatenate(chunks)
+    merged = np.empty(sum(len(chunk) for chunk in chunks), dtype=object)
+    merged[:] = [cell for chunk in chunks for cell in _untyped(chunk)]
+    return merged
+
+
+def _frame(parts) -> "pd.DataFrame":
+    """
+    The frame read_excel builds from the workers' chunks: rows laid out the way
+    OpenpyxlReader.get_sheet_data does, then TextParser(header=0) semantics.
+    """
+    import pandas as pd
+    from pandas.io.parsers import TextParser
+
+    header = parts[0][0] if parts else None
+    numbers = np.concatenate([part[1] for part in parts]) if parts else np.zeros(0, dtype=np.int64)
+    widths = np.concatenate([part[2] for part in parts]) if parts else np.zeros(0, dtype=np.int64)
+
+    # A row lands at position number - 1; rows numbered at or below one already placed are dropped
+    placed = np.maximum.accumulate(np.concatenate(([1 if header is not None else 0], numbers)))[:-1]
+    keep = numbers > placed
+    positions = numbers - 1
+    with_data = keep & (widths > 0)
+    last = positions[with_data].max() if with_data.any() else (0 if header else -1)
+    if last < 0:
+        return pd.DataFrame()
+    rows = keep & (positions <= last)
+    header = list(header or [])
+    width = max(len(header), int(widths[rows].max(initial=0)))
+    header += [""] * (width - len(header))
+    if last == 0:
+        return TextParser([header], header=0, skip_blank_lines=False).read()
+    names = TextParser([header], header=0, skip_blank_lines=False).read().columns
+
+    # Data rows land at position - 1; gaps between them are blank rows
+    targets = positions[rows] - 1
+    dense = len(targets) == last
+    columns = []
+    for j in range(width):
+        chunks = [
+            range_columns[j] if j < len(range_columns) else np.full(len(range_numbers), np.nan)
+            for _, range_numbers, _, range_columns in parts
+        ]
+        values = _merge(chunks)[rows]
+        if not dense:
+            blank = np.nan if values.dtype.kind in "if" else ""
+            filled = np.full(last, blank, dtype=np.float64 if values.dtype.kind in "if" else object)
+            filled[targets] = values
+            values = filled
+        columns.append(values)
+
+    # Numeric columns are what TextParser would make of them; text-like ones go through it
+    text = [j for j, values in enumerate(columns) if values.dtype.kind not in "if"]
+    if text:
+        parsed = TextParser(
+            list(zip(*(_untyped(columns[j]) for j in text))), header=None, skip_blank_lines=False,
+        ).read()
+        for k, j in enumerate(text):
+            columns[j] = parsed[k]
+    frame = pd.DataFrame(dict(enumerate(columns)))
+    frame.columns = names
+    return frame
+
+
+def read_sheet(file_path: Path, sheet_name=0, workers: int = None):
+    """Same frame as pd.read_excel(file_path, sheet_name, engine="openpyxl"), parsed on `workers` processes"""
+    file_path = Path(file_path)
+    workers = workers or parallel_workers()
+    tmp_dir = Path(tempfile.mkdtemp(prefix="goswift_sheet_"))
+    try:
+        xml_path = tmp_dir / "sheet.xml"
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open(sheet_member(archive, sheet_name)) as src, open(xml_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 22)
+        if xml_path.stat().st_size == 0:
+            raise SequentialOnly("empty sheet XML")
+        with open(xml_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            head, tail, ranges = split_rows(data, workers * RANGES_PER_WORKER)
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, max(1, len(ranges))),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(str(file_path),),
+        ) as pool:
+            futures = [
+                pool.submit(_parse_range, str(xml_path), head, tail, start, end, i == 0)
+                for i, (start, end) in enumerate(ranges)
+            ]
+            parts = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return _frame(parts)
+
+
+def try_read_sheet(file_path: Path, sheet_name=0):
+    """read_sheet, or None (after a warning) when the normal engines should read it"""
+    try:
+        return read_sheet(file_path, sheet_name)
+    except Exception as e:
+        print(f"⚠️  Parallel sheet parse not used for {Path(file_path).name}: {e}")
+        return None
@@ -0,0 +1,184 @@
+# =====================================================
+# PINCODE REFERENCE
+# =====================================================
+# Two lookups keyed by the destination pincode, both compiled once
+# into sorted numpy arrays so a whole batch is resolved with one
+# searchsorted call:
+#
+#   PincodeReference  local pincode -> city / state table (e.g. the
+#                     India Post directory), used to cross-check the
+#                     location master's customer_city / customer_state
+#   ServiceRules      pincode ranges from config.json -> service_type
+#                     and zone; pincodes outside every range get the
+#                     default (SURFACE)
+#
+#   "pincode_reference": {"path": "data/pincode_reference/pincodes.csv"},
+#   "service_rules": {
+#       "default": {"service_type": "SURFACE", "zone": ""},
+#       "ranges": [{"from": 110001, "to": 110097, "service_type": "EXPRESS", "zone": "NCR"}]
+#   }
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.loaders.base_loader import BaseLoader, PROJECT_ROOT
+from src.loaders.key_index import normalize_keys
+from src.utils.config import get_setting
+
+DEFAULT_REFERENCE_PATH = PROJECT_ROOT / "data" / "pincode_reference" / "pincodes.csv"
+DEFAULT_SERVICE = {"service_type": "SURFACE", "zone": ""}
+
+# Column names accepted for each field (after BaseLoader's normalization)
+COLUMN_ALIASES = {
+    "pincode": ["pincode", "pin_code", "pin"],
+    "city": ["city", "district", "districtname", "district_name"],
+    "state": ["state", "statename", "state_name"],
+}
+
+# (pincode, name id) pairs are packed into one int64: pincode * PAIR_BASE + id
+PAIR_BASE = 1 << 24
+
+
+def to_pincodes(values) -> np.ndarray:
+    """Pincodes as int64; anything that is not a 6-digit pincode becomes -1"""
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    numbers = numbers.where((numbers >= 100000) & (numbers <= 999999) & (numbers % 1 == 0))
+    return numbers.fillna(-1).to_numpy(dtype=np.int64)
+
+
+def _members(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """keys found in sorted_keys, in one searchsorted pass"""
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    idx = np.searchsorted(sorted_keys, keys)
+    return sorted_keys[np.minimum(idx, len(sorted_keys) - 1)] == keys
+
+
+# =====================================================
+# REFERENCE TABLE
+# =====================================================
+class PincodeReference:
+    def __init__(self, file_path: Path):
+        self.file_path = Path(file_path)
+        self.is_loaded = False
+        self.pincodes = np.array([], dtype=np.int64)
+        self._city_ids: Dict[str, int] = {}
+        self._state_ids: Dict[str, int] = {}
+        self._city_pairs = np.array([], dtype=np.int64)
+        self._state_pairs = np.array([], dtype=np.int64)
+
+    def load(self) -> bool:
+        if not self.file_path.exists():
+            print(f"⚠️  Pincode reference not found: {self.file_path}")
+            return False
+        df = BaseLoader(self.file_path).load()
+        columns = {}
+        for field, names in COLUMN_ALIASES.items():
+            found = next((name for name in names if name in df.columns), None)
+            if found is None:
+                raise ValueError(f"Pincode reference has no {field} column (one of {', '.join(names)})")
+            columns[field] = df[found]
+
+        pincodes = to_pincodes(columns["pincode"])
+        valid = pincodes >= 0
+        self._build(pincodes[valid], normalize_keys(columns["city"][valid]), normalize_keys(columns["state"][valid]))
+        self.is_loaded = True
+        print(f"✅ Loaded {len(self.pincodes)} pincodes from {self.file_path.name}")
+        return True
+
+    def _build(self, pincodes: np.ndarray, cities: pd.Series, states: pd.Series):
+        """Sorted unique pincodes and sorted (pincode, city) / (pincode, state) keys"""
+        self.pincodes = np.unique(pincodes)
+        city_codes, city_names = pd.factorize(cities)
+        state_codes, state_names = pd.factorize(states)
+        self._city_ids = {name: i for i, name in enumerate(city_names) if name}
+        self._state_ids = {name: i for i, name in enumerate(state_names) if name}
+        self._city_pairs = np.unique(pincodes * PAIR_BASE + city_codes)
+        self._state_pairs = np.unique(pincodes * PAIR_BASE + state_codes)
+
+    def __len__(self):
+        return len(self.pincodes)
+
+    def validate(self, pincodes, cities, states) -> Dict[str, np.ndarray]:
+        """
+        Boolean arrays for a batch: "valid" (looks like a pincode), "known" (in the
+        reference), "city" and "state" (the name is one the reference has for
+        that pincode). City / state are only checked for known pincodes.
+        """
+        codes = to_pincodes(pincodes)
+        known = _members(self.pincodes, codes)
+        result = {"valid": codes >= 0, "known": known}
+        for field, values, ids, pairs in (
+            ("city", cities, self._city_ids, self._city_pairs),
+            ("state", states, self._state_ids, self._state_pairs),
+        ):
+            name_ids = normalize_keys(pd.Series(values, dtype=object)).map(ids).fillna(-1).to_numpy(dtype=np.int64)
+            matches = (name_ids >= 0) & _members(pairs, codes * PAIR_BASE + name_ids)
+            result[field] = matches | ~known
+        return result
+
+
+_shared: Dict[Path, Tuple[float, PincodeReference]] = {}
+
+
+def shared_reference() -> Optional[PincodeReference]:
+    """The configured reference table, reloaded only when the file changes; None if there is none"""
+    settings = get_setting("pincode_reference", {}) or {}
+    path = Path(settings.get("path") or DEFAULT_REFERENCE_PATH)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    if not path.exists():
+        return None
+    mtime = path.stat().st_mtime
+    cached = _shared.get(path)
+    if cached is None or cached[0] != mtime:
+        reference = PincodeReference(path)
+        reference.load()
+        cached = _shared[path] = (mtime, reference)
+    return cached[1]
+
+
+# =====================================================
+# SERVICE RULES
+# =====================================================
+class ServiceRules:
+    def __init__(self, ranges=(), default: dict = None):
+        default = {**DEFAULT_SERVICE, **(default or {})}
+        self.default_service_type = default["service_type"]
+        self.default_zone = default["zone"]
+
+        ranges = sorted(ranges, key=lambda rule: int(rule["from"]))
+        for previous, rule in zip(ranges, ranges[1:]):
+            if int(rule["from"]) <= int(previous["to"]):
+                raise ValueError(
+                    f"Service rule {rule['from']}-{rule['to']} overlaps {previous['from']}-{previous['to']}"
+                )
+        for rule in ranges:
+            if int(rule["from"]) > int(rule["to"]):
+                raise ValueError(f"Service rule {rule['from']}-{rule['to']} ends before it starts")
+        self.starts = np.array([int(rule["from"]) for rule in ranges], dtype=np.int64)
+        self.ends = np.array([int(rule["to"]) for rule in ranges], dtype=np.int64)
+        self.service_types = np.array(
+            [rule.get("service_type", self.default_service_type) for rule in ranges] + [self.default_service_type],
+            dtype=object,
+        )
+        self.zones = np.array([rule.get("zone", self.default_zone) for rule in ranges] + [self.default_zone], dtype=object)
+
+    @classmethod
+    def from_config(cls) -> "ServiceRules":
+        settings = get_setting("service_rules", {}) or {}
+        return cls(settings.get("ranges") or [], settings.get("default"))
+
+    def assign(self, pincodes) -> Tuple[np.ndarray, np.ndarray]:
+        """(service_type, zone) per pincode; one searchsorted over the range starts"""
+        codes = to_pincodes(pincodes)
+        # Last range starting at or below the pincode, then check it has not ended
+        rule = np.searchsorted(self.starts, codes, side="right") - 1
+        inside = rule >= 0
+        inside[inside] = codes[inside] <= self.ends[rule[inside]]
+        # Outside every range -> the extra default entry at the end
+        rule = np.where(inside, rule, len(self.starts))
+        return self.service_types[rule], self.zones[rule]
@@ -0,0 +1,58 @@
+# =====================================================
+# PO SEARCH INDEX
+# =====================================================
+# Two sorted arrays built once per load: the PO numbers and the
+# same PO numbers reversed. A prefix query is a bisect into the
+# first, a suffix query (e.g. the tail of a Flipkart FBSWN... PO)
+# is a bisect into the second. Each query is O(log n + limit),
+# well under a millisecond even with a million POs loaded.
+
+from bisect import bisect_left
+from typing import Iterable, List
+
+from src.utils.order_intake import normalize_order_number
+
+
+class POSearchIndex:
+    def __init__(self, order_numbers: Iterable[str]):
+        unique = set(order_numbers)
+        self._forward = sorted(unique)
+        self._reversed = sorted(po[::-1] for po in unique)
+
+    def __len__(self):
+        return len(self._forward)
+
+    @staticmethod
+    def _scan(keys: List[str], needle: str, limit: int) -> List[str]:
+        matches = []
+        i = bisect_left(keys, needle)
+        while i < len(keys) and len(matches) < limit and keys[i].startswith(needle):
+            matches.append(keys[i])
+            i += 1
+        return matches
+
+    def prefix(self, query: str, limit: int = 10) -> List[str]:
+        """POs starting with `query`"""
+        needle = normalize_order_number(query)
+        if not needle:
+            return []
+        return self._scan(self._forward, needle, limit)
+
+    def suffix(self, query: str, limit: int = 10) -> List[str]:
+        """POs ending with `query`"""
+        needle = normalize_order_number(query)
+        if not needle:
+            return []
+        return [po[::-1] for po in self._scan(self._reversed, needle[::-1], limit)]
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Prefix matches first, then suffix matches, without repeats"""
+        matches = self.prefix(query, limit)
+        if len(matches) < limit:
+            seen = set(matches)
+            for po in self.suffix(query, limit):
+                if po not in seen:
+                    matches.append(po)
+                    if len(matches) == limit:
+                        break
+        return matches
@@ -0,0 +1,261 @@
+# =====================================================
+# POLARS BACKEND
+# =====================================================
+# Optional second dataframe backend for the loaders and the batch
+# build, chosen in config.json:
+#
+#   "dataframe_backend": "pandas"    (default) or "polars"
+#
+# When polars is not installed the pandas path is used.
+#
+# Cells are still parsed by BaseLoader (calamine / parallel sheets):
+# the export depends on each cell's own type (a numeric 2.5 box is
+# 2 boxes, the text "2.5" is invalid), and polars' readers coerce a
+# mixed column to one type. `scan` takes those typed cells into a
+# LazyFrame once; the cleaning after it is polars expressions
+# (multi-threaded, one collect), and `build_records` resolves a batch
+# with joins instead of one dict lookup per order.
+
+import contextlib
+import importlib.util
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.config import get_setting
+
+BACKENDS = ("pandas", "polars")
+# Suffix of the column holding the value of numeric cells (see scan)
+NUMBER = "__number"
+
+_warned = False
+# Set by `backend()`; takes precedence over config.json
+_forced: Optional[str] = None
+
+
+def polars_available() -> bool:
+    return importlib.util.find_spec("polars") is not None
+
+
+def use_polars() -> bool:
+    """True when config.json asks for polars and it is installed"""
+    global _warned
+    backend = _forced or get_setting("dataframe_backend", "pandas") or "pandas"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown dataframe backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    if backend == "pandas":
+        return False
+    if polars_available():
+        return True
+    if not _warned:
+        print("⚠️  dataframe_backend is 'polars' but polars is not installed - using pandas")
+        _warned = True
+    return False
+
+
+@contextlib.contextmanager
+def backend(name: str):
+    """Load with the given backend inside the block, whatever config.json says"""
+    global _forced
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown dataframe backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    previous, _forced = _forced, name
+    try:
+        yield
+    finally:
+        _forced = previous
+
+
+# =====================================================
+# TYPED CELLS -> LAZYFRAME
+# =====================================================
+def _distinct(series: pd.Series):
+    """Codes into the distinct cells of a column; blanks point one past the end (null)"""
+    codes, cells = pd.factorize(series.to_numpy(dtype=object))
+    codes[codes < 0] = len(cells)
+    return codes, cells
+
+
+def _text(pl, codes, cells):
+    """str(value) per cell, blanks stay null - converted once per distinct cell"""
+    return pl.Series([str(v) for v in cells] + [None], dtype=pl.String).gather(codes)
+
+
+def _numbers(pl, codes, cells):
+    """Value of the cells that hold a number, null for text / dates / blanks"""
+    values = [float(v) if isinstance(v, (int, float, np.number)) else None for v in cells]
+    return pl.Series(values + [None], dtype=pl.Float64).gather(codes)
+
+
+def scan(df: pd.DataFrame, numbers: Iterable[str] = (), dates: Iterable[str] = ()):
+    """
+    LazyFrame over typed cells: every column as text (str of the cell, null when
+    blank), plus `<col>__number` for the columns in `numbers`. `dates` columns go
+    through pd.to_datetime, whose format guessing is part of what the export
+    means by a date.
+    """
+    import polars as pl
+
+    numbers, dates = set(numbers), set(dates)
+    columns = []
+    for col in df.columns:
+        if col in dates:
+            parsed = pd.to_datetime(df[col], errors="coerce").reset_index(drop=True)
+            columns.append(pl.from_pandas(parsed).alias(col))
+            continue
+        codes, cells = _distinct(df[col])
+        columns.append(_text(pl, codes, cells).alias(col))
+        if col in numbers:
+            columns.append(_numbers(pl, codes, cells).alias(col + NUMBER))
+    return pl.DataFrame(columns).lazy()
+
+
+def _python_int(text: str):
+    try:
+        return float(int(text))
+    except ValueError:
+        return None
+
+
+def int_literals(series: pd.Series) -> Dict[str, float]:
+    """int() of each distinct text cell (None when it is not an integer literal)"""
+    texts = {v for v in series.dropna().unique() if isinstance(v, str)}
+    return {text: _python_int(text) for text in texts}
+
+
+# =====================================================
+# EXPRESSIONS
+# =====================================================
+def number(col: str):
+    """pd.to_numeric(errors="coerce"): numeric cells as they are, text parsed; NaN -> null"""
+    import polars as pl
+
+    parsed = pl.col(col).str.strip_chars().cast(pl.Float64, strict=False)
+    return pl.coalesce(pl.col(col + NUMBER), parsed).fill_nan(None)
+
+
+def integer_cells(col: str, literals: Dict[str, float]):
+    """
+    Cells int() accepts, as GoSwiftBuilder._derive applies it: numeric cells keep
+    their value (2.5 boxes is int(2.5) == 2), text must be an integer literal; null otherwise
+    """
+    import polars as pl
+
+    value = pl.col(col + NUMBER)
+    return (
+        pl.when(value.is_not_null())
+        .then(pl.when(value.is_finite()).then(value))
+        .otherwise(pl.col(col).replace_strict(literals, default=None, return_dtype=pl.Float64))
+    )
+
+
+def stripped(col: str):
+    import polars as pl
+
+    return pl.col(col).str.strip_chars()
+
+
+# =====================================================
+# JOIN-BASED BATCH BUILD
+# =====================================================
+def build_records(builder, order_numbers: List[str]) -> Tuple[List[tuple], List[Tuple[str, Exception]]]:
+    """
+    GoSwiftBuilder.build_records over the polars frame of the master: one join
+    for the orders, one per distinct (location, marketplace) pair, derived
+    columns as expressions. Same rows, order and failures as the row path.
+    """
+    import polars as pl
+
+    from src.engine.box_rules import DIMENSION_COLUMNS
+    from src.engine.row_projector import safe
+    from src.models.goswift_schema import GOSWIFT_SCHEMA, STATIC, ORDER, LOCATION, MARKETPLACE
+
+    from src.loaders.master_orders_loader import KEY
+    from src.utils.order_intake import normalize_order_number
+
+    master = builder.master_orders
+    keys = [normalize_order_number(po) for po in order_numbers]
+    requested = pl.DataFrame({KEY: keys}, schema={KEY: pl.String})
+    batch = requested.join(master.orders_pl, on=KEY, how="left", maintain_order="left")
+    # total_weight_gms is never null in the master, so null means the PO was not joined
+    found = batch["total_weight_gms"].is_not_null().to_list()
+
+    # Each (location, marketplace) pair is resolved once, in the order the row path meets them
+    pairs = (
+        batch.filter(pl.col("total_weight_gms").is_not_null())
+        .select("location", "marketplaces")
+        .unique(maintain_order=True)
+    )
+    resolved = []
+    for location, marketplace in pairs.iter_rows():
+        try:
+            if not builder.location_master.exists(location):
+                raise KeyError(f"Location '{location}' not found in location master")
+            if not builder.marketplace_mapping.exists(marketplace):
+                raise KeyError(f"Marketplace '{marketplace}' not found in marketplace mapping")
+            resolved.append((
+                builder.location_master.get_location(location, marketplace),
+                builder.marketplace_mapping.get_mapping(marketplace),
+                None,
+            ))
+        except Exception as e:
+            resolved.append((None, None, e))
+    batch = batch.join(
+        pairs.with_row_index("_pair"), on=["location", "marketplaces"], how="left", nulls_equal=True, maintain_order="left"
+    )
+
+    derived = batch.select(
+        pl.col("box").cast(pl.Int64).alias("number_of_boxes"),
+        pl.col("invoice_value").alias("order_invoice_amount"),
+        pl.col("total_weight_gms"),
+        pl.col("exp_date").dt.strftime("%d-%m-%Y").alias("purchase_order_expiry_date"),
+        pl.when(pl.col("ewb").is_in(["0", "nan", ""])).then(pl.lit("")).otherwise(pl.col("ewb")).alias("ewaybill_number"),
+        (pl.col("total_weight_gms") / pl.col("box").clip(lower_bound=1).fill_null(1)).alias("_per_box"),
+    )
+    dimensions = builder.box_rules.assign(
+        batch["marketplaces"].to_list(), batch["courier_name"].to_list(), derived["_per_box"].to_numpy()
+    )
+    values = {name: derived[name].to_list() for name in derived.columns}
+    # The file keeps the master's spelling of each PO
+    values["order_number"] = batch["order_number"].to_list()
+    for position, name in enumerate(DIMENSION_COLUMNS):
+        values[name] = [d[position] for d in dimensions]
+
+    # Output columns in GOSWIFT_COLUMNS order; location / marketplace values are
+    # taken from each resolved pair and spread to the orders that use it
+    pair_ids = batch["_pair"].to_list()
+    columns = []
+    for col in GOSWIFT_SCHEMA:
+        if col.source == STATIC:
+            columns.append([col.value] * len(order_numbers))
+        elif col.source == ORDER:
+            columns.append(["" if v is None else safe(v) for v in batch[col.key].to_list()])
+        elif col.source in (LOCATION, MARKETPLACE):
+            part = 0 if col.source == LOCATION else 1
+            per_pair = [safe(r[part].get(col.key)) if r[part] is not None else "" for r in resolved]
+            columns.append([per_pair[i] if i is not None else "" for i in pair_ids])
+        else:
+            columns.append(values[col.key])
+
+    records, failures = [], []
+    boxes, expiry = values["number_of_boxes"], values["purchase_order_expiry_date"]
+    for i, row in enumerate(zip(*columns)):
+        order_number = order_numbers[i]
+        if not found[i]:
+            # Missing or duplicated PO: the per-row path raises the right error
+            try:
+                records.append(tuple(builder.build_row(order_number).values()))
+            except Exception as e:
+                failures.append((order_number, e))
+            continue
+        error = resolved[pair_ids[i]][2]
+        if error is None and boxes[i] is None:
+            error = ValueError(f"Invalid box count for order {order_number}")
+        if error is None and expiry[i] is None:
+            error = ValueError(f"Invalid expiry date for order {order_number}")
+        if error is None:
+            records.append(row)
+        else:
+            failures.append((order_number, error))
+    return records, failures
@@ -0,0 +1,416 @@
+# =====================================================
+# SQLITE MASTER STORE
+# =====================================================
+# Optional persistent backend for the three data tables.
+# A workbook is parsed and cleaned once (by its loader), then
+# ingested here with an index on its key column. Later starts
+# attach to the database instead of calling pd.read_excel, and
+# lookups are indexed queries, so memory use does not grow with
+# the number of orders in the master. Every ingest is a new
+# version of the table, so engine generations stay immutable.
+#
+# Several app processes may share one store. A version in use is
+# leased in the database itself (`leases`, one row per store instance
+# and version), renewed on a heartbeat, so an ingest in one process
+# never drops a version another process is still reading. A lease not
+# renewed for LEASE_SECONDS belongs to a process that died.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.loaders.base_loader import PROJECT_ROOT
+
+STORE_PATH = PROJECT_ROOT / "data" / "master_store.sqlite3"
+
+# table -> key column used for lookups
+TABLES = {
+    "orders": "po_key",
+    "locations": "location",
+    "marketplace_mappings": "marketplace",
+}
+
+# Stay under SQLite's bound-parameter limit for IN (...) queries
+IN_BATCH_SIZE = 500
+
+# Leases are renewed this often, and expire when not renewed for LEASE_SECONDS
+LEASE_RENEW_SECONDS = 60
+LEASE_SECONDS = 10 * 60
+
+# Each ingest writes a new physical table "<table>_g<id>" registered in
+# `versions`; `current` names the newest one per table.
+META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name   TEXT NOT NULL,
+    physical     TEXT,
+    source       TEXT,
+    source_size  INTEGER,
+    source_mtime REAL,
+    row_count    INTEGER,
+    dtypes       TEXT,
+    ingested_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS current (
+    table_name TEXT PRIMARY KEY,
+    physical   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    physical   TEXT NOT NULL,
+    holder     TEXT NOT NULL,
+    pid        INTEGER,
+    renewed_at REAL NOT NULL,
+    PRIMARY KEY (physical, holder)
+);
+"""
+# Earlier stores kept one physical table per kind, replaced in place
+LEGACY_SCHEMA = "".join(f'DROP TABLE IF EXISTS "{name}";' for name in ["ingests", *TABLES])
+
+
+def _heartbeat(store_ref, stopped: threading.Event):
+    """Renew a store's leases until it is garbage collected"""
+    while not stopped.wait(LEASE_RENEW_SECONDS):
+        store = store_ref()
+        if store is None:
+            return
+        try:
+            store.renew_leases()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not renew master store leases: {e}")
+        del store
+
+
+def _end_leases(db_path: Path, holder: str, stopped: threading.Event):
+    """Store instance gone (or the process exiting): give its leases back"""
+    stopped.set()
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            with conn:
+                conn.execute("DELETE FROM leases WHERE holder = ?", (holder,))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # expires after LEASE_SECONDS
+
+
+class SQLiteMasterStore:
+    """
+    Ingested tables are never modified: a reload writes a new version and
+    loaders keep reading the version they attached to (`attach`), so older
+    engine generations and exports pinned to them still see their own rows.
+    A version is dropped only when it is no longer current and no live
+    lease holds it - in this process or any other sharing the database.
+    """
+
+    def __init__(self, db_path: Path = STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._dtypes = {}
+        self._keys: Dict[str, str] = {}
+        # physical table -> number of live loaders attached to it; each one is leased in the database
+        self._pins: Dict[str, int] = {}
+        self._pins_lock = threading.Lock()
+        self._holder = uuid.uuid4().hex
+        with self._write() as conn:
+            conn.executescript(LEGACY_SCHEMA + META_SCHEMA)
+        stopped = threading.Event()
+        weakref.finalize(self, _end_leases, self.db_path, self._holder, stopped)
+        threading.Thread(target=_heartbeat, args=(weakref.ref(self), stopped), name="store-leases", daemon=True).start()
+
+    # ============ CONNECTIONS ============
+    def _reader(self) -> sqlite3.Connection:
+        """One read connection per thread (sqlite3 connections are not shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _immediate(self):
+        """Write transaction that takes the database lock up front, so check-then-write is atomic"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    # ============ INGEST ============
+    def ingest(self, table: str, df: pd.DataFrame, source_file: Path) -> str:
+        """
+        Write the cleaned DataFrame as a new version of `table` and make it
+        current. Returns the version's physical table name (see `attach`).
+        """
+        key = TABLES[table]
+        source_file = Path(source_file)
+        stat = source_file.stat()
+        frame = df.reset_index(drop=True)
+        dtypes = {col: str(dtype) for col, dtype in frame.dtypes.items()}
+
+        with self._write() as conn:
+            version_id = conn.execute("INSERT INTO versions (table_name) VALUES (?)", (table,)).lastrowid
+        physical = f"{table}_g{version_id}"
+        try:
+            with self._write() as conn:
+                # No declared type on object columns: SQLite keeps each cell's own
+                # type (a float 2.5 box stays 2.5, TEXT affinity would make it "2.5")
+                frame.to_sql(physical, conn, index=False, dtype={
+                    col: "" for col, dtype in frame.dtypes.items() if dtype == object
+                })
+                conn.execute(f'CREATE INDEX "idx_{physical}_{key}" ON "{physical}" ("{key}")')
+                conn.execute(
+                    "UPDATE versions SET physical = ?, source = ?, source_size = ?, source_mtime = ?, "
+                    "row_count = ?, dtypes = ?, ingested_at = ? WHERE id = ?",
+                    (
+                        physical,
+                        str(source_file.resolve()),
+                        stat.st_size,
+                        stat.st_mtime,
+                        len(frame),
+                        json.dumps(dtypes),
+                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        version_id,
+                    ),
+                )
+                conn.execute("INSERT OR REPLACE INTO current VALUES (?, ?)", (table, physical))
+        except Exception:
+            with self._write() as conn:
+                conn.execute(f'DROP TABLE IF EXISTS "{physical}"')
+                conn.execute("DELETE FROM versions WHERE id = ?", (version_id,))
+            raise
+        self._dtypes[physical] = dtypes
+        print(f"✅ Ingested {len(frame)} rows into {self.db_path.name}:{physical}")
+        self.collect()
+        return physical
+
+    # ============ VERSIONS ============
+    def current_version(self, table: str) -> Optional[str]:
+        row = self._reader().execute("SELECT physical FROM current WHERE table_name = ?", (table,)).fetchone()
+        return row["physical"] if row else None
+
+    def find_version(self, table: str, source_file: Path) -> Optional[str]:
+        """
+        A version of `table` ingested from exactly this (unchanged) file -
+        the current one when it matches - or None.
+        """
+        source_file = Path(source_file)
+        if not source_file.exists():
+            return None
+        stat = source_file.stat()
+        rows = self._reader().execute(
+            "SELECT physical FROM versions WHERE table_name = ? AND physical IS NOT NULL "
+            "AND source = ? AND source_size = ? AND source_mtime = ? ORDER BY id DESC",
+            (table, str(source_file.resolve()), stat.st_size, stat.st_mtime),
+        ).fetchall()
+        matches = [r["physical"] for r in rows]
+        if not matches:
+            return None
+        current = self.current_version(table)
+        return current if current in matches else matches[0]
+
+    def attach(self, table: str, owner, version: str = None) -> str:
+        """
+        Pin a version of `table` (the current one by default) for as long as
+        `owner` is alive, and return its physical name for the lookups below.
+        """
+        physical = version or self.current_version(table)
+        if physical is None:
+            raise KeyError(f"Nothing ingested into {self.db_path.name}:{table}")
+        # Counted before the lease is written, so a heartbeat in between keeps it
+        with self._pins_lock:
+            self._pins[physical] = self._pins.get(physical, 0) + 1
+        try:
+            with self._immediate() as conn:
+                if conn.execute("SELECT 1 FROM versions WHERE physical = ?", (physical,)).fetchone() is None:
+                    raise KeyError(f"Version {physical} is not in {self.db_path.name}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?)",
+                    (physical, self._holder, os.getpid(), time.time()),
+                )
+        except BaseException:
+            self._release(physical)
+            raise
+        weakref.finalize(owner, self._release, physical)
+        return physical
+
+    def _release(self, physical: str):
+        # Runs from garbage collection: only count here, the lease goes at the next renewal
+        with self._pins_lock:
+            self._pins[physical] -= 1
+            if not self._pins[physical]:
+                del self._pins[physical]
+
+    def _sync_leases(self, conn: sqlite3.Connection, now: float):
+        """This store's leases become exactly the versions its loaders hold, renewed to `now`"""
+        with self._pins_lock:
+            pinned = sorted(self._pins)
+        conn.execute(
+            "DELETE FROM leases WHERE holder = ? AND physical NOT IN (SELECT value FROM json_each(?))",
+            (self._holder, json.dumps(pinned)),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?)",
+            [(physical, self._holder, os.getpid(), now) for physical in pinned],
+        )
+
+    def renew_leases(self):
+        """Heartbeat: keep this store's leases alive (and drop the ones no loader holds now)"""
+        with self._immediate() as conn:
+            self._sync_leases(conn, time.time())
+
+    def collect(self) -> List[str]:
+        """Drop the versions that are neither current nor leased by a live loader in any process"""
+        now = time.time()
+        with self._immediate() as conn:
+            self._sync_leases(conn, now)
+            conn.execute("DELETE FROM leases WHERE renewed_at < ?", (now - LEASE_SECONDS,))
+            leased = {r[0] for r in conn.execute("SELECT physical FROM leases")}
+            current = {r[0] for r in conn.execute("SELECT physical FROM current")}
+            stale = [
+                r[0] for r in conn.execute("SELECT physical FROM versions WHERE physical IS NOT NULL")
+                if r[0] not in current and r[0] not in leased
+            ]
+            for physical in stale:
+                conn.execute(f'DROP TABLE IF EXISTS "{physical}"')
+                conn.execute("DELETE FROM versions WHERE physical = ?", (physical,))
+        for physical in stale:
+            self._dtypes.pop(physical, None)
+            self._keys.pop(physical, None)
+        return stale
+
+    def _version_info(self, physical: str) -> Optional[sqlite3.Row]:
+        return self._reader().execute(
+            "SELECT * FROM versions WHERE physical = ?", (physical,)
+        ).fetchone()
+
+    def _resolve(self, table: str) -> Tuple[str, str]:
+        """(physical table, key column) for a version name, or the current version of a table"""
+        if table in TABLES:
+            physical = self.current_version(table)
+            if physical is None:
+                raise KeyError(f"Nothing ingested into {self.db_path.name}:{table}")
+            return physical, TABLES[table]
+        key = self._keys.get(table)
+        if key is None:
+            info = self._version_info(table)
+            if info is None:
+                raise KeyError(f"Version {table} is not in {self.db_path.name}")
+            # Versions never change, so the key column can be cached
+            key = self._keys[table] = TABLES[info["table_name"]]
+        return table, key
+
+    # ============ LOOKUPS ============
+    # `table` is a version returned by attach() (or a table name for its current version)
+    def count(self, table: str) -> int:
+        if table in TABLES:
+            table = self.current_version(table)
+        info = self._version_info(table) if table else None
+        return info["row_count"] if info else 0
+
+    def keys(self, table: str) -> List[str]:
+        physical, key = self._resolve(table)
+        return [r[0] for r in self._reader().execute(f'SELECT "{key}" FROM "{physical}"')]
+
+    def duplicate_keys(self, table: str) -> set:
+        """Keys that appear on more than one row"""
+        physical, key = self._resolve(table)
+        rows = self._reader().execute(
+            f'SELECT "{key}" FROM "{physical}" GROUP BY "{key}" HAVING COUNT(*) > 1'
+        )
+        return {r[0] for r in rows}
+
+    def exists(self, table: str, value) -> bool:
+        physical, key = self._resolve(table)
+        row = self._reader().execute(
+            f'SELECT 1 FROM "{physical}" WHERE "{key}" = ? LIMIT 1', (value,)
+        ).fetchone()
+        return row is not None
+
+    def get(self, table: str, value) -> dict:
+        """First row with this key, as a dict with the loader's original types"""
+        physical, key = self._resolve(table)
+        row = self._reader().execute(
+            f'SELECT * FROM "{physical}" WHERE "{key}" = ? ORDER BY rowid LIMIT 1', (value,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(value)
+        return self._restore(physical, dict(row))
+
+    def get_many(self, table: str, values: Iterable) -> Dict[str, dict]:
+        """key -> row for every key found, using batched IN queries"""
+        physical, key = self._resolve(table)
+        values = list(dict.fromkeys(values))
+        found = {}
+        for i in range(0, len(values), IN_BATCH_SIZE):
+            chunk = values[i:i + IN_BATCH_SIZE]
+            marks = ",".join("?" * len(chunk))
+            rows = self._reader().execute(
+                f'SELECT * FROM "{physical}" WHERE "{key}" IN ({marks}) ORDER BY rowid', chunk
+            )
+            for row in rows:
+                found.setdefault(row[key], self._restore(physical, dict(row)))
+        return found
+
+    def read_frame(self, table: str) -> pd.DataFrame:
+        """Whole table as a DataFrame (for features that need every row)"""
+        physical, key = self._resolve(table)
+        df = pd.read_sql_query(f'SELECT * FROM "{physical}"', self._reader())
+        for col, dtype in self._table_dtypes(physical).items():
+            if dtype.startswith("datetime64") and col in df:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        return df.set_index(key, drop=False)
+
+    def read_columns(self, table: str, columns: List[str]) -> pd.DataFrame:
+        """Only some columns of every row (e.g. to build indexes without loading whole rows)"""
+        physical, _ = self._resolve(table)
+        names = ", ".join(f'"{col}"' for col in columns)
+        df = pd.read_sql_query(f'SELECT {names} FROM "{physical}"', self._reader())
+        for col, dtype in self._table_dtypes(physical).items():
+            if dtype.startswith("datetime64") and col in df:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        return df
+
+    # ============ TYPES ============
+    def _table_dtypes(self, physical: str) -> dict:
+        if physical not in self._dtypes:
+            row = self._version_info(physical)
+            self._dtypes[physical] = json.loads(row["dtypes"]) if row else {}
+        return self._dtypes[physical]
+
+    def _restore(self, physical: str, record: dict) -> dict:
+        """SQLite has no datetime or NaN: bring them back as pandas would give them"""
+        for col, dtype in self._table_dtypes(physical).items():
+            value = record.get(col)
+            if dtype.startswith("datetime64"):
+                record[col] = pd.NaT if value is None else pd.Timestamp(value)
+            elif dtype.startswith("float") and value is None:
+                record[col] = float("nan")
+        return record
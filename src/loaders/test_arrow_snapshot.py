@@ -0,0 +1,60 @@
+# Arrow snapshots keep the type of every cell in mixed Excel columns.
+#
+#   python -m pytest src/loaders/test_arrow_snapshot.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.loaders import arrow_snapshot
+
+
+def test_mixed_cells_round_trip(tmp_path):
+    cells = [2, 2.5, "2.5", None, pd.Timestamp("2026-01-05"), 321456789012, True]
+    df = pd.DataFrame({"po": [f"PO{i}" for i in range(len(cells))], "box": pd.Series(cells, dtype=object)})
+
+    snapshot = arrow_snapshot.publish(df, tmp_path / "orders.arrow")
+    attached = arrow_snapshot.attach(snapshot, index_col="po")
+
+    assert list(attached.columns) == ["po", "box"]
+    restored = attached["box"].tolist()
+    assert [type(v) for v in restored[:3]] == [int, float, str]
+    assert restored[:3] == [2, 2.5, "2.5"] and pd.isna(restored[3])
+    assert restored[4:] == [pd.Timestamp("2026-01-05"), 321456789012, True]
+
+
+def test_single_kind_columns_are_untouched():
+    frame, mixed = arrow_snapshot.split_mixed(pd.DataFrame({"a": pd.Series(["x", None], dtype=object), "b": [1.5, 2]}))
+    assert mixed == {} and list(frame.columns) == ["a", "b"]
+
+
+def test_text_columns_stay_arrow_backed(tmp_path):
+    df = pd.DataFrame({"po": ["PO1", "PO2", None], "courier": ["Ekart", None, "Delhivery"], "box": [1, 2, 3]})
+    attached = arrow_snapshot.attach(arrow_snapshot.publish(df, tmp_path / "orders.arrow"), index_col="box")
+    for col in ("po", "courier"):
+        assert attached[col].dtype == pd.StringDtype("pyarrow", na_value=np.nan)
+    assert attached["po"].tolist()[:2] == ["PO1", "PO2"] and pd.isna(attached["po"].iloc[2])
+
+
+def test_replaced_source_with_preserved_mtime_is_stale(tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"first master")
+    snapshot = arrow_snapshot.publish(pd.DataFrame({"po": ["PO1"]}), tmp_path / "orders.arrow", source)
+    assert arrow_snapshot.is_fresh(snapshot, source)
+
+    # cp -p / rsync / unzip: new contents, old timestamp
+    stat = source.stat()
+    source.write_bytes(b"a replaced, longer master")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert not arrow_snapshot.is_fresh(snapshot, source)
+
+    other = tmp_path / "other.xlsx"
+    other.write_bytes(b"first master")
+    os.utime(other, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert not arrow_snapshot.is_fresh(snapshot, other)
+    # Snapshots without a source stamp are never trusted
+    assert not arrow_snapshot.is_fresh(arrow_snapshot.publish(pd.DataFrame({"po": ["PO1"]}), tmp_path / "bare.arrow"), other)
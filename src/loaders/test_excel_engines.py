@@ -0,0 +1,97 @@
+# Every installed Excel engine must give BaseLoader the same frame.
+#
+#   python -m pytest src/loaders/test_excel_engines.py
+
+import shutil
+import zipfile
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.loaders.base_loader import (
+    EXCEL_ENGINES, BaseLoader, available_engines, engine_chain, readable_suffixes, sniff_excel_suffix,
+)
+
+HEADER = ["Marketplaces", "PO", "Invoice Value", "Weight", "Box", "EWB", "Exp Date", "Mixed Date"]
+ROWS = [
+    ["Amazon", "FBSWN07404651", "₹1,234.50", 1.25, 2, 0, date(2026, 1, 5), date(2026, 1, 5)],
+    ["Flipkart", 12345, "00123", 2, None, 123456789012, datetime(2026, 2, 5, 10, 30), "31-01-2026"],
+    ["Myntra", "CPDPO219563", 5000, 0.5, "", None, None, None],
+]
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path_factory.mktemp("engines") / "sample.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "OnlineB2B"
+    ws.append(HEADER)
+    for row in ROWS:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _load(path, engine):
+    return BaseLoader(path, sheet_name="OnlineB2B", engine=engine).load()
+
+
+def test_engines_produce_identical_frames(workbook):
+    engines = available_engines(".xlsx")
+    if len(engines) < 2:
+        pytest.skip(f"only {engines} installed - nothing to compare")
+    reference = _load(workbook, "openpyxl")
+    for engine in engines:
+        assert_frame_equal(_load(workbook, engine), reference, check_exact=True)
+
+
+def test_dates_and_numeric_strings_survive(workbook):
+    for engine in available_engines(".xlsx"):
+        df = _load(workbook, engine)
+        assert pd.api.types.is_datetime64_any_dtype(df["exp_date"])
+        assert df.loc[0, "mixed_date"] == pd.Timestamp(2026, 1, 5)
+        assert isinstance(df.loc[0, "mixed_date"], pd.Timestamp)
+        assert df.loc[1, "mixed_date"] == "31-01-2026"
+        assert df.loc[1, "invoice_value"] == "00123"
+        assert df.loc[0, "invoice_value"] == "₹1,234.50"
+        assert df.loc[1, "ewb"] == 123456789012
+
+
+def test_requested_engine_goes_first_and_unknown_is_rejected(workbook):
+    assert engine_chain(workbook, "openpyxl")[0] == "openpyxl"
+    with pytest.raises(ValueError):
+        engine_chain(workbook, "no-such-engine")
+
+
+def test_file_type_comes_from_the_content(workbook, tmp_path):
+    # An .xlsx saved as .xls (common for ERP exports) still gets .xlsx engines
+    mislabelled = tmp_path / "report.xls"
+    shutil.copyfile(workbook, mislabelled)
+    assert sniff_excel_suffix(mislabelled) == ".xlsx"
+    assert engine_chain(mislabelled) == available_engines(".xlsx")
+    assert_frame_equal(_load(mislabelled, None), _load(workbook, None))
+
+    ole = tmp_path / "old.xlsx"
+    ole.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 512)
+    assert sniff_excel_suffix(ole) == ".xls"
+
+    ods = tmp_path / "sheet.xlsx"
+    with zipfile.ZipFile(ods, "w") as zf:
+        zf.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+    assert sniff_excel_suffix(ods) == ".ods"
+
+    text = tmp_path / "notes.xlsx"
+    text.write_text("not a workbook")
+    assert sniff_excel_suffix(text) is None
+    assert sniff_excel_suffix(tmp_path / "missing.xlsx") is None
+
+
+def test_readable_suffixes_follow_installed_engines():
+    readable = readable_suffixes()
+    assert set(readable) <= set().union(*(suffixes for _, suffixes in EXCEL_ENGINES.values()))
+    assert all(available_engines(suffix) for suffix in readable)
+    assert ".xlsx" in readable
@@ -0,0 +1,85 @@
+# Bulk selection by marketplace / location / courier / expiry date.
+#
+#   python -m pytest src/loaders/test_order_selection_index.py
+
+import contextlib
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.engine import correctness_harness as harness
+from src.loaders.key_index import normalize_keys
+from src.loaders.order_selection_index import OrderSelectionIndex
+
+
+@pytest.fixture
+def index():
+    return OrderSelectionIndex(pd.DataFrame({
+        "po_key": ["PO1", "PO2", "PO3", "PO4", "PO5"],
+        "marketplaces": ["Amazon", " AMAZON", "Flipkart", "Amazon", None],
+        "location": ["BLR1", "BLR1", "BLR1", "DEL–2", "BLR1"],
+        "courier_name": ["Delhivery", "Ekart", "Delhivery", None, "Ekart"],
+        "exp_date": pd.to_datetime(["2026-01-05 18:30", "2026-01-12 00:00", "2026-01-06 00:00", None, "2026-01-11 09:00"]),
+    }))
+
+
+def test_fields_intersect(index):
+    assert index.select(marketplace="amazon", location="blr1") == ["PO1", "PO2"]
+    assert index.select(marketplace=["Amazon", "Flipkart"], courier="DELHIVERY") == ["PO1", "PO3"]
+    assert index.select(location="DEL-2") == ["PO4"]
+    assert index.select(marketplace="Myntra") == []
+    assert index.select() == ["PO1", "PO2", "PO3", "PO4", "PO5"]
+
+
+def test_expiry_range_is_inclusive_by_day(index):
+    assert index.select(expires_from=date(2026, 1, 5), expires_to=date(2026, 1, 11)) == ["PO1", "PO3", "PO5"]
+    assert index.select(marketplace="Amazon", expires_from=date(2026, 1, 6)) == ["PO2"]
+    assert index.select(expires_to=date(2026, 1, 5)) == ["PO1"]
+
+
+def test_pick_lists(index):
+    assert index.values("marketplace") == ["Amazon", "Flipkart"]
+    assert index.values("courier") == ["Delhivery", "Ekart"]
+    assert index.count("location", "blr1") == 4
+
+
+def test_empty_list_matches_nothing(index):
+    assert index.select(marketplace=[]) == []
+    assert index.select(marketplace=[], location="BLR1") == []
+    assert index.select(courier=iter(["Ekart"])) == ["PO2", "PO5"]
+
+
+def test_aliases_fold_into_their_canonical_value():
+    index = OrderSelectionIndex(pd.DataFrame({
+        "po_key": ["PO1", "PO2", "PO3"],
+        "marketplaces": ["AMZ", "amazon", "Flipkart"],
+        "location": ["BLR–1", "Bangalore 1", "BLR1"],
+        "courier_name": ["Ekart", "Ekart", "Ekart"],
+        "exp_date": pd.to_datetime(["2026-01-05", "2026-01-06", "2026-01-07"]),
+    }), aliases={"marketplace": {"AMZ": "Amazon"}, "location": {"Bangalore 1": "BLR-1"}})
+    assert index.values("marketplace") == ["Amazon", "Flipkart"]
+    assert index.values("location") == ["BLR-1", "BLR1"]
+    assert index.select(marketplace="Amazon") == index.select(marketplace="amz") == ["PO1", "PO2"]
+    assert index.select(location="bangalore 1") == ["PO1", "PO2"]
+    assert index.count("marketplace", "AMZ") == 2
+
+
+@pytest.mark.parametrize("loader_path", ["excel", "sqlite"])
+def test_loader_selection_matches_a_scan(loader_path, tmp_path):
+    pytest.importorskip("openpyxl")
+    files = harness.write_synthetic_data(tmp_path / "data", 300, 6)
+    with contextlib.redirect_stdout(io.StringIO()):
+        master, _, _ = harness.LOADER_PATHS[loader_path](files, tmp_path / loader_path)
+
+    df = master.get_dataframe()
+    days = df["exp_date"].dt.normalize()
+    mask = (
+        (normalize_keys(df["marketplaces"]) == "amazon")
+        & normalize_keys(df["courier_name"]).isin(["delhivery", "ekart"])
+        & (days >= "2026-01-15") & (days <= "2026-02-28")
+    )
+    expected = sorted(set(df.loc[mask, "po_key"]))
+    selected = master.select("Amazon", None, ["Delhivery", "Ekart"], date(2026, 1, 15), date(2026, 2, 28))
+    assert selected and selected == expected
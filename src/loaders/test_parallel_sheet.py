@@ -0,0 +1,191 @@
+# The parallel sheet parser must give the same frame as read_excel.
+#
+#   python -m pytest src/loaders/test_parallel_sheet.py
+
+import re
+import zipfile
+from datetime import date, datetime, time
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.loaders import base_loader, parallel_sheet
+from src.loaders.base_loader import BaseLoader
+from src.loaders.parallel_sheet import read_sheet, split_rows
+
+openpyxl = pytest.importorskip("openpyxl")
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+SHARED_STRINGS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+SHARED_STRINGS_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+HEADER = ["Marketplaces", "PO", "Invoice Value", "Weight", "Box", "EWB", "Exp Date", "Mixed", "Flag"]
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    """Typical openpyxl-written sheet: shared strings, dates, gaps, blank rows"""
+    path = tmp_path_factory.mktemp("parallel") / "orders.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active.title = "Other"
+    ws = wb.create_sheet("OnlineB2B")
+    ws.append(HEADER)
+    for i in range(120):
+        ws.append([
+            ["Amazon", "Flipkart", "Myntra "][i % 3],
+            f"FBSWN{i:08d}" if i % 7 else 4400000 + i,
+            ["₹1,234.50", 5000, "00123", 99.5][i % 4],
+            i * 0.25,
+            None if i % 11 == 0 else i % 5 + 1,
+            123456789012 if i % 2 else None,
+            date(2026, 1, 1 + i % 28) if i % 13 else None,
+            [datetime(2026, 2, 5, 10, 30), "31-01-2026", 7, True, time(9, 15)][i % 5],
+            i % 3 == 0,
+        ])
+        if i == 50:
+            ws.append([])
+            ws.append([None, None, None, None, None, None, None, None, "only last"])
+    ws.append([])
+    ws.append([])
+    wb.save(path)
+    return path
+
+
+def replace_sheet(source, target, member, xml: str):
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = xml.encode("utf-8") if item.filename == member else src.read(item.filename)
+            dst.writestr(item, data)
+
+
+@pytest.fixture(scope="module")
+def handwritten(tmp_path_factory, workbook):
+    """Cell forms openpyxl never writes: inline and rich strings, t="str"/"e"/"d", prefixes, missing r"""
+    path = tmp_path_factory.mktemp("parallel") / "handwritten.xlsx"
+    with zipfile.ZipFile(workbook) as archive:
+        member = parallel_sheet.sheet_member(archive, "OnlineB2B")
+    rows = ['<x:row r="1"><x:c r="A1" t="inlineStr"><x:is><x:t>PO</x:t></x:is></x:c>'
+            '<x:c r="B1" t="inlineStr"><x:is><x:t>Note</x:t></x:is></x:c>'
+            '<x:c r="C1" t="inlineStr"><x:is><x:t>Value</x:t></x:is></x:c></x:row>']
+    for i in range(2, 60):
+        cells = [
+            f'<x:c r="A{i}" t="inlineStr"><x:is><x:r><x:t>PO</x:t></x:r><x:r><x:t>{i:04d}</x:t></x:r></x:is></x:c>',
+            [f'<x:c r="B{i}" t="str"><x:f>A{i}</x:f><x:v>formula &amp; text</x:v></x:c>',
+             f'<x:c r="B{i}" t="e"><x:v>#N/A</x:v></x:c>',
+             f'<x:c r="B{i}" t="b"><x:v>1</x:v></x:c>',
+             f'<x:c r="B{i}" t="d"><x:v>2026-01-0{i % 9 + 1}T00:00:00</x:v></x:c>',
+             f'<x:c r="B{i}"><x:v></x:v></x:c>'][i % 5],
+            f'<x:c r="D{i}"><x:v>{i * 1.5}</x:v></x:c>' if i % 3 else f'<x:c r="C{i}"><x:v>1E3</x:v></x:c>',
+        ]
+        rows.append(f'<x:row r="{i}" spans="1:4">{"".join(cells)}</x:row>')
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<x:sheetData>{"".join(rows)}</x:sheetData></x:worksheet>'
+    )
+    replace_sheet(workbook, path, member, xml)
+    return path
+
+
+def reference(path, sheet):
+    return base_loader.pd.read_excel(path, sheet_name=sheet, engine="openpyxl")
+
+
+@pytest.mark.parametrize("sheet", ["OnlineB2B", 1, "Other"])
+def test_same_frame_as_read_excel(workbook, sheet):
+    assert_frame_equal(read_sheet(workbook, sheet, workers=3), reference(workbook, sheet), check_exact=True)
+
+
+def test_handwritten_cell_forms(handwritten):
+    assert_frame_equal(read_sheet(handwritten, "OnlineB2B", workers=2), reference(handwritten, "OnlineB2B"), check_exact=True)
+
+
+def test_ranges_cover_every_row(workbook):
+    with zipfile.ZipFile(workbook) as archive:
+        data = archive.read(parallel_sheet.sheet_member(archive, "OnlineB2B"))
+    head, tail, ranges = split_rows(data, 16)
+    assert len(ranges) > 8
+    assert data[ranges[0][0]:ranges[-1][1]].count(b"<row ") == data.count(b"<row ")
+    assert all(data[start:].startswith(b"<row") for start, _ in ranges)
+
+
+def test_base_loader_uses_it_for_big_sheets(workbook, monkeypatch):
+    expected = BaseLoader(workbook, sheet_name="OnlineB2B", engine="openpyxl").load()
+    calls = []
+    monkeypatch.setattr(base_loader, "should_parse_in_parallel", lambda *args: True)
+    monkeypatch.setattr(base_loader, "try_read_sheet", lambda *args: calls.append(args) or read_sheet(*args, workers=2))
+    assert_frame_equal(BaseLoader(workbook, sheet_name="OnlineB2B").load(), expected, check_exact=True)
+    assert calls
+
+
+@pytest.fixture(scope="module")
+def drifting(tmp_path_factory):
+    """Columns whose cells change type between ranges, in a 1904-dated book"""
+    path = tmp_path_factory.mktemp("parallel") / "drifting.xlsx"
+    wb = openpyxl.Workbook()
+    wb.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904
+    ws = wb.active
+    ws.title = "OnlineB2B"
+    ws.append(["PO", "Box", "Weight", "Code", "Paid", "Exp Date", 5, None, "Box"])
+    for i in range(200):
+        ws.append([
+            4400000 + i if i < 180 else f"FBSWN{i:08d}",  # ints, then text late
+            i % 9 + 1,  # ints throughout
+            i if i < 100 else i + 0.5,  # ints, then floats
+            f"{i:05d}" if i != 150 else "N/A",  # numeric text with one NA marker
+            "TRUE" if i % 2 else False,  # bool text and real bools
+            date(2026, 1, 1 + i % 28),
+            None if i % 40 else 2 ** 60 + i,  # blanks and ints too wide for float64
+            None,
+            9.75 if i == 199 else None,  # one cell in the last range only
+        ])
+        if i in (60, 61):
+            ws.append([])
+    wb.save(path)
+    return path
+
+
+def test_types_merged_across_ranges(drifting):
+    df = read_sheet(drifting, "OnlineB2B", workers=4)
+    assert_frame_equal(df, reference(drifting, "OnlineB2B"), check_exact=True)
+    assert str(df["Weight"].dtype) == "float64"
+
+
+@pytest.fixture(scope="module")
+def shared(tmp_path_factory, workbook):
+    """The workbook with its text in a shared string table, as Excel saves it (openpyxl writes inline strings)"""
+    path = tmp_path_factory.mktemp("parallel") / "shared.xlsx"
+    items = ['<r><t>rich </t></r><r><rPr><b/></rPr><t>x005F_text</t></r>']
+    cells = re.compile(r'<c r="([A-Z]+\d+)"( s="\d+")? t="inlineStr"><is>(.*?)</is></c>')
+
+    def to_shared(match):
+        items.append(match.group(3))
+        return f'<c r="{match.group(1)}"{match.group(2) or ""} t="s"><v>{len(items) - 1}</v></c>'
+
+    with zipfile.ZipFile(workbook) as src, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename).decode("utf-8")
+            if item.filename.startswith("xl/worksheets/"):
+                data = cells.sub(to_shared, data)
+                data = data.replace('</row><row r="3"', '<c r="J2" t="s"><v>0</v></c></row><row r="3"', 1)
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace("</Relationships>", f'<Relationship Id="rIdStrings" Type="{SHARED_STRINGS_REL}" Target="sharedStrings.xml"/></Relationships>')
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace("</Types>", f'<Override PartName="/xl/sharedStrings.xml" ContentType="{SHARED_STRINGS_TYPE}"/></Types>')
+            dst.writestr(item, data.encode("utf-8"))
+        table = "".join(f"<si>{item}</si>" for item in items)
+        dst.writestr("xl/sharedStrings.xml", f'<sst xmlns="{MAIN_NS}" uniqueCount="{len(items)}">{table}</sst>')
+    return path
+
+
+def test_shared_strings(shared):
+    assert_frame_equal(read_sheet(shared, "OnlineB2B", workers=3), reference(shared, "OnlineB2B"), check_exact=True)
+
+
+def test_workbook_context_from_package_parts(shared):
+    from openpyxl.reader.strings import read_string_table
+
+    context = parallel_sheet.workbook_context(shared)
+    with zipfile.ZipFile(shared) as archive, archive.open("xl/sharedStrings.xml") as source:
+        assert context["shared_strings"] == read_string_table(source)
+    assert context["shared_strings"][0] == "rich text"
+    assert context["date_formats"] and context["epoch"] == openpyxl.utils.datetime.CALENDAR_WINDOWS_1900
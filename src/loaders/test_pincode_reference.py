@@ -0,0 +1,104 @@
+# Pincode reference validation and pincode-range service rules.
+#
+#   python -m pytest src/loaders/test_pincode_reference.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine.data_quality import QualityFlag, scan
+from src.loaders import location_master_loader
+from src.loaders.key_index import KeyIndex
+from src.loaders.location_master_loader import LocationMasterLoader
+from src.loaders.pincode_reference import PincodeReference, ServiceRules
+from src.loaders.sqlite_store import SQLiteMasterStore
+
+
+@pytest.fixture
+def reference(tmp_path):
+    path = tmp_path / "pincodes.csv"
+    pd.DataFrame({
+        "Pincode": [560001, 560001, 110001, "400001", "bad"],
+        "District Name": ["Bengaluru", "Bangalore Urban", "New Delhi", "Mumbai", "x"],
+        "State Name": ["KARNATAKA", "Karnataka", "Delhi", "Maharashtra", "x"],
+    }).to_csv(path, index=False)
+    ref = PincodeReference(path)
+    assert ref.load()
+    return ref
+
+
+def test_reference_validates_a_batch(reference):
+    assert len(reference) == 3
+    checks = reference.validate(
+        ["560001", 560001, "110001", "999999", "0", "400001.0"],
+        ["bangalore  urban", "Mysuru", "New Delhi", "Anywhere", "", "Mumbai"],
+        ["Karnataka", "Karnataka", "Haryana", "Nowhere", "", "maharashtra"],
+    )
+    assert checks["valid"].tolist() == [True, True, True, True, False, True]
+    assert checks["known"].tolist() == [True, True, True, False, False, True]
+    assert checks["city"].tolist() == [True, False, True, True, True, True]
+    assert checks["state"].tolist() == [True, True, False, True, True, True]
+
+
+def test_service_rules():
+    rules = ServiceRules(
+        [
+            {"from": 560000, "to": 560099, "service_type": "EXPRESS", "zone": "SOUTH"},
+            {"from": 110001, "to": 110097, "service_type": "EXPRESS", "zone": "NCR"},
+            {"from": 400001, "to": 400001, "zone": "MUMBAI"},
+        ],
+        {"service_type": "SURFACE", "zone": "REST"},
+    )
+    service, zone = rules.assign(["560001", 110097, 110098, 400001, 100000, "0", None])
+    assert service.tolist() == ["EXPRESS", "EXPRESS", "SURFACE", "SURFACE", "SURFACE", "SURFACE", "SURFACE"]
+    assert zone.tolist() == ["SOUTH", "NCR", "REST", "MUMBAI", "REST", "REST", "REST"]
+    assert ServiceRules().assign(np.array([560001]))[0].tolist() == ["SURFACE"]
+    with pytest.raises(ValueError):
+        ServiceRules([{"from": 1, "to": 10}, {"from": 10, "to": 20}])
+
+
+def stored_locations(tmp_path, monkeypatch) -> LocationMasterLoader:
+    monkeypatch.setattr(location_master_loader.ServiceRules, "from_config", classmethod(
+        lambda cls: cls([{"from": 560000, "to": 560099, "service_type": "EXPRESS", "zone": "SOUTH"}])
+    ))
+    df = pd.DataFrame({
+        "marketplace": ["Amazon", "Amazon"], "location": ["BLR-1", "DEL-2"],
+        "customer_name": ["A", "B"], "customer_address": ["x", "y"],
+        "customer_pincode": ["560001", "110001"], "customer_city": ["Bengaluru", "Gurgaon"],
+        "customer_state": ["Karnataka", "Delhi"],
+    })
+    store = SQLiteMasterStore(tmp_path / "store.db")
+    store.ingest("locations", df, Path(__file__))
+    loader = LocationMasterLoader(Path("unused.xlsx"))
+    loader.attach_store(store)
+    return loader
+
+
+def test_location_rows_carry_service_type(tmp_path, monkeypatch):
+    loader = stored_locations(tmp_path, monkeypatch)
+    assert loader.get_location("BLR-1", "Amazon")["service_type"] == "EXPRESS"
+    assert loader.get_location("DEL-2", "Amazon")["zone"] == ""
+    assert loader.get_location("DEL-2", "Amazon")["service_type"] == "SURFACE"
+
+
+def test_scan_flags_address_mismatches(tmp_path, monkeypatch, reference):
+    loader = stored_locations(tmp_path, monkeypatch)
+
+    class Orders:
+        def get_dataframe(self):
+            return pd.DataFrame({
+                "order_number": ["PO1", "PO2"], "po_key": ["PO1", "PO2"], "marketplaces": ["Amazon", "Amazon"],
+                "location": ["BLR-1", "DEL-2"], "box": [1, 1], "exp_date": pd.Timestamp("2026-01-01"),
+                "total_weight_gms": [100, 100], "invoice_value": [10, 10],
+            })
+
+    class Mapping:
+        key_index = KeyIndex(["Amazon"])
+
+    report = scan(Orders(), loader, Mapping(), reference)
+    assert report.status["PO1"] == 0
+    assert report.status["PO2"] == int(QualityFlag.CITY_MISMATCH)
+    assert report.blocked_count == 0
+    assert list(report.unmatched["address"].values()) == [1]
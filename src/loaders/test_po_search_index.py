@@ -0,0 +1,67 @@
+import pytest
+
+from src.engine import correctness_harness as harness
+from src.loaders.po_search_index import POSearchIndex
+
+POS = ["FBSWN00012345", "FBSWN00012399", "FBSWN00099345", "AMZ12345", "9100001", "9100001"]
+
+
+@pytest.fixture
+def index():
+    return POSearchIndex(POS)
+
+
+def test_duplicates_collapse(index):
+    assert len(index) == 5
+
+
+def test_prefix(index):
+    assert index.prefix("FBSWN000123") == ["FBSWN00012345", "FBSWN00012399"]
+    assert index.prefix("FBSWN") == ["FBSWN00012345", "FBSWN00012399", "FBSWN00099345"]
+    assert index.prefix("ZZZ") == []
+
+
+def test_suffix(index):
+    assert index.suffix("345") == ["FBSWN00012345", "AMZ12345", "FBSWN00099345"]
+    assert index.suffix("99") == ["FBSWN00012399"]
+    assert index.suffix("X") == []
+
+
+def test_limit(index):
+    assert index.prefix("FBSWN", limit=2) == ["FBSWN00012345", "FBSWN00012399"]
+    assert len(index.suffix("345", limit=1)) == 1
+    assert index.search("FBSWN", limit=0) == []
+
+
+def test_search_prefix_then_suffix_without_repeats(index):
+    # "FBSWN00012345" matches both ways and is listed once
+    assert index.search("FBSWN00012345") == ["FBSWN00012345"]
+    assert index.search("12345", limit=10) == ["FBSWN00012345", "AMZ12345"]
+    assert index.search("AMZ", limit=1) == ["AMZ12345"]
+
+
+@pytest.mark.parametrize("query", ["", "   ", "''", "​"])
+def test_empty_query(index, query):
+    assert index.prefix(query) == []
+    assert index.suffix(query) == []
+    assert index.search(query) == []
+
+
+@pytest.mark.parametrize("query", ["fbswn000123", " 'FBSWN000123' ", "​fbswn000123"])
+def test_unnormalized_query(index, query):
+    assert index.prefix(query) == ["FBSWN00012345", "FBSWN00012399"]
+
+
+def test_float_spelling(index):
+    assert index.prefix("9100001.0") == ["9100001"]
+
+
+def test_master_index_holds_normalized_keys(tmp_path):
+    files = harness.write_synthetic_data(tmp_path, 40, 0)
+    master = harness.load_excel(files, tmp_path)[0]
+    df = master.get_dataframe()
+    assert len(master.search_index) == df["po_key"].nunique()
+    for raw, key in zip(df["order_number"], df["po_key"]):
+        # The master's own spelling and the normalized key find the same PO
+        assert key in master.search_index.prefix(raw, limit=len(df))
+        assert key in master.search_index.suffix(key[-4:], limit=len(df))
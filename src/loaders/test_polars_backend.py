@@ -0,0 +1,61 @@
+# Optional polars backend: same typed-cell semantics as the pandas loaders.
+#
+#   python -m pytest src/loaders/test_polars_backend.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine import correctness_harness as harness
+from src.engine import master_diff
+from src.loaders import polars_backend
+
+
+def test_config_chooses_the_backend(monkeypatch):
+    monkeypatch.setattr(polars_backend, "get_setting", lambda key, default=None: "pandas")
+    assert polars_backend.use_polars() is False
+    monkeypatch.setattr(polars_backend, "get_setting", lambda key, default=None: "arrow")
+    with pytest.raises(ValueError, match="Unknown dataframe backend"):
+        polars_backend.use_polars()
+
+
+def test_missing_polars_falls_back_to_pandas(monkeypatch):
+    monkeypatch.setattr(polars_backend, "polars_available", lambda: False)
+    with polars_backend.backend("polars"):
+        assert polars_backend.use_polars() is False
+
+
+def test_scan_keeps_each_cells_type():
+    pl = pytest.importorskip("polars")
+    df = pd.DataFrame({"box": [2, 2.5, "3", " 4 ", "2.5", None, np.nan, "x"]})
+    frame = polars_backend.scan(df, numbers=["box"]).select(
+        pl.col("box"),
+        polars_backend.number("box").alias("number"),
+        polars_backend.integer_cells("box", polars_backend.int_literals(df["box"])).alias("int"),
+    ).collect()
+    assert frame["box"].to_list() == ["2", "2.5", "3", " 4 ", "2.5", None, None, "x"]
+    assert frame["number"].to_list() == [2, 2.5, 3, 4, 2.5, None, None, None]
+    # int() accepts the cell: numeric 2.5 (2 boxes once cast), " 4 "; not the text "2.5"
+    assert frame["int"].to_list() == [2, 2.5, 3, 4, None, None, None, None]
+
+
+@pytest.mark.parametrize("build_path", ["batch", "parallel"])
+def test_polars_loaders_match_reference(build_path, tmp_path):
+    pytest.importorskip("polars")
+    pytest.importorskip("openpyxl")
+    assert harness.run_harness(200, 8, ["polars"], [build_path], work_dir=tmp_path) == []
+
+
+def test_backends_give_the_same_fingerprint(tmp_path):
+    pytest.importorskip("polars")
+    pytest.importorskip("openpyxl")
+    files = harness.write_synthetic_data(tmp_path, 200, 8)
+    with polars_backend.backend("pandas"):
+        reference = harness.load_excel(files, tmp_path)[0]
+    with polars_backend.backend("polars"):
+        master = harness.load_excel(files, tmp_path)[0]
+    assert master.orders_pl is not None
+    # orders_df is the pandas cleanup on both backends; only orders_pl is polars-typed
+    pd.testing.assert_frame_equal(master.orders_df, reference.orders_df)
+    old, new = master_diff.fingerprint(reference.orders_df), master_diff.fingerprint(master.orders_df)
+    assert master_diff.diff_fingerprints(old, new).summary() == "0 new, 0 changed, 0 removed"
@@ -0,0 +1,150 @@
+# SQLite master store: versioned tables, so engine generations stay immutable.
+#
+#   python -m pytest src/loaders/test_sqlite_store.py
+
+import gc
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.engine.engine_generation import EngineGeneration, GenerationManager
+from src.loaders.master_orders_loader import MasterOrdersLoader
+from src.loaders.sqlite_store import LEASE_SECONDS, SQLiteMasterStore
+
+
+def orders(box, invoice):
+    return pd.DataFrame({
+        "order_number": ["PO1", "PO2"],
+        "po_key": ["PO1", "PO2"],
+        "marketplaces": ["Amazon", "Flipkart"],
+        "location": ["BLR1", "DEL2"],
+        "courier_name": ["Delhivery", None],
+        "box": box,
+        "invoice_value": invoice,
+        "exp_date": pd.to_datetime(["2026-01-05", None]),
+    })
+
+
+def stored_master(store, source) -> MasterOrdersLoader:
+    loader = MasterOrdersLoader(source)
+    assert loader.attach_store(store)
+    return loader
+
+
+def generation(number, master):
+    return EngineGeneration(number, master, None, None, None)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteMasterStore(tmp_path / "store.sqlite3")
+
+
+def test_rollback_after_reingest_reads_the_old_rows(store, tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    store.ingest("orders", orders([1, 2], [100, 200]), source)
+    manager = GenerationManager()
+    manager.publish(generation(1, stored_master(store, source)))
+
+    source.write_bytes(b"v2, a different file")
+    store.ingest("orders", orders([3, 4], [300, 400]), source)
+    manager.publish(generation(2, stored_master(store, source)))
+    assert manager.current.master_orders.get_order("PO1")["invoice_value"] == 300
+
+    manager.rollback()
+    assert manager.current.master_orders.get_order("PO1")["invoice_value"] == 100
+    assert manager.current.master_orders.get_orders(["PO1", "PO2"])["PO2"]["box"] == 2
+
+
+def test_version_is_dropped_once_no_loader_holds_it(store, tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    first = store.ingest("orders", orders([1, 2], [100, 200]), source)
+    old = stored_master(store, source)
+
+    second = store.ingest("orders", orders([3, 4], [300, 400]), source)
+    assert store.count(first) == 2 and store.current_version("orders") == second
+
+    del old
+    gc.collect()
+    assert store.collect() == [first]
+    with pytest.raises(KeyError):
+        store.attach("orders", object(), first)
+
+
+def test_unchanged_source_reattaches_its_version(store, tmp_path):
+    v1, v2 = tmp_path / "v1.xlsx", tmp_path / "v2.xlsx"
+    v1.write_bytes(b"v1")
+    v2.write_bytes(b"v2")
+    first = store.ingest("orders", orders([1, 2], [100, 200]), v1)
+    pinned = stored_master(store, v1)
+    store.ingest("orders", orders([3, 4], [300, 400]), v2)
+
+    assert store.find_version("orders", v1) == first
+    assert store.find_version("orders", tmp_path / "missing.xlsx") is None
+    assert pinned.store_version == first
+
+
+def test_mixed_cells_keep_their_type(store, tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    store.ingest("orders", orders([2.5, "2.5"], [100, 200]), source)
+    found = stored_master(store, source).get_orders(["PO1", "PO2"])
+    assert found["PO1"]["box"] == 2.5 and found["PO2"]["box"] == "2.5"
+
+
+def test_lookups_during_reingest_never_miss_the_table(store, tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    store.ingest("orders", orders([1, 2], [100, 200]), source)
+    loader = stored_master(store, source)
+    errors = []
+
+    def read():
+        for _ in range(200):
+            try:
+                assert loader.get_order("PO1")["invoice_value"] == 100
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(5):
+        source.write_bytes(b"v" * (i + 2))
+        store.ingest("orders", orders([3, 4], [300, 400]), source)
+    reader.join()
+    assert errors == []
+
+
+def test_reingest_elsewhere_keeps_a_version_this_store_reads(store, tmp_path):
+    # Two app processes sharing one database: each has its own store instance
+    other = SQLiteMasterStore(store.db_path)
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    first = store.ingest("orders", orders([1, 2], [100, 200]), source)
+    reader = stored_master(store, source)
+
+    source.write_bytes(b"v2, a different file")
+    other.ingest("orders", orders([3, 4], [300, 400]), source)
+    assert other.collect() == []
+    assert reader.get_order("PO1")["invoice_value"] == 100
+
+    del reader
+    gc.collect()
+    store.renew_leases()
+    assert other.collect() == [first]
+
+
+def test_leases_of_a_dead_process_expire(store, tmp_path):
+    source = tmp_path / "master.xlsx"
+    source.write_bytes(b"v1")
+    first = store.ingest("orders", orders([1, 2], [100, 200]), source)
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("INSERT INTO leases VALUES (?, 'crashed', 1, ?)", (first, time.time() - LEASE_SECONDS - 1))
+    source.write_bytes(b"v2, a different file")
+    store.ingest("orders", orders([3, 4], [300, 400]), source)
+    assert store.count(first) == 0
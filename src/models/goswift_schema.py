@@ -1,64 +1,92 @@
-GOSWIFT_COLUMNS = [
-    "order_number",
-    "customer_ID",
-    "customer_company_name",
-    "customer_gst_in",
-    "customer_name",
-    "customer_address",
-    "customer_pincode",
-    "customer_city",
-    "customer_state",
-    "customer_number",
-    "customer_email",
-    "delivery_type",
-    "b2b_order_channel",
-    "b2b_order_channel_other",
-    "total_weight_gms",
-    "invoice_number",
-    "order_invoice_amount",
-    "product_description",
-    "ewaybill_number",
-    "sender_gst_in",
-    "pickup_location_name",
-    "box_type",
-    "number_of_boxes",
-    "l_cms",
-    "w_cms",
-    "h_cms",
-    "seller_courier_choice",
-    "service_type",
-    "is_rtv_shipment",
-    "is_appointment_based",
-    "appointment_date",
-    "appointment_time (HHMM)",
-    "appointment_id",
-    "purchase_order_number",
-    "purchase_order_expiry_date",
+# =====================================================
+# GOSWIFT OUTPUT SCHEMA
+# =====================================================
+# The one place the GoSwift bulk-upload columns are defined.
+# Each column says where its value comes from:
+#
+#   STATIC       fixed value (`value`)
+#   ORDER        field of the master order row (`key`)
+#   LOCATION     field of the location master row (`key`); service_type
+#                comes from the pincode-range rules applied to that row
+#   MARKETPLACE  field of the marketplace mapping row (`key`)
+#   DERIVED      computed by GoSwiftBuilder per order (`key`); box_type
+#                and l/w/h_cms come from the box rules (src/engine/box_rules.py)
+#
+# GOSWIFT_COLUMNS and STATIC_VALUES are generated from this list,
+# and the builder compiles it into its row projector.
+
+from collections import namedtuple
+
+STATIC = "static"
+ORDER = "order"
+LOCATION = "location"
+MARKETPLACE = "marketplace"
+DERIVED = "derived"
+
+Column = namedtuple("Column", ["name", "source", "key", "value"])
+
+
+def static(name, value=""):
+    return Column(name, STATIC, None, value)
+
+
+def order(name, key):
+    return Column(name, ORDER, key, None)
+
+
+def location(name, key):
+    return Column(name, LOCATION, key, None)
+
+
+def marketplace(name, key):
+    return Column(name, MARKETPLACE, key, None)
+
+
+def derived(name, key=None):
+    return Column(name, DERIVED, key or name, None)
+
+
+GOSWIFT_SCHEMA = [
+    derived("order_number"),
+    static("customer_ID"),
+    location("customer_company_name", "customer_name"),
+    static("customer_gst_in"),
+    location("customer_name", "customer_name"),
+    location("customer_address", "customer_address"),
+    location("customer_pincode", "customer_pincode"),
+    location("customer_city", "customer_city"),
+    location("customer_state", "customer_state"),
+    static("customer_number", "9999999999"),
+    static("customer_email"),
+    static("delivery_type"),
+    marketplace("b2b_order_channel", "go_swift_code"),
+    static("b2b_order_channel_other"),
+    derived("total_weight_gms"),
+    order("invoice_number", "invoice_number"),
+    derived("order_invoice_amount"),
+    static("product_description", "Cosmetics"),
+    derived("ewaybill_number"),
+    static("sender_gst_in"),
+    static("pickup_location_name", "RENEE Cosmetics Pvt. Ltd. B2B"),
+    derived("box_type"),
+    derived("number_of_boxes"),
+    derived("l_cms"),
+    derived("w_cms"),
+    derived("h_cms"),
+    marketplace("seller_courier_choice", "transporter"),
+    location("service_type", "service_type"),
+    static("is_rtv_shipment", "FALSE"),
+    static("is_appointment_based", "TRUE"),
+    static("appointment_date"),
+    static("appointment_time (HHMM)"),
+    static("appointment_id"),
+    derived("purchase_order_number", "order_number"),
+    derived("purchase_order_expiry_date"),
 ]
 
-DEFAULT_VALUES = {
-    "customer_ID": "",
-    "customer_gst_in": "",
-    "customer_email": "",
-    "delivery_type": "",
-    "b2b_order_channel_other": "",
-    "sender_gst_in": "",
-    "appointment_date": "",
-    "appointment_time (HHMM)": "",
-    "appointment_id": "",
-    "purchase_order_number": "",
-    "purchase_order_expiry_date": "",
-
-    "product_description": "Cosmetics",
-    "customer_number": "9999999999",
-    "pickup_location_name": "RENEE Cosmetics Pvt. Ltd. B2B",
-
-    "box_type": 1,
-    "l_cms": 10,
-    "w_cms": 10,
-    "h_cms": 10,
-
-    "service_type": "SURFACE",
-    "is_rtv_shipment": "TRUE",
-    "is_appointment_based": "TRUE",
-}
+GOSWIFT_COLUMNS = [col.name for col in GOSWIFT_SCHEMA]
+
+STATIC_VALUES = {col.name: col.value for col in GOSWIFT_SCHEMA if col.source == STATIC}
+
+# Older name for STATIC_VALUES
+DEFAULT_VALUES = STATIC_VALUES
@@ -1,21 +1,27 @@
 import datetime
 import tkinter as tk
-from tkinter import messagebox, scrolledtext, filedialog
-import shutil, json
+from tkinter import messagebox, scrolledtext, filedialog, simpledialog, ttk
+import json
 from pathlib import Path
 import socket
 import os
 import sys
 import threading
+import multiprocessing
 
-from src.loaders.master_orders_loader import MasterOrdersLoader
-from src.loaders.location_master_loader import LocationMasterLoader
-from src.loaders.marketplace_mapping import MarketplaceMappingLoader
-from src.engine.goswift_engine_builder import GoSwiftBuilder
-from src.exporters.goswift_csv_exporter import GoSwiftCSVExporter
+# Only lightweight modules here. Anything that pulls in pandas (loaders,
+# builder, exporter, validator) is imported on first use, off the Tk
+# thread, so the window and splash are drawn before pandas is loaded.
+# src/ui/test_startup_import.py keeps it that way.
+from src.engine.engine_generation import GenerationManager, build_generation, derive_generation
+from src.exporters.export_ledger import ExportLedger
+from src.exporters.export_jobs import ExportJobQueue, DONE, FAILED
 
 from src.schemas.file_schemas import (MARKETPLACE_SCHEMA, LOCATION_SCHEMA, MASTER_SCHEMA)
-from src.utils import excel_validator
+from src.utils.config import get_setting
+from src.utils.data_watcher import DataWatcher
+from src.utils import snapshot_store
+from src.utils.order_intake import parse_order_input
 
 
 # =====================================================
@@ -33,6 +39,46 @@ LIGHT_TEXT = "#666666"
 GRADIENT_START = "#667eea"
 GRADIENT_END = "#764ba2"
 
+# PO autocomplete in the order input box
+MIN_AUTOCOMPLETE_CHARS = 3
+AUTOCOMPLETE_LIMIT = 8
+
+# Rows shown in the recent export jobs list
+JOBS_SHOWN = 8
+
+# Bulk selection filters: label -> OrderSelectionIndex field
+SELECTION_FIELDS = {"Marketplace": "marketplace", "Location": "location", "Courier": "courier"}
+ANY_VALUE = "(any)"
+DATE_FORMAT = "%d-%m-%Y"
+
+# Watched data files, keyed by their folder under data/. Names without the
+# extension: an upload keeps its workbook type (master.xls, master.xlsb, ...)
+DATA_FILES = {
+    "master_orders": "master",
+    "location_master": "location_master",
+    "marketplace_mapping": "marketplace_mapping",
+}
+
+
+
+def data_suffixes() -> list:
+    """Workbook types a data file can have, .xlsx (the name used when none exists yet) first"""
+    from src.loaders.base_loader import EXCEL_SUFFIXES
+    return sorted(EXCEL_SUFFIXES, key=lambda suffix: suffix != ".xlsx")
+
+
+def loader_classes() -> dict:
+    """Loader class per data folder (imports pandas on first call)"""
+    from src.loaders.master_orders_loader import MasterOrdersLoader
+    from src.loaders.location_master_loader import LocationMasterLoader
+    from src.loaders.marketplace_mapping import MarketplaceMappingLoader
+
+    return {
+        "master_orders": MasterOrdersLoader,
+        "location_master": LocationMasterLoader,
+        "marketplace_mapping": MarketplaceMappingLoader,
+    }
+
 # =====================================================
 # SPLASH SCREEN
 # =====================================================
@@ -284,6 +330,19 @@ class GoSwiftUI:
         
         self.project_root = Path(__file__).resolve().parents[2]
         self.splash = None
+        self.watcher = None
+        self.generations = GenerationManager()
+        self._reload_lock = threading.Lock()
+        self.ledger = ExportLedger() if get_setting("export_ledger", True) else None
+        self.store = None
+        self.pending_orders = None  # master diff state, created with the first master load
+        self._pending_jobs = set()
+        self.jobs = ExportJobQueue(
+            self.project_root / "output",
+            ledger=self.ledger,
+            max_workers=get_setting("export_workers", 2),
+            on_update=lambda job: self.root.after(0, self._on_job_update, job),
+        )
         
         # Check expiry date BEFORE building UI
         expiry_valid, expiry_msg = check_expiry_date()
@@ -296,70 +355,215 @@ class GoSwiftUI:
             self.root.destroy()
             return
         
+        # Splash first, so something is on screen while the rest starts up
+        self.splash = SplashScreen(self.root)
+        self.splash.update_status("🚀 Starting...")
         self._build_ui()
         self._load_engine_async()
     
     # ============ ENGINE ============
     def _load_engine_async(self):
         """Load engine in background with splash screen"""
-        self.splash = SplashScreen(self.root)
+        if self.splash is None:
+            self.splash = SplashScreen(self.root)
         
         def load():
             try:
+                self.splash.update_status("📦 Loading libraries...")
+                loaders = loader_classes()
+                
                 self.splash.update_status("📊 Loading Master Orders...")
-                self.master_orders = MasterOrdersLoader(
-                    self.project_root / "data" / "master_orders" / "master.xlsx"
-                )
-                self.master_orders.load()
-                meta = self._read_meta("master_orders", "master_meta.json")
+                sources = {
+                    folder: snapshot_store.ensure_version(self._data_file(folder))
+                    for folder in DATA_FILES
+                }
+                master_orders = loaders["master_orders"](self._source_file("master_orders", sources))
+                self._load_loader(master_orders)
+                if master_orders.is_loaded:
+                    self._track_master(master_orders)
                 
                 self.splash.update_status("📍 Loading Location Master...")
-                self.location_master = LocationMasterLoader(
-                    self.project_root / "data" / "location_master" / "location_master.xlsx"
-                )
-                self.location_master.load()
-                meta = self._read_meta("location_master", "location_master_meta.json")
+                location_master = loaders["location_master"](self._source_file("location_master", sources))
+                self._load_loader(location_master)
                 
                 self.splash.update_status("🛍️ Loading Marketplace Mapping...")
-                self.marketplace_mapping = MarketplaceMappingLoader(
-                    self.project_root / "data" / "marketplace_mapping" / "marketplace_mapping.xlsx"
-                )
-                self.marketplace_mapping.load()
+                marketplace_mapping = loaders["marketplace_mapping"](self._source_file("marketplace_mapping", sources))
+                self._load_loader(marketplace_mapping)
                 
                 self.splash.update_status("⚙️ Initializing engine...")
-                self.builder = GoSwiftBuilder(
-                    self.master_orders,
-                    self.location_master,
-                    self.marketplace_mapping
-                )
-
-                self.exporter = GoSwiftCSVExporter(
-                    self.builder,
-                    self.project_root / "output"
+                generation = build_generation(
+                    self.generations.next_number(),
+                    master_orders,
+                    location_master,
+                    marketplace_mapping,
+                    sources=sources,
                 )
+                self.generations.publish(generation)
                 
                 self.root.after(0, self._on_engine_loaded)
                 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Startup Error", str(e)))
+                self.root.after(0, lambda msg=str(e): messagebox.showerror("Startup Error", msg))
                 self.root.after(0, self.root.destroy)
         
         thread = threading.Thread(target=load, daemon=True)
         thread.start()
     
+    def _load_loader(self, loader):
+        """
+        Load one data source using the configured backend: the SQLite master store,
+        the shared Arrow snapshot, or a plain parse of the Excel file.
+        """
+        if get_setting("storage_backend", "excel") == "sqlite":
+            if self.store is None:
+                from src.loaders.sqlite_store import SQLiteMasterStore
+                self.store = SQLiteMasterStore()
+            return loader.load_stored(self.store)
+        if get_setting("shared_snapshot", False):
+            return loader.load_shared()
+        return loader.load()
+
+    def _track_master(self, master_orders):
+        """Diff a newly loaded master against the previous one (worker thread)"""
+        try:
+            from src.engine.master_diff import PendingOrders
+            if self.pending_orders is None:
+                self.pending_orders = PendingOrders()
+            diff = self.pending_orders.update(master_orders.get_dataframe())
+            print(f"Master diff: {diff.summary()}")
+        except Exception as e:
+            print(f"⚠️  Could not diff master orders: {e}")
+        self.root.after(0, self._update_pending_button)
+
     def _on_engine_loaded(self):
         """Called when engine finishes loading"""
         self.splash.close()
+        self.splash = None
         self._update_ui_status()
         self.expiry_label.config(text="✅ Ready", fg=SUCCESS_COLOR)
+        self._start_data_watcher()
+
+    # ============ RELOAD / ROLLBACK ============
+    def _data_file(self, folder):
+        """The live workbook of a data folder, whichever type it was uploaded as"""
+        return snapshot_store.live_file(self.project_root / "data" / folder, DATA_FILES[folder], data_suffixes())
+
+    def _source_file(self, folder, sources):
+        """Stored snapshot version to parse, or the live file when none exists"""
+        return sources.get(folder) or self._data_file(folder)
+
+    def _start_data_watcher(self):
+        """Watch data/* so files dropped in by the ERP export are picked up without a restart"""
+        if self.watcher is not None:
+            return
+        if not get_setting("auto_reload", True):
+            return
+        self.watcher = DataWatcher(
+            {
+                folder: snapshot_store.live_candidates(
+                    self.project_root / "data" / folder, DATA_FILES[folder], data_suffixes()
+                )
+                for folder in DATA_FILES
+            },
+            on_change=self._reload_source_async,
+            poll_seconds=get_setting("auto_reload_poll_seconds", 2.0),
+            settle_seconds=get_setting("auto_reload_settle_seconds", 3.0),
+        )
+        self.watcher.start()
+
+    def _reload_source_async(self, folder, path, version=None):
+        """
+        Reload one data source off the Tk thread into a new engine generation.
+        The current generation stays in use until the new one is complete.
+        """
+        def reload():
+            with self._reload_lock:
+                base = self.generations.current
+                source = version or snapshot_store.ensure_version(path)
+
+                # Parse the immutable stored version, not the live file that may change again
+                loader = loader_classes()[folder](source or path)
+                self._load_loader(loader)
+
+                if not loader.is_loaded or base is None:
+                    self._restore_source(folder, base)
+                    self.root.after(0, lambda: self._on_reload_failed(folder))
+                    return
+
+                generation = derive_generation(
+                    base, self.generations.next_number(), folder, loader, source
+                )
+                self.generations.publish(generation)
+            if folder == "master_orders":
+                self._track_master(loader)
+            self.root.after(0, lambda: self._on_reload_done(folder))
+
+        threading.Thread(target=reload, daemon=True).start()
+
+    def _restore_source(self, folder, generation):
+        """Put the live file back to the version `generation` was loaded from"""
+        version = generation.sources.get(folder) if generation else None
+        if version is None:
+            return
+        try:
+            # The version's own type: the live file may have been uploaded as another one since
+            live = self.project_root / "data" / folder / f"{DATA_FILES[folder]}{version.suffix}"
+            snapshot_store.restore_version(version, live)
+            snapshot_store.retire_other_types(live, data_suffixes())
+            if self.watcher is not None:
+                self.watcher.acknowledge(folder)
+        except Exception as e:
+            print(f"⚠️  Could not restore {folder} file: {e}")
+
+    def _on_reload_done(self, folder):
+        self._update_ui_status()
+        print(f"✅ {folder.replace('_', ' ').title()} reloaded")
+
+    def _on_reload_failed(self, folder):
+        self._update_ui_status()
+        messagebox.showerror(
+            "❌ Reload Failed",
+            f"{folder.replace('_', ' ').title()} could not be loaded.\n\n"
+            "The previous data is still in use."
+        )
+
+    def _rollback(self):
+        """Switch back to the previous data generation without re-parsing"""
+        if not self.generations.can_rollback():
+            messagebox.showinfo("Rollback", "There is no previous data to roll back to.")
+            return
+
+        previous = self.generations.history()[0]
+        if not messagebox.askyesno("↩️ Rollback", f"Roll back to {previous.label}?"):
+            return
+
+        # Never wait on the Tk thread: a reload holds the lock for a whole Excel parse
+        if not self._reload_lock.acquire(blocking=False):
+            messagebox.showinfo("Rollback", "A data reload is in progress. Try again once it has finished.")
+            return
+        try:
+            current = self.generations.current
+            previous = self.generations.rollback()
+            for folder in DATA_FILES:
+                if previous.sources.get(folder) != current.sources.get(folder):
+                    self._restore_source(folder, previous)
+        finally:
+            self._reload_lock.release()
+
+        self._update_ui_status()
+        messagebox.showinfo("✅ Rolled Back", f"Now using {previous.label}")
     
     def _update_ui_status(self):
         """Update status cards after loading"""
+        generation = self.generations.current
+        if generation is None:
+            return
+
         # Master Orders
         meta = self._read_meta("master_orders", "master_meta.json")
         if meta:
             self.master_card.set_status(f"✅ {meta}", SUCCESS_COLOR)
-        elif self.master_orders.is_loaded:
+        elif generation.master_orders.is_loaded:
             self.master_card.set_status("✅ Data loaded", SUCCESS_COLOR)
         else:
             self.master_card.set_status("⚠️ No data - Please upload", WARNING_COLOR)
@@ -368,7 +572,7 @@ class GoSwiftUI:
         meta = self._read_meta("location_master", "location_master_meta.json")
         if meta:
             self.location_card.set_status(f"✅ {meta}", SUCCESS_COLOR)
-        elif self.location_master.is_loaded:
+        elif generation.location_master.is_loaded:
             self.location_card.set_status("✅ Data loaded", SUCCESS_COLOR)
         else:
             self.location_card.set_status("⚠️ No data - Please upload", WARNING_COLOR)
@@ -377,11 +581,24 @@ class GoSwiftUI:
         meta = self._read_meta("marketplace_mapping", "marketplace_mapping_meta.json")
         if meta:
             self.marketplace_card.set_status(f"✅ {meta}", SUCCESS_COLOR)
-        elif self.marketplace_mapping.is_loaded:
+        elif generation.marketplace_mapping.is_loaded:
             self.marketplace_card.set_status("✅ Data loaded", SUCCESS_COLOR)
         else:
             self.marketplace_card.set_status("⚠️ No data - Please upload", WARNING_COLOR)
 
+        self._refresh_selection_filters()
+
+        # Data Quality
+        quality = generation.quality
+        if quality is None:
+            self.quality_card.set_status("⚠️ Not available", WARNING_COLOR)
+        else:
+            lines = quality.summary().splitlines()
+            reasons = [line for line in lines[1:] if not line.startswith("Unmatched")][:4]
+            unmatched = [line for line in lines[1:] if line.startswith("Unmatched")]
+            text = "\n".join([lines[0]] + [f"• {line}" for line in reasons + unmatched])
+            self.quality_card.set_status(text, WARNING_COLOR if quality.blocked_count else SUCCESS_COLOR)
+
     def _read_meta(self, folder, filename):
         path = self.project_root / "data" / folder / filename
         if path.exists():
@@ -459,7 +676,7 @@ class GoSwiftUI:
         # ===== INPUT SECTION =====
         input_label = tk.Label(
             scrollable_frame,
-            text="📋 Order Numbers (one per line)",
+            text="📋 Order Numbers (one per line, or pasted from Excel)",
             font=("Helvetica", 11, "bold"),
             bg=LIGHT_BG,
             fg=TEXT_COLOR
@@ -482,6 +699,34 @@ class GoSwiftUI:
             insertbackground=PRIMARY_COLOR
         )
         self.text_input.pack(fill="both", expand=True, padx=10, pady=10)
+        self.text_input.bind("<KeyRelease>", self._on_order_typed)
+        
+        # Autocomplete suggestions for the line being typed (hidden until there are matches)
+        self.suggestions = tk.Listbox(
+            input_frame,
+            height=5,
+            font=("Courier", 10),
+            bg=LIGHT_BG,
+            fg=TEXT_COLOR,
+            relief=tk.FLAT,
+            activestyle="none",
+            selectbackground=PRIMARY_COLOR
+        )
+        self.suggestions.bind("<Double-Button-1>", self._accept_suggestion)
+        self.suggestions.bind("<Return>", self._accept_suggestion)
+        
+        # Re-export override for POs already in the export ledger
+        self.force_export = tk.BooleanVar(value=False)
+        if self.ledger is not None:
+            tk.Checkbutton(
+                scrollable_frame,
+                text="Re-export orders that were already exported",
+                variable=self.force_export,
+                font=("Helvetica", 9),
+                bg=LIGHT_BG,
+                fg=LIGHT_TEXT,
+                activebackground=LIGHT_BG
+            ).pack(anchor="w")
         
         # Generate button
         ModernButton(
@@ -491,6 +736,102 @@ class GoSwiftUI:
             color=SECONDARY_COLOR
         ).pack(pady=12, fill="x", padx=0)
         
+        # One click for every PO added or changed in the master since it was last loaded
+        self.pending_button = ModernButton(
+            scrollable_frame,
+            text="⏳ Generate All Pending",
+            command=self._generate_pending,
+            color=PRIMARY_COLOR
+        )
+        self.pending_button.pack(pady=(0, 12), fill="x", padx=0)
+        
+        # Bulk selection: every PO matching marketplace / location / courier / expiry
+        tk.Label(
+            scrollable_frame,
+            text="🎯 Select Orders",
+            font=("Helvetica", 10, "bold"),
+            bg=LIGHT_BG,
+            fg=TEXT_COLOR
+        ).pack(anchor="w")
+        filter_frame = tk.Frame(scrollable_frame, bg=LIGHT_BG)
+        filter_frame.pack(fill="x", pady=(4, 4))
+        self.selection_filters = {}
+        for column, (label, field) in enumerate(SELECTION_FIELDS.items()):
+            tk.Label(filter_frame, text=label, font=("Helvetica", 9), bg=LIGHT_BG, fg=LIGHT_TEXT).grid(
+                row=0, column=column, sticky="w", padx=(0, 8)
+            )
+            box = ttk.Combobox(filter_frame, values=[ANY_VALUE], state="readonly", width=18)
+            box.set(ANY_VALUE)
+            box.grid(row=1, column=column, sticky="we", padx=(0, 8))
+            self.selection_filters[field] = box
+        self.expires_from = tk.StringVar()
+        self.expires_to = tk.StringVar()
+        for column, (label, var) in enumerate(
+            (("Expires from (DD-MM-YYYY)", self.expires_from), ("Expires to", self.expires_to))
+        ):
+            tk.Label(filter_frame, text=label, font=("Helvetica", 9), bg=LIGHT_BG, fg=LIGHT_TEXT).grid(
+                row=2, column=column, sticky="w", padx=(0, 8), pady=(6, 0)
+            )
+            tk.Entry(filter_frame, textvariable=var, width=20).grid(row=3, column=column, sticky="we", padx=(0, 8))
+        tk.Button(
+            filter_frame,
+            text="This week",
+            command=self._select_this_week,
+            font=("Helvetica", 9),
+            relief=tk.FLAT
+        ).grid(row=3, column=2, sticky="w")
+        ModernButton(
+            scrollable_frame,
+            text="🎯 Generate Selected Orders",
+            command=self._generate_selection,
+            color=PRIMARY_COLOR
+        ).pack(pady=(4, 12), fill="x", padx=0)
+        
+        # Recent export jobs (double-click: open folder / show error)
+        tk.Label(
+            scrollable_frame,
+            text="🧾 Export Jobs",
+            font=("Helvetica", 10, "bold"),
+            bg=LIGHT_BG,
+            fg=TEXT_COLOR
+        ).pack(anchor="w")
+        self.jobs_list = tk.Listbox(
+            scrollable_frame,
+            height=4,
+            font=("Courier", 9),
+            bg=CARD_BG,
+            fg=TEXT_COLOR,
+            relief=tk.FLAT,
+            activestyle="none",
+            selectbackground=PRIMARY_COLOR
+        )
+        self.jobs_list.pack(fill="x", pady=(4, 12))
+        self.jobs_list.bind("<Double-Button-1>", self._open_job)
+        
+        ModernButton(
+            scrollable_frame,
+            text="🏷️ Print Labels for Selected Job",
+            command=self._print_labels,
+            color=PRIMARY_COLOR
+        ).pack(pady=(0, 12), fill="x", padx=0)
+        
+        # Push the selected job's file straight to GoSwift (only once an upload URL is set)
+        if (get_setting("goswift_upload", {}) or {}).get("url"):
+            ModernButton(
+                scrollable_frame,
+                text="☁️ Upload Selected Job to GoSwift",
+                command=self._upload_job,
+                color=PRIMARY_COLOR
+            ).pack(pady=(0, 12), fill="x", padx=0)
+        
+        if self.ledger is not None:
+            ModernButton(
+                scrollable_frame,
+                text="🔎 Find Exported PO",
+                command=self._lookup_exported_po,
+                color=PRIMARY_COLOR
+            ).pack(pady=(0, 12), fill="x", padx=0)
+        
         # ===== DATA SOURCES SECTION =====
         sources_label = tk.Label(
             scrollable_frame,
@@ -531,9 +872,28 @@ class GoSwiftUI:
             color=PRIMARY_COLOR
         ).pack(pady=3, fill="x", padx=0)
 
+        # Data quality of the current generation (label-ready vs blocked POs)
+        self.quality_card = StatusCard(scrollable_frame, "🩺 Data Quality")
+        self.quality_card.pack(fill="x", pady=(12, 5), padx=0)
+
+        ModernButton(
+            scrollable_frame,
+            text="↩️ Rollback to Previous Data",
+            command=self._rollback,
+            color=WARNING_COLOR
+        ).pack(pady=(12, 3), fill="x", padx=0)
+
     # ============ ACTIONS ============
     def _update_internet_status(self):
-        if internet_check():
+        """Check connectivity off the Tk thread (the socket timeout would freeze the window)"""
+        def check():
+            online = internet_check()
+            self.root.after(0, lambda: self._show_internet_status(online))
+
+        threading.Thread(target=check, daemon=True).start()
+
+    def _show_internet_status(self, online):
+        if online:
             self.internet_status.config(text="🌐 Online", fg=SUCCESS_COLOR)
         else:
             self.internet_status.config(text="🌐 Offline", fg=ERROR_COLOR)
@@ -546,22 +906,317 @@ class GoSwiftUI:
             messagebox.showwarning("Input Error", "Enter at least one order number")
             return
 
-        orders = [o.strip() for o in raw.splitlines() if o.strip()]
-        try:
-            path = self.exporter.export(orders)
-            
-            response = messagebox.askyesno(
-        "✅ CSV Generated",
-        f"CSV generated successfully!\n\n{path}\n\nDo you want to open the folder?"
-    )
-            
-            if response:
-                self._open_folder(path)
-            
-            self.text_input.delete("1.0", tk.END)
-            
-        except Exception as e:
-            messagebox.showerror("❌ Error", str(e))
+        generation = self.generations.current
+        if generation is None:
+            messagebox.showwarning("Please wait", "Data is still loading")
+            return
+
+        intake = parse_order_input(raw)
+        if intake.duplicates:
+            print(f"Skipping duplicate orders: {', '.join(intake.duplicates)}")
+        orders = self._without_blocked(intake.orders, generation)
+        if not orders:
+            return
+        self._submit_export(orders, generation, intake.summary())
+        self.text_input.delete("1.0", tk.END)
+
+    def _without_blocked(self, orders, generation):
+        """Check the batch against the quality scan; offer to continue with the label-ready POs"""
+        if generation.quality is None:
+            return orders
+        blocked = generation.quality.blocked(orders)
+        if not blocked:
+            return orders
+        details = "\n".join(f"{po}: {', '.join(reasons)}" for po, reasons in list(blocked.items())[:10])
+        if len(blocked) > 10:
+            details += f"\n... and {len(blocked) - 10} more"
+        ready = [po for po in orders if po not in blocked]
+        if not ready:
+            messagebox.showerror("❌ Orders Blocked", f"None of these orders can be labelled:\n\n{details}")
+            return []
+        if not messagebox.askyesno(
+            "⚠️ Some Orders Blocked",
+            f"{len(blocked)} of {len(orders)} orders cannot be labelled:\n\n{details}\n\n"
+            f"Generate the other {len(ready)}?"
+        ):
+            return []
+        return ready
+
+    def _submit_export(self, orders, generation, label="", force=None):
+        """Queue an export on the job pool; the UI stays free for the next batch"""
+        # Pin this generation: a reload during the export cannot affect it.
+        # Big batches fan out to worker processes (one pool source per generation,
+        # published on first use); small ones build in-process.
+        return self.jobs.submit(
+            orders,
+            generation.parallel_builder,
+            force=self.force_export.get() if force is None else force,
+            generation=generation.number,
+            label=label.replace("\n", ", "),
+        )
+
+    def _update_pending_button(self):
+        count = len(self.pending_orders.pending) if self.pending_orders else 0
+        self.pending_button.config(text=f"⏳ Generate All Pending ({count})")
+
+    def _generate_pending(self):
+        """Queue every new or changed PO from the master diff"""
+        generation = self.generations.current
+        pending = self.pending_orders.pending if self.pending_orders else []
+        if generation is None or not pending:
+            messagebox.showinfo("Pending Orders", "No new or changed orders since the last master.")
+            return
+        pending = self._without_blocked(pending, generation)
+        if not pending:
+            return
+        preview = ", ".join(pending[:10]) + (" ..." if len(pending) > 10 else "")
+        if not messagebox.askyesno(
+            "⏳ Generate All Pending",
+            f"Generate {len(pending)} new or changed orders?\n\n{preview}"
+        ):
+            return
+        # Changed POs are in the export ledger already: only force brings them out again
+        changed = set(self.pending_orders.changed)
+        added = [po for po in pending if po not in changed]
+        if added:
+            job = self._submit_export(added, generation, "new in master")
+            self._pending_jobs.add(job.id)
+        if changed:
+            job = self._submit_export([po for po in pending if po in changed], generation,
+                                      "changed in master", force=True)
+            self._pending_jobs.add(job.id)
+
+    def _refresh_selection_filters(self):
+        """Fill the selection pick lists from the current master"""
+        generation = self.generations.current
+        if generation is None:
+            return
+        index = generation.master_orders.selection_index
+        for field, box in self.selection_filters.items():
+            box.config(values=[ANY_VALUE] + index.values(field))
+            if box.get() not in box.cget("values"):
+                box.set(ANY_VALUE)
+
+    def _select_this_week(self):
+        today = datetime.date.today()
+        monday = today - datetime.timedelta(days=today.weekday())
+        self.expires_from.set(monday.strftime(DATE_FORMAT))
+        self.expires_to.set((monday + datetime.timedelta(days=6)).strftime(DATE_FORMAT))
+
+    def _generate_selection(self):
+        """Queue every PO matching the selection filters"""
+        generation = self.generations.current
+        if generation is None:
+            messagebox.showwarning("Please wait", "Data is still loading")
+            return
+
+        dates = {}
+        for name, var in (("expires_from", self.expires_from), ("expires_to", self.expires_to)):
+            text = var.get().strip()
+            if not text:
+                dates[name] = None
+                continue
+            try:
+                dates[name] = datetime.datetime.strptime(text, DATE_FORMAT).date()
+            except ValueError:
+                messagebox.showwarning("Input Error", f"'{text}' is not a DD-MM-YYYY date")
+                return
+
+        filters = {
+            field: None if box.get() == ANY_VALUE else box.get()
+            for field, box in self.selection_filters.items()
+        }
+        if not any(filters.values()) and not any(dates.values()):
+            messagebox.showwarning("Input Error", "Choose at least one filter")
+            return
+
+        orders = generation.master_orders.select(**filters, **dates)
+        parts = [value for value in filters.values() if value]
+        if any(dates.values()):
+            parts.append(f"expiring {self.expires_from.get().strip() or '…'} to {self.expires_to.get().strip() or '…'}")
+        label = ", ".join(parts)
+        if not orders:
+            messagebox.showinfo("🎯 Select Orders", f"No orders match: {label}")
+            return
+        orders = self._without_blocked(orders, generation)
+        if not orders:
+            return
+        preview = ", ".join(orders[:10]) + (" ..." if len(orders) > 10 else "")
+        if not messagebox.askyesno(
+            "🎯 Generate Selected Orders",
+            f"Generate {len(orders)} orders ({label})?\n\n{preview}"
+        ):
+            return
+        self._submit_export(orders, generation, label)
+
+    def _on_job_update(self, job):
+        self._refresh_jobs()
+        if job.finished and job.id in self._pending_jobs:
+            self._pending_jobs.discard(job.id)
+            if job.status == DONE:
+                # Only what this job wrote; skipped POs (exported before) stay pending
+                failed = set(job.failed_orders)
+                self.pending_orders.mark_done(po for po in job.order_numbers if po not in failed)
+            self._update_pending_button()
+        if job.status == DONE:
+            summary = f"{len(job.order_numbers) - len(job.failed_orders)} orders exported"
+            if job.skipped_orders:
+                summary += f"\n{len(job.skipped_orders)} already exported - skipped"
+            if job.failed_orders:
+                summary += f"\n{len(job.failed_orders)} failed: {', '.join(job.failed_orders[:10])}"
+            if job.claimed_elsewhere:
+                summary += f"\n{len(job.claimed_elsewhere)} left to another running job"
+            if messagebox.askyesno(
+                f"✅ Job #{job.id} Done",
+                f"{summary}\n\n{job.output_path}\n\nDo you want to open the folder?"
+            ):
+                self._open_folder(job.output_path)
+        elif job.status == FAILED:
+            messagebox.showerror(f"❌ Job #{job.id} Failed", job.error)
+
+    def _refresh_jobs(self):
+        self.jobs_list.delete(0, tk.END)
+        for job in self.jobs.jobs()[:JOBS_SHOWN]:
+            self.jobs_list.insert(tk.END, job.summary())
+
+    def _open_job(self, event=None):
+        selection = self.jobs_list.curselection()
+        if not selection:
+            return
+        job = self.jobs.jobs()[selection[0]]
+        if job.status == DONE:
+            self._open_folder(job.output_path)
+        elif job.status == FAILED:
+            messagebox.showerror(f"Job #{job.id}", job.error)
+    
+    def _print_labels(self):
+        """One PDF page per box for the orders the selected job exported, next to its file"""
+        selection = self.jobs_list.curselection()
+        if not selection:
+            messagebox.showwarning("🏷️ Labels", "Select a finished export job first.")
+            return
+        job = self.jobs.jobs()[selection[0]]
+        if job.status != DONE:
+            messagebox.showwarning("🏷️ Labels", f"Job #{job.id} is {job.status} - only finished jobs have labels.")
+            return
+        failed = set(job.failed_orders)
+        orders = [po for po in job.order_numbers if po not in failed]
+        if not orders:
+            messagebox.showinfo("🏷️ Labels", f"Job #{job.id} exported no new orders.")
+            return
+        output_path = job.output_path.with_name(f"{job.output_path.stem}_labels.pdf")
+        
+        def render():
+            from src.exporters.label_pdf import LabelRenderer
+            try:
+                rows, _ = job.builder.build_records(orders)
+                renderer = LabelRenderer()
+                pages = renderer.render(rows, output_path)
+            except Exception as e:
+                error = str(e)
+                self.root.after(0, lambda: messagebox.showerror("❌ Labels Failed", error))
+                return
+            self.root.after(0, done, pages, renderer.replacements)
+        
+        def done(pages, replacements):
+            text = f"{pages} labels for {len(orders)} orders"
+            if replacements:
+                # Standard PDF fonts only cover Western European text
+                listed = ", ".join(list(replacements)[:10])
+                text += (
+                    f"\n\n⚠️ {len(replacements)} orders contain characters the label font cannot "
+                    f"print (shown as ?): {listed}"
+                )
+            if messagebox.askyesno(
+                "🏷️ Labels Ready",
+                f"{text}\n\n{output_path}\n\nDo you want to open the folder?"
+            ):
+                self._open_folder(output_path)
+        
+        threading.Thread(target=render, daemon=True).start()
+    
+    def _upload_job(self):
+        """Upload the selected finished job in the background; the per-PO report lands next to the file"""
+        selection = self.jobs_list.curselection()
+        if not selection:
+            messagebox.showwarning("☁️ Upload", "Select a finished export job first.")
+            return
+        job = self.jobs.jobs()[selection[0]]
+        if job.status != DONE:
+            messagebox.showwarning("☁️ Upload", f"Job #{job.id} is {job.status} - only finished jobs can be uploaded.")
+            return
+        if not messagebox.askyesno("☁️ Upload", f"Upload {job.output_path.name} to GoSwift?"):
+            return
+        
+        def upload():
+            from src.uploaders.goswift_uploader import FAILED as UPLOAD_FAILED, REJECTED, GoSwiftUploader
+            try:
+                uploader = GoSwiftUploader()
+                report = uploader.upload_file(job.output_path)
+                uploader.close()
+            except Exception as e:
+                error = str(e)
+                self.root.after(0, lambda: messagebox.showerror("❌ Upload Failed", error))
+                return
+            problems = [r for r in report.results if r.status in (REJECTED, UPLOAD_FAILED)]
+            text = report.summary()
+            if problems:
+                text += "\n\n" + "\n".join(f"{r.order_number}: {r.status} {r.message}" for r in problems[:10])
+            self.root.after(0, lambda: messagebox.showinfo(f"☁️ Job #{job.id} Upload", text))
+        
+        threading.Thread(target=upload, daemon=True).start()
+    
+    def _lookup_exported_po(self):
+        """Show which file(s) a PO was exported to"""
+        po = simpledialog.askstring("Find Exported PO", "PO number:", parent=self.root)
+        if not po:
+            return
+        parsed = parse_order_input(po).orders
+        po = parsed[0] if parsed else po.strip()
+        exports = self.ledger.lookup(po)
+        if not exports:
+            messagebox.showinfo("Find Exported PO", f"{po} has not been exported yet.")
+            return
+        lines = [f"{e['exported_at']}  →  {Path(e['file_path']).name}" for e in exports]
+        messagebox.showinfo("Find Exported PO", f"{po} was exported {len(exports)} time(s):\n\n" + "\n".join(lines))
+
+    # ============ AUTOCOMPLETE ============
+    def _on_order_typed(self, event):
+        """Suggest PO numbers matching the start or end of the current line"""
+        if event.keysym == "Down" and self.suggestions.winfo_ismapped():
+            self.suggestions.focus_set()
+            self.suggestions.selection_set(0)
+            return
+
+        generation = self.generations.current
+        query = self.text_input.get("insert linestart", "insert lineend").strip()
+        matches = []
+        if generation is not None and len(query) >= MIN_AUTOCOMPLETE_CHARS:
+            matches = generation.master_orders.search(query, limit=AUTOCOMPLETE_LIMIT)
+            # Nothing to suggest when the line already is a complete PO
+            if matches == [query.upper()]:
+                matches = []
+
+        self.suggestions.delete(0, tk.END)
+        if not matches:
+            self.suggestions.pack_forget()
+            return
+        for po in matches:
+            self.suggestions.insert(tk.END, po)
+        self.suggestions.pack(fill="x", padx=10, pady=(0, 10))
+
+    def _accept_suggestion(self, event=None):
+        """Replace the current line with the chosen PO"""
+        selection = self.suggestions.curselection()
+        if not selection:
+            return
+        po = self.suggestions.get(selection[0])
+        self.text_input.delete("insert linestart", "insert lineend")
+        self.text_input.insert("insert linestart", po)
+        self.text_input.mark_set("insert", "insert lineend")
+        self.text_input.insert("insert", "\n")
+        self.suggestions.pack_forget()
+        self.text_input.focus_set()
     
     def _open_folder(self, file_path):
             """Open folder containing the file"""
@@ -580,27 +1235,41 @@ class GoSwiftUI:
 
     def _upload_master(self):
         self._upload_generic(
-            "master_orders", "master.xlsx", "master_meta.json", self.master_card
+            "master_orders", "master_meta.json", self.master_card
         )
 
     def _upload_location_master(self):
         self._upload_generic(
-            "location_master", "location_master.xlsx", "location_master_meta.json",
+            "location_master", "location_master_meta.json",
             self.location_card
         )
 
     def _upload_marketplace_mapping(self):
         self._upload_generic(
-            "marketplace_mapping", "marketplace_mapping.xlsx",
+            "marketplace_mapping",
             "marketplace_mapping_meta.json", self.marketplace_card
         )
 
-    def _upload_generic(self, folder, dest_file, meta_file, card_widget):
+    def _upload_generic(self, folder, meta_file, card_widget):
+        from src.loaders.base_loader import excel_suffix, readable_suffixes
+
+        # Every workbook type an installed Excel engine can read
+        readable = readable_suffixes()
         file_path = filedialog.askopenfilename(
-            filetypes=[("Excel Files", "*.xlsx *.xls")]
+            filetypes=[("Excel Files", " ".join(f"*{suffix}" for suffix in readable)), ("All Files", "*.*")]
         )
         if not file_path:
             return
+
+        # Keep the real type: from the content, so a mislabelled export still gets the right engine
+        suffix = excel_suffix(Path(file_path))
+        if suffix not in readable:
+            messagebox.showerror(
+                "❌ Unsupported File",
+                f"{Path(file_path).name} is not a workbook type that can be read here.\n"
+                f"Supported: {', '.join(readable)}"
+            )
+            return
         
         if folder == "master_orders":
             schema = MASTER_SCHEMA
@@ -612,6 +1281,7 @@ class GoSwiftUI:
             messagebox.showerror("Internal Error", "Unknown upload type")
             return
         
+        from src.utils import excel_validator
         ok, error = excel_validator.validate_excel(
             Path(file_path),
             schema["sheet"],
@@ -623,18 +1293,22 @@ class GoSwiftUI:
             return
 
         try:
-            dest = self.project_root / "data" / folder / dest_file
-            shutil.copy(file_path, dest)
+            dest = self.project_root / "data" / folder / f"{DATA_FILES[folder]}{suffix}"
+            version = snapshot_store.install_version(Path(file_path), dest)
+            snapshot_store.retire_other_types(dest, data_suffixes())
+            if self.watcher is not None:
+                # This upload triggers its own reload below
+                self.watcher.acknowledge(folder)
 
             now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             meta_path = self.project_root / "data" / folder / meta_file
             with open(meta_path, "w") as f:
                 json.dump({"last_updated": now}, f)
 
-            card_widget.set_status(f"✅ {now.split(' ')[0]}", SUCCESS_COLOR)
+            card_widget.set_status("🔄 Reloading...", LIGHT_TEXT)
             messagebox.showinfo("✅ Success", f"{folder.replace('_', ' ').title()} updated")
 
-            self._load_engine_async()
+            self._reload_source_async(folder, dest, version)
 
         except Exception as e:
             messagebox.showerror("❌ Upload Error", str(e))
@@ -647,4 +1321,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Parallel builds start worker processes; needed when the app is frozen into an executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+# Cold-start guard for the Tk app: importing main_ui must stay cheap and
+# must not pull in pandas (or anything built on it) before the window is up.
+#
+#   python -m pytest src/ui/test_startup_import.py
+
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative `-X importtime` budget for `import src.ui.main_ui`, tkinter included
+IMPORT_BUDGET_MS = 500
+
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "pyarrow", "python_calamine", "polars"]
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_ms() -> float:
+    result = _run("-X", "importtime", "-c", "import src.ui.main_ui")
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "src.ui.main_ui":
+            return int(parts[1]) / 1000
+    raise AssertionError("src.ui.main_ui not found in -X importtime output")
+
+
+def test_main_ui_does_not_import_heavy_modules():
+    code = (
+        "import sys, src.ui.main_ui; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = _run("-c", code).stdout.strip()
+    assert loaded == "", f"main_ui imports {loaded} at module level"
+
+
+def test_main_ui_import_time_budget():
+    _import_time_ms()  # warm-up: byte-compile and fill the OS cache
+    elapsed = min(_import_time_ms() for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, f"import src.ui.main_ui took {elapsed:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
@@ -0,0 +1,42 @@
+# =====================================================
+# UPLOADER BENCHMARK
+# =====================================================
+# Uploads a synthetic batch to the local mock server with simulated
+# latency: one batch at a time vs. pooled workers, and a run with
+# injected 429 / 503 errors to see what the retries cost.
+#
+#   python -m src.uploaders.bench_uploader 20000
+
+import sys
+
+from src.uploaders.goswift_uploader import GoSwiftUploader
+from src.uploaders.mock_server import start_mock_server
+
+
+def synthetic_rows(n: int, prefix: str):
+    return [
+        {"order_number": f"{prefix}{i:08d}", "number_of_boxes": str(1 + i % 8), "customer_pincode": "560001"}
+        for i in range(n)
+    ]
+
+
+def run(n: int, latency: float = 0.05):
+    cases = [
+        ("1 worker", {"workers": 1}, {}),
+        ("8 workers", {"workers": 8}, {}),
+        ("8 workers, 20% errors", {"workers": 8}, {"fail_rate": 0.1, "throttle_rate": 0.1}),
+    ]
+    for number, (name, options, faults) in enumerate(cases):
+        server, url = start_mock_server(latency=latency, seed=number, **faults)
+        try:
+            uploader = GoSwiftUploader(url, batch_size=200, backoff=0.01, max_retries=10, **options)
+            report = uploader.upload_rows(synthetic_rows(n, f"BENCH{number}"))
+            uploader.close()
+            requests = server.state.requests
+        finally:
+            server.shutdown()
+        print(f"{name:24s} {report.seconds:7.2f} s  {requests:5d} requests  {report.counts()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
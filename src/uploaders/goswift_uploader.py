@@ -0,0 +1,262 @@
+# =====================================================
+# GOSWIFT UPLOADER
+# =====================================================
+# Sends exported GoSwift rows to the bulk order endpoint instead
+# of uploading the CSV on the portal by hand.
+#
+# - rows go out in batches of `batch_size`, on `workers` threads
+# - each thread keeps one keep-alive connection (stdlib http.client)
+# - at most `max_in_flight` batches are queued or running at once;
+#   the producer waits for a slot (backpressure)
+# - every batch carries an Idempotency-Key derived from its order
+#   numbers, so a retried or re-run batch cannot create orders twice
+# - connection errors, 429 and 5xx are retried with exponential
+#   backoff and jitter (Retry-After is honoured)
+# - the outcome of every PO is written to a CSV report
+#
+# Settings: "goswift_upload" in config.json. Test and benchmark
+# against src/uploaders/mock_server.py.
+
+import csv
+import hashlib
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from src.utils.config import get_setting
+
+BULK_PATH = "/api/v1/orders/bulk"
+
+UPLOADED = "uploaded"
+DUPLICATE = "duplicate"   # already on GoSwift: nothing to do
+REJECTED = "rejected"     # GoSwift refused the row; fix the data and upload again
+FAILED = "failed"         # no answer after every retry
+
+SERVER_STATUS = {"created": UPLOADED, "duplicate": DUPLICATE, "rejected": REJECTED}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class UploadResult:
+    order_number: str
+    status: str
+    message: str = ""
+    http_status: int = 0
+    attempts: int = 0
+    batch: int = 0
+
+
+@dataclass
+class UploadReport:
+    results: List[UploadResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def counts(self) -> Dict[str, int]:
+        counts = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    def summary(self) -> str:
+        counts = self.counts()
+        parts = [f"{counts[status]} {status}" for status in (UPLOADED, DUPLICATE, REJECTED, FAILED) if counts.get(status)]
+        return f"{len(self.results)} orders in {self.seconds:.1f}s: " + ", ".join(parts)
+
+    def write_csv(self, path: Path) -> Path:
+        names = [f.name for f in fields(UploadResult)]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for result in self.results:
+                writer.writerow([getattr(result, name) for name in names])
+        return path
+
+
+def idempotency_key(order_numbers: List[str]) -> str:
+    """Same POs -> same key, whatever order they are in"""
+    digest = hashlib.sha256("\n".join(sorted(order_numbers)).encode("utf-8")).hexdigest()
+    return f"goswift-{digest[:40]}"
+
+
+def read_rows(path: Path) -> List[dict]:
+    """Rows of an exported GoSwift file (CSV natively, other formats through pandas)"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+    import pandas as pd
+    return pd.read_excel(path, dtype=str).fillna("").to_dict("records")
+
+
+class ConnectionPool:
+    """One keep-alive HTTP(S) connection per thread, reopened after any transport error"""
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def _discard(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def post(self, path: str, body: bytes, headers: dict):
+        """(status, headers, body) - raises OSError / HTTPException on transport errors"""
+        conn = self._connection()
+        try:
+            conn.request("POST", self.prefix + path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self._discard()
+            raise
+        if response.will_close:
+            self._discard()
+        return response.status, dict(response.getheaders()), data
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+class GoSwiftUploader:
+    def __init__(
+        self,
+        base_url: str = None,
+        token: str = None,
+        batch_size: int = None,
+        workers: int = None,
+        max_in_flight: int = None,
+        max_retries: int = None,
+        backoff: float = None,
+        timeout: float = None,
+    ):
+        settings = get_setting("goswift_upload", {}) or {}
+        self.base_url = base_url or settings.get("url")
+        if not self.base_url:
+            raise ValueError("No GoSwift upload URL. Set goswift_upload.url in config.json")
+        self.token = token if token is not None else settings.get("token", "")
+        self.batch_size = batch_size or settings.get("batch_size", 200)
+        self.workers = workers or settings.get("workers", 4)
+        self.max_in_flight = max_in_flight or settings.get("max_in_flight", self.workers * 2)
+        self.max_retries = max_retries if max_retries is not None else settings.get("max_retries", 4)
+        self.backoff = backoff if backoff is not None else settings.get("backoff_seconds", 0.5)
+        self.pool = ConnectionPool(self.base_url, timeout or settings.get("timeout_seconds", 30))
+
+    # ============ PUBLIC ============
+    def upload_file(self, path: Path, report_path: Path = None) -> UploadReport:
+        """Upload an exported file; the per-PO report goes next to it unless given"""
+        path = Path(path)
+        report = self.upload_rows(read_rows(path))
+        report.write_csv(report_path or path.with_name(f"{path.stem}_upload_report.csv"))
+        return report
+
+    def upload_rows(self, rows: List[dict]) -> UploadReport:
+        start = time.perf_counter()
+        batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        futures = []
+
+        def run(number, batch):
+            try:
+                return self._send_batch(number, batch)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="goswift-upload") as pool:
+            for number, batch in enumerate(batches, start=1):
+                slots.acquire()  # backpressure: wait while max_in_flight batches are pending
+                futures.append(pool.submit(run, number, batch))
+
+        report = UploadReport()
+        for future in futures:
+            report.results.extend(future.result())
+        report.seconds = time.perf_counter() - start
+        print(f"{'✅' if not report.counts().get(FAILED) else '⚠️'} GoSwift upload: {report.summary()}")
+        return report
+
+    def close(self):
+        self.pool.close()
+
+    # ============ BATCH ============
+    def _send_batch(self, number: int, rows: List[dict]) -> List[UploadResult]:
+        order_numbers = [str(row.get("order_number", "")) for row in rows]
+        body = json.dumps({"orders": rows}, default=str).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key(order_numbers),
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                status, response_headers, data = self.pool.post(BULK_PATH, body, headers)
+                error = f"HTTP {status}"
+            except (OSError, http.client.HTTPException) as e:
+                status, response_headers, data, error = 0, {}, b"", f"{type(e).__name__}: {e}"
+
+            if status == 200:
+                return self._results(number, order_numbers, data, attempt)
+            if (status and status not in RETRY_STATUSES) or attempt > self.max_retries:
+                final = REJECTED if 400 <= status < 500 and status != 429 else FAILED
+                message = f"{error} {data[:200].decode('utf-8', 'replace')}".strip()
+                return [
+                    UploadResult(po, final, message, status, attempt, number)
+                    for po in order_numbers
+                ]
+            time.sleep(self._delay(attempt, response_headers))
+
+    def _delay(self, attempt: int, headers: dict) -> float:
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+    @staticmethod
+    def _results(number: int, order_numbers: List[str], data: bytes, attempts: int) -> List[UploadResult]:
+        try:
+            answers = {item["order_number"]: item for item in json.loads(data)["results"]}
+        except (ValueError, KeyError, TypeError):
+            answers = {}
+        results = []
+        for po in order_numbers:
+            answer = answers.get(po)
+            if answer is None:
+                results.append(UploadResult(po, FAILED, "missing from GoSwift response", 200, attempts, number))
+            else:
+                status = SERVER_STATUS.get(answer.get("status"), FAILED)
+                results.append(UploadResult(po, status, answer.get("message", ""), 200, attempts, number))
+        return results
@@ -0,0 +1,149 @@
+# =====================================================
+# MOCK GOSWIFT SERVER
+# =====================================================
+# Local stand-in for the GoSwift bulk order endpoint, so the
+# uploader can be tested and benchmarked offline.
+#
+#   python -m src.uploaders.mock_server --port 8765 --fail-rate 0.1
+#
+# POST /api/v1/orders/bulk   {"orders": [{...GoSwift row...}, ...]}
+#   -> 200 {"results": [{"order_number", "status", "message"}, ...]}
+#   status: created | duplicate | rejected
+# Responses are cached per Idempotency-Key header, like the real
+# service: a retried batch gets the first answer back, unchanged.
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BULK_PATH = "/api/v1/orders/bulk"
+
+
+class MockGoSwiftState:
+    def __init__(self, token=None, fail_rate=0.0, throttle_rate=0.0, latency=0.0, seed=None):
+        self.token = token
+        self.fail_rate = fail_rate
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.orders = {}       # order_number -> row as received
+        self.responses = {}    # Idempotency-Key -> cached response body
+        self.requests = 0
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+
+def validate(row: dict) -> str:
+    """Reason the row would be refused, or "" """
+    if not str(row.get("order_number", "")).strip():
+        return "order_number is required"
+    try:
+        if int(str(row.get("number_of_boxes", ""))) < 1:
+            return "number_of_boxes must be at least 1"
+    except ValueError:
+        return "number_of_boxes must be a whole number"
+    if not str(row.get("customer_pincode", "")).strip() or str(row.get("customer_pincode")) == "0":
+        return "customer_pincode is required"
+    return ""
+
+
+class MockGoSwiftHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the uploader's pooled connections are reused
+    state: MockGoSwiftState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        state = self.state
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        with state.lock:
+            state.requests += 1
+
+        if self.path != BULK_PATH:
+            return self._send(404, {"error": "not found"})
+        if state.token and self.headers.get("Authorization") != f"Bearer {state.token}":
+            return self._send(401, {"error": "invalid token"})
+        if state.latency:
+            time.sleep(state.latency)
+        if state.roll(state.throttle_rate):
+            return self._send(429, {"error": "slow down"}, {"Retry-After": "0"})
+        if state.roll(state.fail_rate):
+            return self._send(503, {"error": "temporarily unavailable"})
+
+        key = self.headers.get("Idempotency-Key")
+        with state.lock:
+            if key and key in state.responses:
+                return self._send(200, state.responses[key])
+        try:
+            orders = json.loads(body)["orders"]
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {"error": "body must be {\"orders\": [...]}"})
+
+        results = []
+        with state.lock:
+            for row in orders:
+                po = str(row.get("order_number", ""))
+                reason = validate(row)
+                if reason:
+                    results.append({"order_number": po, "status": "rejected", "message": reason})
+                elif po in state.orders:
+                    results.append({"order_number": po, "status": "duplicate", "message": "already created"})
+                else:
+                    state.orders[po] = row
+                    results.append({"order_number": po, "status": "created", "message": ""})
+            response = {"results": results}
+            if key:
+                state.responses[key] = response
+        self._send(200, response)
+
+    def _send(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_mock_server(host="127.0.0.1", port=0, **options):
+    """Serve in a daemon thread. Returns (server, base_url); call server.shutdown() to stop."""
+    state = MockGoSwiftState(**options)
+    handler = type("BoundMockGoSwiftHandler", (MockGoSwiftHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the GoSwift bulk upload API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_mock_server(
+        port=args.port,
+        token=args.token,
+        fail_rate=args.fail_rate,
+        throttle_rate=args.throttle_rate,
+        latency=args.latency,
+    )
+    print(f"✅ Mock GoSwift listening on {url}{BULK_PATH} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,77 @@
+# Uploader against the bundled mock GoSwift server.
+#
+#   python -m pytest src/uploaders/test_goswift_uploader.py
+
+import pytest
+
+from src.uploaders.goswift_uploader import DUPLICATE, REJECTED, UPLOADED, GoSwiftUploader, read_rows
+from src.uploaders.mock_server import start_mock_server
+
+
+def rows(n, start=0):
+    return [
+        {"order_number": f"FBSWN{start + i:08d}", "number_of_boxes": "2", "customer_pincode": "560001"}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(**options):
+        server, url = start_mock_server(**options)
+        servers.append(server)
+        return server, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_uploads_every_row_in_batches(server):
+    mock, url = server(token="secret")
+    uploader = GoSwiftUploader(url, token="secret", batch_size=7, workers=3, max_in_flight=2)
+    report = uploader.upload_rows(rows(50))
+    assert [r.order_number for r in report.results] == [row["order_number"] for row in rows(50)]
+    assert report.counts() == {UPLOADED: 50}
+    assert len(mock.state.orders) == 50
+
+
+def test_retries_transient_errors_without_creating_twice(server):
+    mock, url = server(fail_rate=0.4, throttle_rate=0.2, seed=1)
+    uploader = GoSwiftUploader(url, batch_size=5, workers=4, max_retries=20, backoff=0.001)
+    report = uploader.upload_rows(rows(60))
+    assert report.counts() == {UPLOADED: 60}
+    assert max(r.attempts for r in report.results) > 1
+
+    # Same batches again: answered from the idempotency cache, nothing new created
+    again = uploader.upload_rows(rows(60))
+    assert again.counts() == {UPLOADED: 60}
+    assert len(mock.state.orders) == 60
+
+    # Different batching: the server reports the POs it already has
+    regrouped = GoSwiftUploader(url, batch_size=7, max_retries=20, backoff=0.001).upload_rows(rows(60))
+    assert regrouped.counts() == {DUPLICATE: 60}
+
+
+def test_rejected_rows_and_report(server, tmp_path):
+    _, url = server()
+    bad = rows(3)
+    bad[1]["number_of_boxes"] = ""
+    csv_path = tmp_path / "GoSwift.csv"
+    csv_path.write_text("order_number,number_of_boxes,customer_pincode\n" + "\n".join(
+        f"{r['order_number']},{r['number_of_boxes']},{r['customer_pincode']}" for r in bad
+    ) + "\n", encoding="utf-8")
+    assert read_rows(csv_path) == bad
+
+    report = GoSwiftUploader(url).upload_file(csv_path)
+    assert [r.status for r in report.results] == [UPLOADED, REJECTED, UPLOADED]
+    assert (tmp_path / "GoSwift_upload_report.csv").read_text().count("\n") == 4
+
+
+def test_bad_token_is_not_retried(server):
+    _, url = server(token="secret")
+    report = GoSwiftUploader(url, token="wrong", max_retries=5, backoff=0.001).upload_rows(rows(3))
+    assert report.counts() == {REJECTED: 3}
+    assert {r.attempts for r in report.results} == {1}
@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_PATH = PROJECT_ROOT / "config" / "config.json"
+
+
+def load_config(config_path: Path = CONFIG_PATH) -> dict:
+    """Read config.json. Returns an empty dict if it is missing or unreadable."""
+    try:
+        with open(config_path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def get_setting(key: str, default=None, config_path: Path = CONFIG_PATH):
+    """Single setting from config.json, with a default when not configured"""
+    return load_config(config_path).get(key, default)
@@ -0,0 +1,121 @@
+# =====================================================
+# DATA FOLDER WATCHER
+# =====================================================
+# Polls the data/* workbooks by (mtime, size). A change is only
+# reported once the file has stopped changing for `settle_seconds`
+# and opens as a complete workbook, so a half-copied master.xlsx
+# from the ERP export job is never loaded. A key can watch several
+# file names (master.xlsx, master.xls, ...); the newest one counts.
+
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+
+def _stat(path: Path) -> Optional[Tuple[float, int]]:
+    try:
+        st = path.stat()
+        return st.st_mtime, st.st_size
+    except OSError:
+        return None
+
+
+def _is_complete(path: Path) -> bool:
+    """xlsx / ods files are zip archives; a partial copy has no central directory yet"""
+    if path.suffix.lower() in (".xlsx", ".xlsm", ".xlsb", ".ods"):
+        return zipfile.is_zipfile(path)
+    return True
+
+
+class DataWatcher:
+    def __init__(
+        self,
+        files: Dict[str, Union[Path, Iterable[Path]]],
+        on_change: Callable[[str, Path], None],
+        poll_seconds: float = 2.0,
+        settle_seconds: float = 3.0,
+    ):
+        """
+        files: key -> file to watch (e.g. "master_orders" -> data/master_orders/master.xlsx),
+            or a list of names the file can have (the newest existing one is watched)
+        on_change: called from the watcher thread with (key, path) once a change has settled
+        """
+        self.files = {
+            key: [Path(paths)] if isinstance(paths, (str, Path)) else [Path(p) for p in paths]
+            for key, paths in files.items()
+        }
+        self.on_change = on_change
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+
+        # Guards _seen / _pending: acknowledge() runs on the Tk thread, poll() on the watcher thread
+        self._lock = threading.Lock()
+        self._seen = {key: self._state(key) for key in self.files}
+        self._pending = {}  # key -> (stat, first time this stat was observed)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DataWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _state(self, key: str) -> Optional[Tuple[Path, float, int]]:
+        """(file, mtime, size) of the newest file for `key`; a switch of file name is a change too"""
+        newest = None
+        for path in self.files[key]:
+            stat = _stat(path)
+            if stat is not None and (newest is None or stat[0] > newest[1]):
+                newest = (path, *stat)
+        return newest
+
+    def acknowledge(self, key: str):
+        """Mark the current file state as already loaded (e.g. after an upload from the UI)"""
+        current = self._state(key)
+        with self._lock:
+            self._seen[key] = current
+            self._pending.pop(key, None)
+
+    def poll(self):
+        """One polling pass. Public so it can be driven without the thread."""
+        now = time.monotonic()
+        settled = []
+        with self._lock:
+            for key in self.files:
+                current = self._state(key)
+                if current is None or current == self._seen.get(key):
+                    self._pending.pop(key, None)
+                    continue
+
+                pending = self._pending.get(key)
+                if pending is None or pending[0] != current:
+                    # New or still-growing file: restart the settle timer
+                    self._pending[key] = (current, now)
+                    continue
+
+                path = current[0]
+                if now - pending[1] < self.settle_seconds or not _is_complete(path):
+                    continue
+
+                self._seen[key] = current
+                self._pending.pop(key, None)
+                settled.append((key, path))
+
+        # Outside the lock: the callback may acknowledge() other files
+        for key, path in settled:
+            print(f"🔄 Detected updated file: {path}")
+            try:
+                self.on_change(key, path)
+            except Exception as e:
+                print(f"❌ Reload callback failed for {key}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.poll()
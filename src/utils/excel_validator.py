@@ -1,15 +1,20 @@
 import pandas as pd
 from pathlib import Path
 
+from src.loaders.base_loader import engine_chain, configured_engine, read_excel
+
 
 def validate_excel(file_path: Path, sheet_name: str, required_columns: set):
     try:
-        xls = pd.ExcelFile(file_path)
+        engine = engine_chain(file_path, configured_engine())[0]
+        with pd.ExcelFile(file_path, engine=engine) as xls:
+            sheet_names = xls.sheet_names
         
-        if isinstance(sheet_name, str) and sheet_name not in xls.sheet_names:
-            return False, f"Required sheet '{sheet_name}' not found in the Excel file.\n Available sheets: {xls.sheet_names}"
+        if isinstance(sheet_name, str) and sheet_name not in sheet_names:
+            return False, f"Required sheet '{sheet_name}' not found in the Excel file.\n Available sheets: {sheet_names}"
         
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        # Header row only - the loader parses the data later
+        df = read_excel(file_path, sheet_name=sheet_name, nrows=0)
         
         df.columns = (
             df.columns
@@ -0,0 +1,63 @@
+# =====================================================
+# ORDER NUMBER INTAKE
+# =====================================================
+# Turns whatever the dispatcher pasted (one per line, a row
+# copied from Excel, comma lists...) into a clean, de-duplicated
+# list of PO numbers in the same canonical form MasterOrdersLoader
+# uses for its index.
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Separators seen in pastes: newlines, tabs (Excel rows), commas, semicolons, pipes, spaces
+SEPARATORS = re.compile(r"[\s,;|]+")
+
+# Invisible characters that ride along with copy-paste from chats / web portals
+ZERO_WIDTH = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+
+# Quotes left around values copied out of CSVs
+QUOTE_CHARS = "\"'`"
+
+# Numeric POs read from Excel number cells come back as "12345.0"
+FLOAT_PO = re.compile(r"^(\d+)\.0$")
+
+
+def normalize_order_number(value) -> str:
+    """Canonical PO form: no invisible chars, no quotes/padding, upper case"""
+    text = ZERO_WIDTH.sub("", str(value))
+    text = text.strip().strip(QUOTE_CHARS).strip().upper()
+    return FLOAT_PO.sub(r"\1", text)
+
+
+@dataclass
+class IntakeResult:
+    orders: List[str] = field(default_factory=list)
+    # canonical PO -> how many extra times it was pasted
+    duplicates: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(self.duplicates.values())
+
+    def summary(self) -> str:
+        text = f"{len(self.orders)} unique order(s)"
+        if self.duplicates:
+            text += f", {self.duplicate_count} duplicate(s) skipped"
+        return text
+
+
+def parse_order_input(raw: str) -> IntakeResult:
+    """Tokenize pasted text on any separator, normalize and de-duplicate (keeps first-seen order)"""
+    result = IntakeResult()
+    seen = set()
+    for token in SEPARATORS.split(raw or ""):
+        po = normalize_order_number(token)
+        if not po:
+            continue
+        if po in seen:
+            result.duplicates[po] = result.duplicates.get(po, 0) + 1
+            continue
+        seen.add(po)
+        result.orders.append(po)
+    return result
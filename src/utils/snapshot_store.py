@@ -0,0 +1,128 @@
+# =====================================================
+# VERSIONED DATA SNAPSHOTS
+# =====================================================
+# Every workbook that becomes live data is first kept as an
+# immutable copy under data/<folder>/versions/. The live file
+# (data/<folder>/<name>.<ext>, ext being whatever workbook type
+# was uploaded) is only ever replaced by copying to a temp file in
+# the same folder and renaming it over the old one, so readers see
+# either the old or the new workbook, never a half-written one.
+
+import hashlib
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+VERSIONS_DIR = "versions"
+KEEP_VERSIONS = 10
+
+
+def _atomic_copy(source: Path, dest: Path):
+    """
+    Copy to a temp file next to dest, then rename over dest.
+    The copy gets a fresh mtime so caches keyed on the live file's mtime
+    (e.g. the Arrow snapshot) see it as new data.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def live_candidates(folder: Path, stem: str, suffixes: Iterable[str]) -> List[Path]:
+    """Every file name the live workbook `stem` can have, one per workbook type"""
+    return [Path(folder) / f"{stem}{suffix}" for suffix in suffixes]
+
+
+def live_file(folder: Path, stem: str, suffixes: Iterable[str]) -> Path:
+    """
+    The live workbook `stem` in `folder`, whatever its type (the newest if
+    several exist); `stem` + the first suffix when there is none yet.
+    """
+    candidates = live_candidates(folder, stem, suffixes)
+    existing = [path for path in candidates if path.exists()]
+    if not existing:
+        return candidates[0]
+    return max(existing, key=lambda path: path.stat().st_mtime)
+
+
+def retire_other_types(live_file: Path, suffixes: Iterable[str]):
+    """Remove live copies of the same workbook with another type, so only `live_file` is live"""
+    for other in live_candidates(live_file.parent, live_file.stem, suffixes):
+        if other != live_file:
+            other.unlink(missing_ok=True)
+
+
+def list_versions(live_file: Path) -> List[Path]:
+    """Stored versions of a live file, oldest first"""
+    versions_dir = live_file.parent / VERSIONS_DIR
+    if not versions_dir.exists():
+        return []
+    return sorted(versions_dir.glob(f"{live_file.stem}_*{live_file.suffix}"))
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    if a.stat().st_size != b.stat().st_size:
+        return False
+    return _digest(a) == _digest(b)
+
+
+def _new_version_path(live_file: Path) -> Path:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return live_file.parent / VERSIONS_DIR / f"{live_file.stem}_{stamp}{live_file.suffix}"
+
+
+def _prune(live_file: Path, keep: int, protect: Optional[Path] = None):
+    versions = list_versions(live_file)
+    for old in versions[:-keep] if keep > 0 else []:
+        if old != protect:
+            old.unlink(missing_ok=True)
+
+
+def install_version(source: Path, live_file: Path, keep: int = KEEP_VERSIONS) -> Path:
+    """
+    Store `source` as a new version and make it the live file.
+    Returns the version path, which stays valid for rollback.
+    """
+    version = _new_version_path(live_file)
+    _atomic_copy(Path(source), version)
+    _atomic_copy(version, live_file)
+    _prune(live_file, keep, protect=version)
+    return version
+
+
+def ensure_version(live_file: Path, keep: int = KEEP_VERSIONS) -> Optional[Path]:
+    """
+    Version matching the current live file, creating one if the live file was
+    replaced outside the app (e.g. dropped in by the ERP export job).
+    """
+    if not live_file.exists():
+        return None
+    versions = list_versions(live_file)
+    if versions and _same_file(versions[-1], live_file):
+        return versions[-1]
+    version = _new_version_path(live_file)
+    _atomic_copy(live_file, version)
+    _prune(live_file, keep, protect=version)
+    return version
+
+
+def restore_version(version: Path, live_file: Path):
+    """Make a stored version the live file again"""
+    if not version.exists():
+        raise FileNotFoundError(f"Snapshot version not found: {version}")
+    _atomic_copy(version, live_file)
@@ -0,0 +1,130 @@
+# Data folder watcher: settle period and half-copied workbooks.
+#
+#   python -m pytest src/utils/test_data_watcher.py
+
+import threading
+import zipfile
+
+import pytest
+
+from src.utils import data_watcher
+from src.utils.data_watcher import DataWatcher
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(data_watcher.time, "monotonic", clock)
+    return clock
+
+
+def write_workbook(path, content="x"):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", content)
+
+
+def watch(path, changes, settle=3.0):
+    return DataWatcher({"master_orders": path}, lambda key, p: changes.append(key), settle_seconds=settle)
+
+
+def test_change_is_reported_once_it_has_settled(tmp_path, clock):
+    path = tmp_path / "master.xlsx"
+    write_workbook(path)
+    changes = []
+    watcher = watch(path, changes)
+
+    write_workbook(path, "new data")
+    watcher.poll()
+    clock.now += 2
+    watcher.poll()
+    assert changes == []
+
+    clock.now += 1.5
+    watcher.poll()
+    watcher.poll()
+    assert changes == ["master_orders"]
+
+
+def test_growing_file_restarts_the_settle_timer(tmp_path, clock):
+    path = tmp_path / "master.xlsx"
+    changes = []
+    watcher = watch(path, changes)
+
+    path.write_bytes(b"PK\x03\x04 partial")
+    watcher.poll()
+    clock.now += 2.5
+    path.write_bytes(b"PK\x03\x04 partial, a bit longer")
+    watcher.poll()
+    clock.now += 2.5
+    watcher.poll()
+    assert changes == []
+
+
+def test_partial_zip_is_not_loaded(tmp_path, clock):
+    path = tmp_path / "master.xlsx"
+    changes = []
+    watcher = watch(path, changes)
+
+    # Settled, but no zip central directory yet: keep waiting
+    path.write_bytes(b"PK\x03\x04 half a workbook")
+    watcher.poll()
+    clock.now += 10
+    watcher.poll()
+    assert changes == []
+
+    write_workbook(path)
+    watcher.poll()
+    clock.now += 10
+    watcher.poll()
+    assert changes == ["master_orders"]
+
+
+def test_acknowledged_change_is_not_reported(tmp_path, clock):
+    path = tmp_path / "master.xlsx"
+    changes = []
+    watcher = watch(path, changes)
+
+    write_workbook(path)
+    watcher.poll()
+    watcher.acknowledge("master_orders")
+    clock.now += 10
+    watcher.poll()
+    assert changes == []
+
+
+def test_thread_picks_up_a_dropped_file(tmp_path):
+    path = tmp_path / "master.xlsx"
+    seen = threading.Event()
+    watcher = DataWatcher(
+        {"master_orders": path}, lambda key, p: seen.set(), poll_seconds=0.02, settle_seconds=0.05
+    )
+    watcher.start()
+    try:
+        write_workbook(path)
+        assert seen.wait(5)
+    finally:
+        watcher.stop()
+
+
+def test_upload_with_another_type_is_a_change(tmp_path, clock):
+    xlsx, xlsb = tmp_path / "master.xlsx", tmp_path / "master.xlsb"
+    write_workbook(xlsx)
+    changes = []
+    watcher = DataWatcher(
+        {"master_orders": [xlsx, xlsb]}, lambda key, p: changes.append((key, p.name)), settle_seconds=1
+    )
+
+    write_workbook(xlsb)
+    xlsx.unlink()
+    watcher.poll()
+    clock.now += 2
+    watcher.poll()
+    assert changes == [("master_orders", "master.xlsb")]
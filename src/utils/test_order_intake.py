@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from src.engine import correctness_harness as harness
+from src.engine.goswift_engine_builder import GoSwiftBuilder
+from src.exporters.goswift_csv_exporter import GoSwiftExporter
+from src.loaders.master_orders_loader import normalize_order_numbers
+from src.utils.order_intake import normalize_order_number, parse_order_input
+
+SPELLINGS = [
+    "FBSWN123", " fbswn123 ", "​FBSWN123﻿", "'FBSWN123'", '"fbswn123"', "`FBSWN123`",
+    "12345.0", "12345", " 12345.0 ", "12345.5", "PO-7.0", "", "   ", "ü-po",
+]
+
+
+def test_normalize_order_number():
+    assert normalize_order_number(" 'fbswn123'​ ") == "FBSWN123"
+    assert normalize_order_number("12345.0") == "12345"
+    assert normalize_order_number(12345.0) == "12345"
+    assert normalize_order_number("12345.5") == "12345.5"
+    assert normalize_order_number("") == ""
+
+
+def test_parse_order_input_splits_and_dedupes():
+    result = parse_order_input("po1, po2\tPO1\n'po3';po2 | PO4\r\n\n")
+    assert result.orders == ["PO1", "PO2", "PO3", "PO4"]
+    assert result.duplicates == {"PO1": 1, "PO2": 1}
+    assert result.summary() == "4 unique order(s), 2 duplicate(s) skipped"
+    assert parse_order_input(None).orders == []
+
+
+def test_vectorized_matches_scalar():
+    expected = [normalize_order_number(v) for v in SPELLINGS]
+    assert normalize_order_numbers(pd.Series(SPELLINGS, dtype=object)).tolist() == expected
+
+
+def test_polars_matches_scalar():
+    pl = pytest.importorskip("polars")
+    from src.loaders.master_orders_loader import normalize_order_numbers_expr
+
+    frame = pl.DataFrame({"po": SPELLINGS})
+    assert frame.select(normalize_order_numbers_expr(pl.col("po")))["po"].to_list() == [
+        normalize_order_number(v) for v in SPELLINGS
+    ]
+
+
+def test_master_spelling_found_and_kept(tmp_path):
+    files = harness.write_synthetic_data(tmp_path, 60, 0)
+    loaders = harness.load_excel(files, tmp_path)
+    builder = GoSwiftBuilder(*loaders)
+    master = loaders[0].get_dataframe()
+    spelled = master.loc[master["order_number"] != master["po_key"], "order_number"].tolist()
+    assert spelled, "synthetic master should contain POs needing normalization"
+
+    # A caller passing the master's own spelling (not normalized) finds the order
+    assert all(loaders[0].exists(po) for po in spelled)
+    _, failures = builder.build_records(spelled)
+    failed = {po for po, _ in failures}
+    raw = next(po for po in spelled if po not in failed)
+
+    exporter = GoSwiftExporter(builder, tmp_path / "out")
+    path = exporter.export([raw])
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    assert df["order_number"].tolist() == [raw]
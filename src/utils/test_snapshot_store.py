@@ -0,0 +1,86 @@
+# Versioned data snapshots: atomic installs, dedupe and pruning.
+#
+#   python -m pytest src/utils/test_snapshot_store.py
+
+import os
+
+import pytest
+
+from src.utils import snapshot_store
+from src.utils.snapshot_store import ensure_version, install_version, list_versions, restore_version
+
+
+@pytest.fixture
+def live(tmp_path):
+    return tmp_path / "master_orders" / "master.xlsx"
+
+
+def upload(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_install_stores_a_version_and_replaces_the_live_file(tmp_path, live):
+    version = install_version(upload(tmp_path, "a.xlsx", b"first"), live)
+    assert live.read_bytes() == b"first" and version.read_bytes() == b"first"
+    assert list_versions(live) == [version]
+    # No temp files left next to the live file or the versions
+    assert sorted(p.name for p in live.parent.rglob("*.tmp")) == []
+
+
+def test_failed_copy_leaves_the_live_file_alone(tmp_path, live, monkeypatch):
+    install_version(upload(tmp_path, "a.xlsx", b"first"), live)
+
+    def broken_copy(source, dest):
+        dest.write_bytes(b"half")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot_store.shutil, "copyfile", broken_copy)
+    with pytest.raises(OSError):
+        install_version(upload(tmp_path, "b.xlsx", b"second"), live)
+    assert live.read_bytes() == b"first"
+    assert list(live.parent.rglob(".*.tmp")) == []
+
+
+def test_ensure_version_reuses_an_identical_version(tmp_path, live):
+    version = install_version(upload(tmp_path, "a.xlsx", b"first"), live)
+    assert ensure_version(live) == version
+
+    # Replaced outside the app (e.g. by the ERP export): a new version is stored
+    live.write_bytes(b"dropped in")
+    dropped = ensure_version(live)
+    assert dropped != version and dropped.read_bytes() == b"dropped in"
+    assert ensure_version(live) == dropped
+    assert ensure_version(live.with_name("missing.xlsx")) is None
+
+
+def test_old_versions_are_pruned(tmp_path, live):
+    versions = [install_version(upload(tmp_path, f"{i}.xlsx", b"v%d" % i), live, keep=2) for i in range(4)]
+    assert list_versions(live) == versions[-2:]
+
+
+def test_restore_makes_a_version_live_again(tmp_path, live):
+    first = install_version(upload(tmp_path, "a.xlsx", b"first"), live)
+    install_version(upload(tmp_path, "b.xlsx", b"second"), live)
+    restore_version(first, live)
+    assert live.read_bytes() == b"first"
+    with pytest.raises(FileNotFoundError):
+        restore_version(live.with_name("gone.xlsx"), live)
+
+
+def test_live_file_is_the_newest_type(tmp_path):
+    folder = tmp_path / "master_orders"
+    suffixes = [".xlsx", ".xls", ".xlsb"]
+    assert snapshot_store.live_file(folder, "master", suffixes) == folder / "master.xlsx"
+
+    install_version(upload(tmp_path, "a.xlsx", b"first"), folder / "master.xlsx")
+    xls = folder / "master.xls"
+    install_version(upload(tmp_path, "b.xls", b"second"), xls)
+    os.utime(folder / "master.xlsx", (1, 1))
+    assert snapshot_store.live_file(folder, "master", suffixes) == xls
+
+    snapshot_store.retire_other_types(xls, suffixes)
+    assert sorted(p.name for p in folder.iterdir() if p.is_file()) == ["master.xls"]
+    # Versions of both types are kept for rollback
+    assert len(list_versions(folder / "master.xlsx")) == 1 and len(list_versions(xls)) == 1